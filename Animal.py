@@ -1,6 +1,7 @@
 from enum import Enum
 from .imports import *
 from .GameStateManager import GameStateManager
+from .CollectedItems import ItemKind
 from abc import ABC
 from .utils import StaticSender
 
@@ -20,6 +21,8 @@ class AnimalName(Enum):
     RABBIT = "rabbit"
 
 class Animal(PressurePlate, ABC):
+    item_kind = ItemKind.ANIMAL
+
     def __init__(self, animal_name: AnimalName, image_name: str = None) -> None:
         """
         Initialize an Animal with a given name and image.
@@ -53,7 +56,7 @@ class Animal(PressurePlate, ABC):
         assert player is not None
         assert hasattr(player, "get_current_room")
         if hasattr(player, "is_hunter"): return []
-        gsm = GameStateManager()
+        gsm = GameStateManager.for_room(player.get_current_room())
         gsm.collect_animal()
 
         coord = self.get_position()
@@ -0,0 +1,134 @@
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+class ItemKind(str, Enum):
+    """
+    The kinds of items the player collects. Members are strings, so they compare equal to their
+    values (ItemKind.ROCK == "rock").
+    """
+    ROCK = "rock"
+    FLOWER = "flower"
+    ANIMAL = "animal"
+
+    @classmethod
+    def of(cls, item: Any) -> Optional["ItemKind"]:
+        """Classify an item (see kind_of())."""
+        return kind_of(item)
+
+_KINDS = tuple((kind.value, kind) for kind in ItemKind)
+# Both the values and the members themselves, which hash differently from their values
+_KINDS_BY_KEY = {**dict(_KINDS), **{kind: kind for kind in ItemKind}}
+
+
+def kind_of(item: Any) -> Optional[ItemKind]:
+    """
+    Classify an item.
+
+    Looking up attributes of the ItemKind class is slow, so collection code calls this function
+    rather than ItemKind.of() and avoids touching the class.
+
+    Postconditions:
+        - Returns item.item_kind for map objects that declare it; otherwise the kind whose value
+          occurs in the item (if it is a string) or in the name of its type; otherwise None.
+    """
+    if isinstance(item, str):
+        kind = _KINDS_BY_KEY.get(item)
+        if kind is not None:
+            return kind
+        name = item.lower()
+    else:
+        kind = getattr(item, "item_kind", None)
+        if kind is not None:
+            return _KINDS_BY_KEY[kind]
+        name = str(type(item)).lower()
+    for value, kind in _KINDS:
+        if value in name:
+            return kind
+    return None
+
+
+class CollectedItems:
+    """
+    The items collected in one game, in collection order, with a stack per ItemKind.
+
+    Every item gets an increasing sequence number. Items live in a dict keyed by sequence, which
+    keeps collection order and deletes in constant time, and each kind keeps the stack of the
+    sequences of its items. Taking back the latest item of a kind (pop_kind()) is therefore O(1)
+    however many items were collected. The container compares equal to a list of the same items,
+    so code that treats the collection as a list keeps working.
+
+    Invariants:
+        - For each kind, self._stacks[kind] holds the sequences of the items of that kind, in
+          increasing order.
+        - self.version grows by one with every change of the contents.
+    """
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        self._items: Dict[int, Any] = {}
+        self._stacks: Dict[ItemKind, List[int]] = {kind: [] for kind in ItemKind}
+        self._next_sequence: int = 0
+        self.version: int = 0
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Any) -> int:
+        """
+        Add an item at the end of the collection.
+
+        Postconditions:
+            - Returns the item's sequence number, larger than any given before.
+        """
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self.version += 1
+        self._items[sequence] = item
+        kind = kind_of(item)
+        if kind is not None:
+            self._stacks[kind].append(sequence)
+        return sequence
+
+    def pop_kind(self, kind: ItemKind) -> Optional[Any]:
+        """
+        Remove the latest item of a kind.
+
+        Postconditions:
+            - Returns the removed item, or None if no item of that kind is collected.
+        """
+        stack = self._stacks[kind]
+        if not stack:
+            return None
+        self.version += 1
+        return self._items.pop(stack.pop())
+
+    def last_sequence(self, kind: ItemKind) -> int:
+        """Retrieve the sequence number of the latest item of a kind, or -1 if there is none."""
+        stack = self._stacks[kind]
+        return stack[-1] if stack else -1
+
+    def count_kind(self, kind: ItemKind) -> int:
+        """Count the items of a kind in constant time."""
+        return len(self._stacks[kind])
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.version += 1
+        self._items.clear()
+        for stack in self._stacks.values():
+            stack.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items.values())
+
+    def __getitem__(self, index: int) -> Any:
+        """Retrieve an item by position (in linear time; the game only appends, pops and iterates)."""
+        return list(self._items.values())[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CollectedItems):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -0,0 +1,196 @@
+# TO REPLAY A JOURNAL (from the directory that contains project/):
+# python -m project.EventJournal path/to/journal
+import io
+import struct
+import sys
+import threading
+from enum import IntEnum
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from .CollectedItems import ItemKind
+
+class JournalEvent(IntEnum):
+    """The state changes a journal records."""
+    COLLECT = 1       # arg: item code
+    UNDO = 2          # arg: item code
+    STATE = 3         # arg: state code
+    RESET = 4
+    RESTORE = 5       # arg: state code; followed by one COLLECT per restored item
+    HUNTER_MOVE = 6   # y, x: new position
+    PLAYER_MOVE = 7   # y, x: new position
+
+# The same codes as plain ints, for the recording hot path (looking up an enum member costs more than packing a record)
+COLLECT, UNDO, STATE, RESET, RESTORE, HUNTER_MOVE, PLAYER_MOVE = map(int, JournalEvent)
+
+# Codes of the arg field
+ITEM_CODES: Dict[Optional[ItemKind], int] = {None: 0, ItemKind.ROCK: 1, ItemKind.FLOWER: 2, ItemKind.ANIMAL: 3}
+ITEM_KINDS: Dict[int, Optional[ItemKind]] = {code: kind for kind, code in ITEM_CODES.items()}
+STATE_CODES: Dict[str, int] = {"playing": 0, "win": 1, "lose": 2}  # GameState values
+STATE_VALUES: Dict[int, str] = {code: value for value, code in STATE_CODES.items()}
+
+
+class JournalRecord(NamedTuple):
+    tick: int
+    event: JournalEvent
+    arg: int
+    y: int
+    x: int
+
+
+class EventJournal:
+    """
+    An append-only journal of game events in a fixed-width binary format.
+
+    Every record is RECORD.size (10) bytes: tick (uint32), event (uint8), arg (uint8), y and x
+    (int16), little-endian. Records are packed into an in-memory buffer and written to the stream
+    in blocks of FLUSH_BYTES, so recording an event costs one struct.pack and a bytearray append.
+    Call flush() (or close()) to push the buffered tail to the stream.
+
+    Recording takes no lock: appending to the buffer is a single in-place operation, so records
+    from several threads never interleave. Only flushing, which moves bytes from the buffer to
+    the stream, is serialized.
+
+    Invariants:
+        - The stream followed by the buffer is a whole number of records, in recording order.
+    """
+    RECORD = struct.Struct("<IBBhh")
+    FLUSH_BYTES = 64 * 1024
+
+    def __init__(self, stream: Optional[BinaryIO] = None, clock: Any = None) -> None:
+        """
+        Initialize the journal.
+
+        Preconditions:
+            - stream, if given, is a binary stream open for writing; without one, records are kept in memory.
+            - clock, if given, has a tick attribute (e.g. a GameClock); records are stamped with it.
+        """
+        self._stream: BinaryIO = stream if stream is not None else io.BytesIO()
+        self._buffer = bytearray()
+        self._pack = self.RECORD.pack
+        self._flush_bytes = self.FLUSH_BYTES
+        self._flush_lock = threading.Lock()
+        self.clock = clock
+
+    @classmethod
+    def open(cls, path: str, clock: Any = None) -> "EventJournal":
+        """Create a journal that appends to the file at path."""
+        return cls(open(path, "ab"), clock)
+
+    def record(self, event: int, arg: int = 0, y: int = 0, x: int = 0) -> None:
+        """
+        Append one record.
+
+        Preconditions:
+            - event is a JournalEvent code, 0 <= arg < 256 and y, x fit in 16 signed bits.
+        """
+        clock, buffer = self.clock, self._buffer
+        buffer += self._pack(clock.tick if clock is not None else 0, event, arg, y, x)  # In place
+        if len(buffer) >= self._flush_bytes:
+            self.flush()
+
+    def record_move(self, event: int, coord: Any) -> None:
+        """
+        Append the record of a character moving to coord; the hot path of record().
+
+        Preconditions:
+            - event is JournalEvent.HUNTER_MOVE or JournalEvent.PLAYER_MOVE and coord has y and x.
+        """
+        clock, buffer = self.clock, self._buffer
+        buffer += self._pack(clock.tick if clock is not None else 0, event, 0, coord.y, coord.x)
+        if len(buffer) >= self._flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the stream."""
+        with self._flush_lock:
+            buffer = self._buffer
+            if buffer:
+                data = bytes(buffer)
+                del buffer[:len(data)]  # Keeps records appended by other threads in the meantime
+                self._stream.write(data)
+            self._stream.flush()
+
+    def close(self) -> None:
+        """Flush and close the stream."""
+        self.flush()
+        self._stream.close()
+
+    def getvalue(self) -> bytes:
+        """
+        Retrieve every record of an in-memory journal.
+
+        Preconditions:
+            - The journal was created without a stream.
+        """
+        self.flush()
+        return self._stream.getvalue()
+
+    @classmethod
+    def read(cls, data: bytes) -> Iterator[JournalRecord]:
+        """
+        Decode records.
+
+        Preconditions:
+            - len(data) is a multiple of RECORD.size.
+        """
+        for tick, event, arg, y, x in cls.RECORD.iter_unpack(data):
+            yield JournalRecord(tick, JournalEvent(event), arg, y, x)
+
+    @classmethod
+    def read_file(cls, path: str) -> Iterator[JournalRecord]:
+        """Decode the records of a journal file, ignoring a torn last record."""
+        with open(path, "rb") as f:
+            data = f.read()
+        yield from cls.read(data[:len(data) - len(data) % cls.RECORD.size])
+
+
+def replay(records: Iterable[JournalRecord], manager: Any = None) -> Tuple[Any, Dict[str, Tuple[int, int]]]:
+    """
+    Rebuild a game from its journal.
+
+    Postconditions:
+        - Returns (manager, positions): the events are applied in order to manager (a fresh session
+          if None), and positions maps "hunter" and "player" to the last recorded (y, x) of each.
+    """
+    from .GameStateManager import GameState, GameStateManager
+    if manager is None:
+        manager = GameStateManager.create_session()
+    positions: Dict[str, Tuple[int, int]] = {}
+    for record in records:
+        event = record.event
+        if event == JournalEvent.COLLECT:
+            kind = ITEM_KINDS[record.arg]
+            if kind is ItemKind.ANIMAL:
+                manager.collect_animal()
+            else:
+                manager.collect_item(kind if kind is not None else "item")
+        elif event == JournalEvent.UNDO:
+            kind = ITEM_KINDS[record.arg]
+            manager.undo_collect_item(kind if kind is not None else "item")
+        elif event == JournalEvent.STATE:
+            manager.set_game_state(GameState(STATE_VALUES[record.arg]))
+        elif event in (JournalEvent.RESET, JournalEvent.RESTORE):
+            manager.reset_game_state()
+            if event == JournalEvent.RESTORE:
+                manager.state = GameState(STATE_VALUES[record.arg])
+        elif event == JournalEvent.HUNTER_MOVE:
+            positions["hunter"] = (record.y, record.x)
+        elif event == JournalEvent.PLAYER_MOVE:
+            positions["player"] = (record.y, record.x)
+    return manager, positions
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m project.EventJournal <journal>")
+        return 2
+    manager, positions = replay(EventJournal.read_file(args[0]))
+    print(f"state: {manager.get_state().value}")
+    print(f"collected: {list(manager.get_collected_items())} ({manager.collected_animals} animals)")
+    for name, (y, x) in sorted(positions.items()):
+        print(f"{name}: ({y}, {x})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 from enum import Enum
 from .imports import *
 from .GameStateManager import GameStateManager
+from .CollectedItems import ItemKind
 from abc import ABC
 from .utils import StaticSender
 
@@ -21,6 +22,8 @@ class FlowerName(Enum):
 
 
 class Flower(PressurePlate, ABC):
+    item_kind = ItemKind.FLOWER
+
     def __init__(self, flower_name: str, image_name: str = None) -> None:
         """
         Initialize a Flower with a given name and image.
@@ -58,8 +61,8 @@ class Flower(PressurePlate, ABC):
         assert hasattr(player,"get_current_room"), "Precondition failed: 'player' must have 'get_current_room()' method."
 
         if hasattr(player, "is_hunter"): return []
-        gsm = GameStateManager()
-        gsm.collect_item("flower")
+        gsm = GameStateManager.for_room(player.get_current_room())
+        gsm.collect_item(ItemKind.FLOWER)
         
         coord: Coord = self.get_position()
         gsm.track_picked_item(self, coord)
@@ -0,0 +1,62 @@
+class GameClock:
+    """
+    A deterministic game clock that counts ticks instead of reading the wall clock.
+
+    The map's update loop advances the clock by one tick per update, and every duration the
+    movement strategies care about (cooldowns, speeds) is expressed in ticks. A game therefore
+    behaves the same whatever the server load, and headless simulations can run as fast as
+    they can advance the clock.
+
+    Durations specified in seconds are converted with ticks(), using the rate at which the
+    clock's owner is updated (ticks_per_second).
+
+    Invariants:
+        - self.tick >= 0 and never decreases.
+        - self.ticks_per_second > 0.
+    """
+    TICKS_PER_SECOND: int = 1  # Default update rate: one update per second
+
+    def __init__(self, tick: int = 0, ticks_per_second: int = TICKS_PER_SECOND) -> None:
+        """
+        Initialize the clock.
+
+        Preconditions:
+            - tick is a non-negative integer.
+            - ticks_per_second is a positive integer: how many times per second the clock is advanced.
+        """
+        assert isinstance(tick, int) and tick >= 0, "tick must be a non-negative integer."
+        assert isinstance(ticks_per_second, int) and ticks_per_second > 0, "ticks_per_second must be a positive integer."
+        self.tick: int = tick
+        self.ticks_per_second: int = ticks_per_second
+
+    def ticks(self, seconds: float) -> int:
+        """
+        Convert a duration in seconds to ticks of this clock.
+
+        Preconditions:
+            - seconds >= 0.
+        Postconditions:
+            - Returns seconds * self.ticks_per_second rounded to the nearest tick, and at least
+              one tick for a positive duration.
+        """
+        assert seconds >= 0, "seconds must be non-negative."
+        if seconds == 0:
+            return 0
+        return max(1, round(seconds * self.ticks_per_second))
+
+    def now(self) -> int:
+        """Retrieve the current tick."""
+        return self.tick
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Move the clock forward.
+
+        Preconditions:
+            - ticks is a non-negative integer.
+        Postconditions:
+            - self.tick is increased by ticks and returned.
+        """
+        assert isinstance(ticks, int) and ticks >= 0, "ticks must be a non-negative integer."
+        self.tick += ticks
+        return self.tick
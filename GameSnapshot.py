@@ -0,0 +1,60 @@
+import os
+import pickle
+from typing import Any, Callable, NamedTuple, Tuple
+from .GameStateManager import GameState
+from .LayoutSnapshot import LayoutSnapshot
+from .MovementStrategy import MovementStrategy
+from .UndoHistory import UndoDelta
+
+class HunterRecord(NamedTuple):
+    """Where a hunter stands and how it moves."""
+    coord: Any
+    strategy: MovementStrategy  # The hunter's strategy itself, so strategies built with arguments come back as they were
+    speed: int
+
+
+class GameSnapshot(NamedTuple):
+    """
+    A saved point of one game: its progress, the objects on the grid, the hunters, the doors and
+    the player. Built by ExampleHouse.save_snapshot() and put back by ExampleHouse.restore_snapshot().
+
+    A snapshot holds no live map object: map objects are recorded as layout records (see
+    LayoutSnapshot), and hunters by their position, speed and (stateless) movement strategy. So
+    a snapshot is immutable, can be restored any number of times, and can be pickled to a
+    checkpoint file with write() to resume the game after a restart.
+    """
+    state: GameState
+    collected_items: Tuple[Any, ...]
+    collected_animals: int
+    layout: LayoutSnapshot  # Objects on the grid other than players, hunters and doors
+    hunters: Tuple[HunterRecord, ...]  # In the order the map created its hunters
+    doors_locked: Tuple[bool, ...]  # Likewise for its doors
+    player_position: Any
+    inventory: Tuple[Callable[[], Any], ...]  # Factories of the items the player carries, in order
+    undo_history: Tuple[UndoDelta, ...]  # Oldest first; deltas record picked items by factory
+
+    def write(self, path: str) -> None:
+        """
+        Write the snapshot to a checkpoint file.
+
+        Postconditions:
+            - path holds either the previous checkpoint or this one, never a partial file.
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def read(cls, path: str) -> "GameSnapshot":
+        """
+        Read a checkpoint file written by write().
+
+        Preconditions:
+            - path was written by GameSnapshot.write() of this version of the game (checkpoint files
+              are pickles, so only read files the server wrote itself).
+        """
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        assert isinstance(snapshot, cls), "the checkpoint does not hold a GameSnapshot."
+        return snapshot
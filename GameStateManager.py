@@ -1,9 +1,15 @@
 from enum import Enum
 from .imports import *
 from .Subject import Subject
-from .Observer import Observer
-import copy
-from typing import List, Tuple, Optional, Any, TYPE_CHECKING
+from .Observer import GameEvent, Observer
+from .CollectedItems import CollectedItems, ItemKind, kind_of
+from .LayoutSnapshot import LayoutSnapshot, factory_of
+from .UndoHistory import UndoDelta, UndoHistory
+from .EventJournal import EventJournal, ITEM_CODES, STATE_CODES, COLLECT, UNDO, STATE, RESET, RESTORE
+import threading
+import weakref
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Iterable, List, Tuple, Optional, Any, TYPE_CHECKING
 if TYPE_CHECKING:
     from coord import Coord
     from maps.base import Map
@@ -15,52 +21,307 @@ class GameState(Enum):
 
 class GameStateManager(Subject):
     """
-    A singleton class responsible for managing high-level game state,
+    A class responsible for managing the high-level state of one game,
     such as current play state, collected items, animals, observers, etc.
     Also the subject in the observer pattern.
 
+    Each game session has its own instance: a map that hosts a game creates one with
+    create_session() and exposes it through get_game_state(), and code that acts on a map
+    looks the session up with for_room(). GameStateManager() returns the default session,
+    shared by everything that is not in such a map.
+
+    Observers are held weakly: an observer that nothing else references any more (a hunter or
+    door of a layout that was reset) drops out of the registry by itself, so the cost of a
+    notification follows the live observers. Adding the same observer twice registers it once.
+
+    In thread-safe mode (create_session(thread_safe=True) or enable_thread_safety()), collecting,
+    undoing, resetting and state transitions are atomic. The lock only covers the manager's own
+    state: a map that is changed from several threads (its grid, its passability index, the
+    paths it caches) holds the same lock, from locked(), around those changes too, as
+    ExampleHouse does. Observers are notified after the lock is released, so they may call back
+    into the manager from any thread.
+
+    With deferred events (defer_events()), notifications are queued instead of delivered, and
+    flush_events() delivers them later in one batch, each distinct event once. A house built with
+    ExampleHouse(defer_events=True) flushes before and after updating its objects on each tick,
+    which bounds the cost of bursts of input while hunters still react within the next tick.
+
+    With a journal (set_journal()), every state change (collect, undo, state transition, reset,
+    restore) and every move reported through record_move() is appended to it as a fixed-width
+    binary record; see EventJournal.
+
+    Undo goes through a bounded UndoHistory: each command records the inverse of what it changed
+    (where it moved the player from, which items it picked up and where), and undo takes back
+    the latest command. The history keeps the last UndoHistory.CAPACITY commands, so a long
+    session does not grow it without bound.
+
+    Every change made through the manager (or to its collected items) moves get_version()
+    forward, so consumers can memoize what they derive from the state with a StateWatcher and
+    recompute only when the version moves.
+
     Invariants:
         - self.state must be one of GameState enums.
         - self.collected_animals >= 0.
         - len(self.collected_items) >= 0.
         - 0 <= self.collected_animals <= self.total_animals.
+        - self.collected_items is a CollectedItems, which keeps a stack per ItemKind (see get_pickup_summary()).
+        - get_version() never decreases.
     """
     _instance = None  
 
     def __new__(cls):
-        """Ensure only one instance of GameStateManager is created."""
+        """Ensure only one default instance of GameStateManager is created."""
         if cls._instance is None:
             cls._instance = super(GameStateManager, cls).__new__(cls)
             cls._instance._initialized = False  # To track if __init__ is already called
         return cls._instance
 
+    @classmethod
+    def create_session(cls, thread_safe: bool = False) -> "GameStateManager":
+        """
+        Create the state of a new, independent game.
+
+        Postconditions:
+            - Returns a fresh instance that shares nothing with the default instance or other sessions.
+            - If thread_safe is True, the session is in thread-safe mode.
+        """
+        session = super(GameStateManager, cls).__new__(cls)
+        session._initialized = False
+        session.__init__()
+        if thread_safe:
+            session.enable_thread_safety()
+        return session
+
+    @classmethod
+    def for_room(cls, room: Any) -> "GameStateManager":
+        """
+        Retrieve the game state of the session played in room.
+
+        Postconditions:
+            - Returns room.get_game_state() if the room hosts its own session; otherwise the default instance.
+        """
+        if hasattr(room, "get_game_state"):
+            return room.get_game_state()
+        return cls()
+
     def __init__(self):
         """Initialize game state variables only once."""
         if not self._initialized:
+            self._lock = nullcontext()  # Replaced by a re-entrant lock in thread-safe mode
+            self._version: int = 0  # Changes of everything but the collected items, which count their own
             self.state: GameState = GameState.PLAYING # Initial state is PLAYING
-            self.collected_items: List[Any] = []  # Stores collected items (e.g., "rock", "flower", "animal")
+            self.collected_items: CollectedItems = CollectedItems()  # Stores collected items (e.g., ItemKind.ROCK)
             self.collected_animals: int = 0     
             self.total_animals: int = 12        
             self._initialized = True            # Mark as initialized once setup is done
-            self.tracked_picked_items: List[Tuple[Any, Coord]] = []  # For undo support
+            self._history: UndoHistory = UndoHistory()  # For undo support
             self.current_map: Optional[Map] = None
-            self._original_objects: List[Tuple[Any, Coord]] = []  # Original layout (list of (object, coord))
-            self._observers: List[Observer] = []  # For the Observer pattern
+            self._original_layout: LayoutSnapshot = LayoutSnapshot()  # Original layout, rebuilt on demand
+            # For the Observer pattern: id(observer) -> weak reference, in registration order
+            self._observers: Dict[int, Any] = {}
+            # Topic -> observers subscribed to it; observers without topics are in every table and in _catch_all
+            self._subscribers: Dict[GameEvent, Dict[int, Any]] = {event: {} for event in GameEvent}
+            self._catch_all: Dict[int, Any] = {}
+            self._dead_observers: List[Tuple[int, Any]] = []  # Filled by weakref callbacks, emptied by _prune_observers()
+            self._defer_events: bool = False
+            self._pending_events: Dict[str, None] = {}  # Queued events in first-occurrence order (an ordered set)
+            self._journal: Optional[EventJournal] = None
     
-    def store_original_objects(self, objects: List[Tuple[Any, Coord]]) -> None:
+    def enable_thread_safety(self) -> None:
+        """
+        Switch to thread-safe mode.
+
+        Preconditions:
+            - No other thread uses the manager yet.
+        Postconditions:
+            - Every state change below is made while holding self._lock.
+        """
+        if isinstance(self._lock, nullcontext):
+            self._lock = threading.RLock()
+
+    def is_thread_safe(self) -> bool:
+        """Returns True if the manager is in thread-safe mode."""
+        return not isinstance(self._lock, nullcontext)
+
+    def locked(self) -> ContextManager:
+        """
+        Retrieve the session lock, for the map hosting the session to guard its own state with.
+
+        Postconditions:
+            - Returns a re-entrant lock in thread-safe mode, and a context manager that does nothing otherwise.
+        """
+        return self._lock
+
+    def set_journal(self, journal: Optional[EventJournal]) -> None:
+        """
+        Start recording state changes into journal (None stops recording).
+
+        Postconditions:
+            - The previous journal, if any, is flushed.
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.flush()
+            self._journal = journal
+
+    def get_journal(self) -> Optional[EventJournal]:
+        """Retrieve the journal state changes are recorded into, if any."""
+        return self._journal
+
+    def _record(self, event: int, arg: int = 0) -> None:
+        """Append an event to the journal, if there is one (called with the lock held)."""
+        if self._journal is not None:
+            self._journal.record(event, arg)
+
+    def record_move(self, event: int, coord: Coord) -> None:
+        """
+        Record that a character moved, if there is a journal.
+
+        Preconditions:
+            - event is JournalEvent.HUNTER_MOVE or JournalEvent.PLAYER_MOVE.
+        Postconditions:
+            - Without a journal, costs one attribute read. The journal needs no lock (see EventJournal).
+        """
+        journal = self._journal
+        if journal is not None:
+            journal.record_move(event, coord)
+
+    def defer_events(self, deferred: bool = True) -> None:
+        """
+        Choose between delivering events right away and queueing them until flush_events().
+
+        Postconditions:
+            - If deferred is False, the events queued so far are delivered.
+        """
+        self._defer_events = deferred
+        if not deferred:
+            self.flush_events()
+
+    def flush_events(self) -> None:
+        """
+        Deliver the queued events.
+
+        Postconditions:
+            - Every distinct queued event is delivered once, in the order it was first queued.
+            - Events raised by observers during the flush are queued for the next flush.
+        """
+        with self._lock:
+            events, self._pending_events = self._pending_events, {}
+        for event in events:
+            self._dispatch(event)
+
+    @property
+    def collected_items(self) -> CollectedItems:
+        return self._collected_items
+
+    @collected_items.setter
+    def collected_items(self, items: Any) -> None:
+        """Replace the collected items (any iterable of items)."""
+        with self._lock:
+            previous = getattr(self, "_collected_items", None)
+            if previous is not None:
+                self._version += previous.version + 1  # Keeps get_version() increasing as the new collection counts from its own version
+            self._collected_items = items if isinstance(items, CollectedItems) else CollectedItems(items)
+
+    def get_version(self) -> int:
+        """
+        Retrieve the version of the game state.
+
+        Postconditions:
+            - The result is larger than any earlier result if the state, the collected items, the
+              animal count or the undo stack changed through the manager since; otherwise it is equal.
+        """
+        return self._version + self._collected_items.version
+
+    @property
+    def tracked_picked_items(self) -> List[Tuple[Coord, Callable[[], Any]]]:
+        """The (coord, factory) pairs of the picked items that can still be undone, oldest first (a copy)."""
+        with self._lock:
+            return [pair for delta in self._history for pair in delta.picked]
+
+    @tracked_picked_items.setter
+    def tracked_picked_items(self, pairs: Iterable[Tuple[Coord, Any]]) -> None:
+        """Replace the undo history with one pickup per (coord, item) pair."""
+        with self._lock:
+            self._history = UndoHistory((UndoDelta(None, ((coord, factory_of(item)),)) for coord, item in pairs),
+                                        self._history.capacity)
+            self._version += 1
+
+    def get_pickup_summary(self) -> Tuple[int, int, int]:
+        """
+        Summarize the collected items for strategy selection in constant time.
+
+        Postconditions:
+            - Returns (last rock sequence, last flower sequence, animal count), where a sequence is
+              -1 if no item of that kind is collected. Sequences only compare with each other: the
+              larger one was collected later.
+        """
+        with self._lock:
+            items = self._collected_items
+            return (items.last_sequence(ItemKind.ROCK), items.last_sequence(ItemKind.FLOWER),
+                    items.count_kind(ItemKind.ANIMAL))
+
+    def save_progress(self) -> Tuple[GameState, Tuple[Any, ...], int, Tuple[UndoDelta, ...]]:
+        """
+        Read the progress of the game consistently, for a snapshot.
+
+        Postconditions:
+            - Returns (state, collected items, collected_animals, undo history), all taken at
+              the same moment. The manager keeps no reference to the returned tuples.
         """
-        Store the original objects (deep-copied) and their coordinates.
+        with self._lock:
+            return self.state, tuple(self._collected_items), self.collected_animals, tuple(self._history)
+
+    def restore_progress(self, state: GameState, collected_items: Tuple[Any, ...], collected_animals: int,
+                         history: Iterable[UndoDelta]) -> None:
+        """
+        Put the game back to progress read by save_progress(), in one step.
+
+        Preconditions:
+            - state is a GameState and 0 <= collected_animals <= self.total_animals.
+        Postconditions:
+            - The state, collected items, animal count and undo history are replaced atomically.
+            - Events queued before the restore are dropped; observers are not notified.
+        """
+        assert isinstance(state, GameState), "state must be an instance of GameState enum."
+        assert 0 <= collected_animals <= self.total_animals, "collected_animals must be within 0..total_animals."
+        with self._lock:
+            self._pending_events.clear()
+            self.state = state
+            self.collected_items = collected_items
+            self.collected_animals = collected_animals
+            self._history = UndoHistory(history, self._history.capacity)
+            self._version += 1
+            if self._journal is not None:
+                self._record(RESTORE, STATE_CODES[state.value])
+                for item in self._collected_items:
+                    self._record(COLLECT, ITEM_CODES[kind_of(item)])
+
+    def store_original_objects(self, objects: LayoutSnapshot) -> None:
+        """
+        Store the original layout.
         Precondition:
-            - objects is a list of (obj, coord) tuples.
+            - objects is a LayoutSnapshot. A list of (obj, coord) tuples is rejected, as objects whose
+              constructor takes arguments (e.g. Hunter, LockableDoor) cannot be rebuilt from it; build
+              the snapshot from LayoutRecord with a factory for each object (e.g. a functools.partial),
+              as ExampleHouse.get_objects() does.
         Postcondition:
-            - self._original_objects is replaced with a list of (deepcopy(obj), coord).
+            - self._original_layout is objects; no object is copied.
         """
-        assert isinstance(objects, list), "objects must be a list of tuples."
-        self._original_objects = [(copy.deepcopy(obj), coord) for obj, coord in objects]
+        assert isinstance(objects, LayoutSnapshot), (
+            "objects must be a LayoutSnapshot built from LayoutRecord(factory, coord), not a list of (obj, coord); "
+            "use a functools.partial as the factory of objects whose constructor takes arguments."
+        )
+        self._original_layout = objects
 
     def get_original_objects(self) -> List[Tuple[Any, Coord]]:
-        """Retrieve the stored original objects."""
-        return self._original_objects
+        """
+        Rebuild the original layout.
+
+        Postconditions:
+            - Returns a list of (obj, coord) with fresh objects, distinct from the ones that were stored.
+        """
+        return self._original_layout.instantiate()
 
     def reset_game_state(self) -> None:
         """
@@ -69,45 +330,118 @@ class GameStateManager(Subject):
             - self.state == GameState.PLAYING
             - self.collected_items is empty
             - self.collected_animals == 0
-            - self.tracked_picked_items is empty
+            - The undo history is empty
+            - Events queued for the previous game are dropped
         """
-        self.state = GameState.PLAYING
-        self.collected_items.clear()
-        self.collected_animals = 0
-        self.tracked_picked_items.clear()
+        with self._lock:
+            self._pending_events.clear()
+            self.state = GameState.PLAYING
+            self.collected_items = []
+            self.collected_animals = 0
+            self._history.clear()
+            self._version += 1
+            self._record(RESET)
             
+    def _observer_ref(self, observer: Observer) -> Any:
+        """Make the reference the registry keeps to observer: weak if the object allows it."""
+        dead, key = self._dead_observers, id(observer)
+        try:
+            # The callback may run in any thread at any time, so it only queues the entry for pruning
+            return weakref.ref(observer, lambda ref: dead.append((key, ref)))
+        except TypeError:
+            return lambda: observer  # Objects without weakref support are held strongly
+
+    def _find_observer(self, observer: Observer) -> Optional[Any]:
+        """Retrieve the registry's reference to observer, or None if it is not registered."""
+        ref = self._observers.get(id(observer))
+        return ref if ref is not None and ref() is observer else None
+
+    def _prune_observers(self) -> None:
+        """Drop the registry entries of observers that were garbage-collected (called with the lock held)."""
+        while self._dead_observers:
+            key, ref = self._dead_observers.pop()
+            for table in (self._observers, self._catch_all, *self._subscribers.values()):
+                if table.get(key) is ref:  # The id may already belong to a newer observer
+                    del table[key]
+
+    def get_observers(self) -> List[Observer]:
+        """Retrieve the live observers, in registration order."""
+        with self._lock:
+            self._prune_observers()
+            return [observer for observer in (ref() for ref in self._observers.values()) if observer is not None]
+
     def add_observer(self, observer: Observer) -> None:
         """
-        Add a new observer.
+        Add a new observer, unless it is already registered.
         Precondition:
             - observer is not None
         Postcondition:
-            - observer is in self._observers
+            - observer is registered once, whatever the number of calls
+            - observer is in the subscriber table of each event in observer.topics (of every event
+              if the observer has no topics)
+            - The registry does not keep observer alive
         """
         assert observer is not None, "observer must not be None."
-        self._observers.append(observer)
+        topics = getattr(observer, "topics", None)
+        with self._lock:
+            self._prune_observers()
+            if self._find_observer(observer) is not None:
+                return
+            key, ref = id(observer), self._observer_ref(observer)
+            self._observers[key] = ref
+            if topics is None:
+                self._catch_all[key] = ref
+            for event in (GameEvent if topics is None else topics):
+                self._subscribers[GameEvent(event)][key] = ref
 
     def remove_observer(self, observer: Observer) -> None:
         """
-        Remove an observer from the list if present.
+        Remove an observer from the registry if present.
         Precondition:
             - observer is not None
         Postcondition:
-            - if observer was in self._observers, it is removed
+            - observer is no longer registered
         """
         assert observer is not None, "observer must not be None."
-        if observer in self._observers:
-            self._observers.remove(observer)  
+        with self._lock:
+            self._prune_observers()
+            ref = self._find_observer(observer)
+            if ref is not None:
+                key = id(observer)
+                for table in (self._observers, self._catch_all, *self._subscribers.values()):
+                    if table.get(key) is ref:
+                        del table[key]
     
     def notify_observers(self, event: str) -> None:
         """
-        Notify all registered observers about an event.
+        Notify the observers subscribed to an event, or queue it if events are deferred.
         Precondition:
             - event is a non-empty string
+        Postcondition:
+            - A GameEvent reaches the observers subscribed to it; any other event only reaches
+              observers without topics.
         """
         assert event, "event must be a valid, non-empty identifier."
-        for observer in self._observers:
-            observer.on_notify(event)  
+        if self._defer_events:
+            with self._lock:
+                self._pending_events[event] = None
+            return
+        self._dispatch(event)
+
+    def _dispatch(self, event: str) -> None:
+        """Call on_notify(event) on the live observers subscribed to event."""
+        try:
+            event = GameEvent(event)
+            subscribers = self._subscribers[event]
+        except ValueError:
+            subscribers = self._catch_all
+        with self._lock:
+            self._prune_observers()
+            # Observers added or removed meanwhile take effect from the next event
+            observers = [ref() for ref in subscribers.values()]
+        for observer in observers:
+            if observer is not None:  # Collected after the snapshot was taken
+                observer.on_notify(event)
 
     def collect_item(self, item: Any) -> None:
         """
@@ -119,8 +453,11 @@ class GameStateManager(Subject):
             - Observers are notified with "ITEM_COLLECTED"
         """
         assert item is not None, "item must not be None."
-        self.collected_items.append(item)
-        self.notify_observers("ITEM_COLLECTED")
+        with self._lock:
+            self._collected_items.append(item)
+            if self._journal is not None:
+                self._record(COLLECT, ITEM_CODES[kind_of(item)])
+        self.notify_observers(GameEvent.ITEM_COLLECTED)
     
     def track_picked_item(self, item: Any, coord: Coord) -> None:
         """
@@ -129,57 +466,138 @@ class GameStateManager(Subject):
             - item is not None
             - coord is a valid coordinate
         Postcondition:
-            - (coord, item) is appended to self.tracked_picked_items
+            - The pickup is pushed on the undo history, by the factory of item; within a command
+              (see begin_command()), it becomes part of that command's delta.
         """
         assert item is not None, "item must not be None."
-        self.tracked_picked_items.append((coord, item))
+        with self._lock:
+            self._history.push(UndoDelta(None, ((coord, factory_of(item)),)))
+            self._version += 1
+
+    def begin_command(self) -> int:
+        """
+        Start recording a command that the player can undo.
+
+        Postconditions:
+            - Returns a mark to pass to end_command() once the command is done.
+        """
+        with self._lock:
+            return self._history.mark()
+
+    def end_command(self, mark: int, player_from: Optional[Coord] = None) -> None:
+        """
+        Finish recording a command started with begin_command().
+
+        Preconditions:
+            - mark was returned by begin_command() for this command.
+        Postconditions:
+            - The pickups made since mark and the move from player_from (if the command moved the
+              player) are recorded as one delta, which a single undo takes back.
+        """
+        with self._lock:
+            self._history.squash(mark, player_from)
+            self._version += 1
+
+    def peek_undo(self) -> Optional[UndoDelta]:
+        """Retrieve the latest command of the undo history without taking it back, or None if there is nothing to undo."""
+        with self._lock:
+            return self._history.peek()
+
+    def pop_undo(self) -> Optional[UndoDelta]:
+        """
+        Take the latest command off the undo history.
+
+        Postconditions:
+            - Returns its UndoDelta and removes it, or None if there is nothing to undo. Checking
+              and popping happen atomically.
+        """
+        with self._lock:
+            delta = self._history.pop()
+            if delta is not None:
+                self._version += 1
+            return delta
+
+    def pop_undo_if(self, predicate: Callable[[UndoDelta], bool]) -> Optional[UndoDelta]:
+        """
+        Take the latest command off the undo history if predicate accepts it.
+
+        Preconditions:
+            - predicate does not change the undo history.
+        Postconditions:
+            - Returns the latest UndoDelta and removes it if predicate(delta) is True; otherwise
+              returns None and the history is unchanged. Checking and popping happen atomically,
+              so the returned delta is the one predicate accepted.
+        """
+        with self._lock:
+            delta = self._history.peek()
+            if delta is None or not predicate(delta):
+                return None
+            return self.pop_undo()
+
+    def get_undo_depth(self) -> int:
+        """Retrieve how many commands can be undone (at most UndoHistory.CAPACITY)."""
+        return len(self._history)
 
     def collect_animal(self) -> None:
         """
         Update game state when the player collects an animal.
+        Precondition:
+            - self.collected_animals < self.total_animals
         Postcondition:
             - self.collected_animals is incremented by 1
-            - "animal" is appended to self.collected_items
+            - ItemKind.ANIMAL is appended to self.collected_items
             - Observers are notified with "ANIMAL_COLLECTED"
         """
-        self.collected_animals += 1
-        assert self.collected_animals <= self.total_animals, (
-            "collected_animals cannot exceed total_animals."
-        )
-        self.collected_items.append("animal")  
-        self.notify_observers("ANIMAL_COLLECTED")
+        with self._lock:
+            assert self.collected_animals < self.total_animals, (
+                "collected_animals cannot exceed total_animals."
+            )
+            self.collected_animals += 1
+            self._version += 1
+            self._collected_items.append(ItemKind.ANIMAL)
+            self._record(COLLECT, ITEM_CODES[ItemKind.ANIMAL])
+        self.notify_observers(GameEvent.ANIMAL_COLLECTED)
 
     def undo_collect_item(self, item: Any) -> None:
         """
         Undo collection of a previously collected item.
-        This method finds the last matching item (by type) and removes it.
+        This method removes the latest collected item of the same kind, in constant time.
         Precondition:
             - item is not None
         Postcondition:
-            - If item was of type 'rock', 'flower', or 'animal', that item type is removed 
-              once from self.collected_items
+            - If item is a rock, flower or animal (see ItemKind.of()), the latest item of that kind
+              is removed from self.collected_items
             - If item was an animal, self.collected_animals is decremented by 1, down to 0
             - Observers are notified with "ITEM_COLLECTED"
         """
-        assert item is not None, "item must not be None."
-        item_type: Optional[str] = None
-        if "rock" in str(type(item)).lower():
-            item_type = "rock"
-        elif "flower" in str(type(item)).lower():
-            item_type = "flower"
-        elif "animal" in str(type(item)).lower():
-            item_type = "animal"
+        self.undo_collect_items((item,))
 
-        # Remove the LAST matching item from collected_items (to preserve strategy logic)
-        for i in reversed(range(len(self.collected_items))):
-            if self.collected_items[i] == item_type:
-                del self.collected_items[i]
-                break
+    def undo_collect_items(self, items: Iterable[Any]) -> None:
+        """
+        Undo collection of several previously collected items at once, as undo_collect_item() does
+        for each of them in turn.
+        Precondition:
+            - No item is None
+        Postcondition:
+            - Every item is taken back while holding the lock once, so no other thread sees only part of them undone
+            - If there was any item, observers are notified with "ITEM_COLLECTED" once
+        """
+        items = list(items)
+        assert all(item is not None for item in items), "items must not be None."
 
-        if item_type == "animal":
-            self.collected_animals = max(0, self.collected_animals - 1)
+        with self._lock:
+            for item in items:
+                kind = kind_of(item)
+                if kind is not None:
+                    # Remove the LAST item of that kind (to preserve strategy logic)
+                    self._collected_items.pop_kind(kind)
+                if kind is ItemKind.ANIMAL:
+                    self.collected_animals = max(0, self.collected_animals - 1)
+                    self._version += 1
+                self._record(UNDO, ITEM_CODES[kind])
 
-        self.notify_observers("ITEM_COLLECTED")
+        if items:
+            self.notify_observers(GameEvent.ITEM_COLLECTED)
 
     def set_game_state(self, new_state: GameState) -> None:
         """
@@ -196,20 +614,23 @@ class GameStateManager(Subject):
         assert isinstance(new_state, GameState), "new_state must be an instance of GameState enum."
         assert new_state in (GameState.PLAYING, GameState.WIN, GameState.LOSE), "new_state must be a valid GameState."
         if isinstance(new_state, GameState):
-            self.state = new_state
+            with self._lock:
+                self.state = new_state
+                self._version += 1
+                self._record(STATE, STATE_CODES[new_state.value])
         else:
             raise ValueError("new_state must be an instance of GameState enum.")
         
         if new_state == GameState.LOSE:
-            self.notify_observers("LOSE")
+            self.notify_observers(GameEvent.LOSE)
         elif new_state == GameState.WIN:
-            self.notify_observers("WIN")
+            self.notify_observers(GameEvent.WIN)
 
     def get_state(self) -> GameState:
         """Retrieve the current game state."""
         return self.state
 
-    def get_collected_items(self) -> List[Any]:
+    def get_collected_items(self) -> CollectedItems:
         """Retrieve the collected items."""
         return self.collected_items
     
@@ -219,4 +640,50 @@ class GameStateManager(Subject):
     
     def is_win(self) -> bool:
         """Returns True if the game is won."""
-        return self.state == GameState.WIN
\ No newline at end of file
+        return self.state == GameState.WIN
+
+
+class StateWatcher:
+    """
+    Lets a consumer of a game state find out whether it changed since the consumer last looked,
+    and memoize one value derived from it.
+
+    Usage:
+        watcher = StateWatcher()
+        ...
+        if watcher.changed(gsm): ...                       # recompute only when needed
+        strategy = watcher.value(gsm, choose_strategy)     # or let the watcher keep the result
+    """
+    def __init__(self) -> None:
+        self._manager: Optional[GameStateManager] = None
+        self._version: int = -1
+        self._value: Any = None
+
+    def changed(self, manager: GameStateManager) -> bool:
+        """
+        Check manager against the version seen by the previous call.
+
+        Postconditions:
+            - Returns False if manager is the manager of the previous call and its version did not
+              move; otherwise returns True and remembers the current version.
+        """
+        version = manager.get_version()
+        if manager is self._manager and version == self._version:
+            return False
+        self._manager, self._version = manager, version
+        return True
+
+    def value(self, manager: GameStateManager, compute: Callable[[GameStateManager], Any]) -> Any:
+        """
+        Retrieve a value derived from manager, computing it only if manager changed.
+
+        Preconditions:
+            - The watcher always memoizes the same compute function.
+        Postconditions:
+            - Returns compute(manager), called only if manager changed since the value was computed.
+        """
+        version = manager.get_version()
+        if manager is not self._manager or version != self._version:
+            self._value = compute(manager)
+            self._manager, self._version = manager, version  # Only once compute succeeded
+        return self._value
@@ -1,8 +1,9 @@
 from .imports import *
-from typing import Literal, List, Optional, Any
-from .GameStateManager import GameStateManager, GameState
+from typing import Literal, List, Optional, Any, Tuple
+from .GameStateManager import GameStateManager, GameState, StateWatcher
 from .MovementStrategy import *  
-from .Observer import Observer
+from .Observer import GameEvent, Observer
+from .EventJournal import HUNTER_MOVE
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -13,7 +14,23 @@ if TYPE_CHECKING:
     from NPC import NPC  
         
 class Hunter(NPC, Observer):
-    def __init__(self, encounter_text: str, staring_distance: int = 0, facing_direction: Literal['up', 'down', 'left', 'right'] = 'down') -> None:
+    # Pickups change the movement strategy, and so does the end of the game
+    topics = frozenset({GameEvent.ITEM_COLLECTED, GameEvent.ANIMAL_COLLECTED, GameEvent.WIN, GameEvent.LOSE})
+    ROCK_SPEED: int = 2  # Cells per update while the player's last pickup between rocks and flowers is a rock
+
+    def __init__(self, encounter_text: str, staring_distance: int = 0, facing_direction: Literal['up', 'down', 'left', 'right'] = 'down',
+                 chase_strategy: Optional[MovementStrategy] = None) -> None:
+        """
+        Initialize the Hunter.
+
+        Preconditions:
+          - chase_strategy, if given, is a MovementStrategy that follows the player (e.g.
+            IncrementalPathMovement.shared() or HierarchicalMovement(16)).
+        Postconditions:
+          - The hunter moves randomly until the game state makes it chase the player, which it
+            then does with chase_strategy (ShortestPathMovement.shared() if None), at
+            ROCK_SPEED cells per update after a rock.
+        """
         super().__init__(
             name="Hunter",
             image="hunter",
@@ -21,8 +38,12 @@ class Hunter(NPC, Observer):
             facing_direction=facing_direction,
             staring_distance=staring_distance,
         )
-        self.movement_strategy = RandomMovement()
+        self.movement_strategy: MovementStrategy = RandomMovement.shared()
+        self.chase_strategy: MovementStrategy = chase_strategy if chase_strategy is not None else ShortestPathMovement.shared()
+        self.movement_state: HunterMovementState = HunterMovementState()  # Survives strategy switches
+        self.speed: int = 1  # Cells moved per update by path-following strategies
         self.is_hunter: bool = True
+        self._pickup_strategy: StateWatcher = StateWatcher()  # Strategy chosen for the current pickups
 
     def on_notify(self, event: str) -> None:
         """
@@ -31,31 +52,72 @@ class Hunter(NPC, Observer):
         Preconditions:
           - event is a non-empty string.
         Postconditions:
-          - self.movement_strategy is updated based on the event and current game state.
+          - self.movement_strategy and self.speed are updated based on the event and current game state.
+          - Deciding takes constant time: it reads GameStateManager.get_pickup_summary() instead of
+            scanning the collected items, and only when the game state changed since the last decision.
         """
         assert isinstance(event, str) and event, "event must be a non-empty string."
-        gsm = GameStateManager()
-        if event in (["ITEM_COLLECTED", "ANIMAL_COLLECTED"]):
-            collected_items = gsm.get_collected_items()
-            if not collected_items:
-                self.movement_strategy = RandomMovement()
-                return
-
-            # Determine the indices of the last occurrence of specific item types.
-            last_rock_index: int = max((i for i, item in enumerate(collected_items) if "rock" in item), default=-1)
-            last_flower_index: int = max((i for i, item in enumerate(collected_items) if "flower" in item), default=-1)
-            has_animal: bool = any("animal" in item for item in collected_items)
-
-            if last_rock_index > last_flower_index: # it will always be teleport until the player picks up a flower
-                self.movement_strategy = TeleportMovement()
-            elif has_animal: # at least once animal, then the hunter never goes back to shortest path
-                self.movement_strategy = ShortestPathMovement()
-            elif last_flower_index != -1:
-                self.movement_strategy = RandomMovement()
-        elif event == "WIN":
-            self.movement_strategy = ShortestPathMovement()
-        elif event == "LOSE":
-            self.movement_strategy = RandomMovement()
+        gsm = self._get_game_state()
+        if event in (GameEvent.ITEM_COLLECTED, GameEvent.ANIMAL_COLLECTED):
+            choice = self._pickup_strategy.value(gsm, self._choose_pickup_strategy)
+            if choice is not None:
+                self._use_strategy(*choice)
+        elif event == GameEvent.WIN:
+            self._use_strategy(self.chase_strategy)
+        elif event == GameEvent.LOSE:
+            self._use_strategy(RandomMovement.shared())
+
+    def _choose_pickup_strategy(self, gsm: GameStateManager) -> Optional[Tuple[MovementStrategy, int]]:
+        """Choose the (strategy, speed) for the collected items, or None to keep the current ones."""
+        if not gsm.get_collected_items():
+            return RandomMovement.shared(), 1
+
+        last_rock_sequence, last_flower_sequence, animal_count = gsm.get_pickup_summary()
+
+        if last_rock_sequence > last_flower_sequence: # it will always be faster until the player picks up a flower
+            return self.chase_strategy, self.ROCK_SPEED
+        elif animal_count: # at least once animal, then the hunter never goes back to random
+            return self.chase_strategy, 1
+        elif last_flower_sequence != -1:
+            return RandomMovement.shared(), 1
+        return None
+
+    def _use_strategy(self, strategy: MovementStrategy, speed: int = 1) -> None:
+        """Switch to strategy at speed; the hunter's own state stays in self.movement_state."""
+        self.movement_strategy = strategy
+        self.set_speed(speed)
+
+    def set_chase_strategy(self, strategy: MovementStrategy) -> None:
+        """
+        Set the strategy the hunter uses to chase the player.
+
+        Preconditions:
+          - strategy is a MovementStrategy.
+        Postconditions:
+          - self.chase_strategy is strategy, and the hunter switches to it if it is chasing.
+          - The next pickup event decides the strategy again.
+        """
+        assert isinstance(strategy, MovementStrategy), "strategy must be a MovementStrategy."
+        if self.movement_strategy is self.chase_strategy:
+            self.movement_strategy = strategy
+        self.chase_strategy = strategy
+        self._pickup_strategy = StateWatcher()  # Its memoized choice may be the previous chase strategy
+
+    def set_speed(self, speed: int) -> None:
+        """
+        Set how many cells the hunter moves per update when it follows a path.
+
+        Preconditions:
+          - speed is a positive integer.
+        Postconditions:
+          - self.speed == speed.
+        """
+        assert isinstance(speed, int) and speed > 0, "speed must be a positive integer."
+        self.speed = speed
+
+    def _get_game_state(self) -> GameStateManager:
+        """Retrieve the game state of the hunter's room (the default game if the hunter is not placed yet)."""
+        return GameStateManager.for_room(getattr(self, "_current_room", None))
 
     def _find_player(self) -> Optional[Player]:
         """
@@ -81,14 +143,19 @@ class Hunter(NPC, Observer):
         Postconditions:
           - Returns a list of Message objects reflecting movement, jumpscare, or win conditions.
         """
-        gsm = GameStateManager()
+        gsm = self._get_game_state()
         messages: List["Message"] = []
         player = self._find_player()
         assert player is not None, "Player must be present in the current room."
+        if not hasattr(self.get_current_room(), "get_game_clock"):
+            self.movement_state.clock.advance()  # Rooms without a game clock are timed by the hunter's own updates
 
         # Calculate direction toward the player
         direction_to_player: str = self.get_direction_toward(player.get_current_position())
+        position = self._current_position
         messages += self.movement_strategy.move(self, direction_to_player, player)
+        if self._current_position != position:
+            gsm.record_move(HUNTER_MOVE, self._current_position)
 
         # Calculate distance between Hunter and Player
         dist = self._current_position.distance(player.get_current_position())
@@ -0,0 +1,85 @@
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Tuple
+
+class LayoutRecord(NamedTuple):
+    """One object of a layout: what builds it (usually its class) and where it goes."""
+    factory: Callable[[], Any]
+    coord: Any
+
+
+def factory_of(obj: Any) -> Callable[[], Any]:
+    """Retrieve what rebuilds obj: the factory of the record it was built from, or else its class."""
+    return getattr(obj, "layout_factory", None) or type(obj)
+
+
+def build(factory: Callable[[], Any]) -> Any:
+    """
+    Create an object with factory.
+
+    Postconditions:
+        - If the object accepts attributes, it remembers factory in obj.layout_factory, so it can
+          be captured again.
+    """
+    obj = factory()
+    try:
+        obj.layout_factory = factory
+    except AttributeError:
+        pass  # Objects without attributes (e.g. object()) are captured by their class
+    return obj
+
+
+class LayoutSnapshot:
+    """
+    An immutable description of a map layout, from which fresh objects are built on demand.
+
+    A layout is a tuple of LayoutRecord. Storing one costs a tuple, and instantiate() costs one
+    factory call per record; nothing is copied recursively, so objects that reference rooms,
+    players or the game state are never traversed.
+
+    Invariants:
+        - self.records never changes after construction.
+    """
+    __slots__ = ("_records",)
+
+    def __init__(self, records: Iterable[LayoutRecord] = ()) -> None:
+        """
+        Initialize the snapshot.
+
+        Preconditions:
+            - Every record's factory can be called without arguments.
+        """
+        self._records: Tuple[LayoutRecord, ...] = tuple(LayoutRecord(*record) for record in records)
+
+    @classmethod
+    def capture(cls, objects: Iterable[Tuple[Any, Any]]) -> "LayoutSnapshot":
+        """
+        Record a list of (object, coord) pairs by the factory of each object (see factory_of()).
+
+        Preconditions:
+            - Every object was built by instantiate(), or its class can be instantiated without
+              arguments. Layouts with other objects are built from LayoutRecord with a suitable
+              factory (e.g. a functools.partial).
+        """
+        return cls(LayoutRecord(factory_of(obj), coord) for obj, coord in objects)
+
+    @property
+    def records(self) -> Tuple[LayoutRecord, ...]:
+        return self._records
+
+    def instantiate(self) -> List[Tuple[Any, Any]]:
+        """
+        Build the layout.
+
+        Postconditions:
+            - Returns a list of (object, coord) with a new object for every record, in record order.
+            - Every object is created with build(), so it can be captured again.
+        """
+        return [(build(factory), coord) for factory, coord in self._records]
+
+    def __add__(self, other: "LayoutSnapshot") -> "LayoutSnapshot":
+        return LayoutSnapshot(self._records + tuple(other))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[LayoutRecord]:
+        return iter(self._records)
@@ -1,11 +1,85 @@
 from abc import ABC, abstractmethod
 import random
-import time
 from .imports import *
-from typing import TYPE_CHECKING
+from collections import OrderedDict
+from typing import Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from coord import Coord
-from heapq import *
+from .GameClock import GameClock
+from .PassabilityGrid import PassabilityGrid
+from .Pathfinding import Pathfinder, AStarPathfinder, FlowField, DStarLitePathfinder, DistanceTransformPathfinder, JumpPointPathfinder, HierarchicalPathfinder, direction_between
+
+DEFAULT_ROOM_SIZE = (15, 15)  # (height, width) assumed for rooms that do not say how large they are
+
+def get_room_size(room) -> Tuple[int, int]:
+    """
+    Retrieve the (height, width) of a room.
+
+    Postconditions:
+        - Returns the size of the room's passability index if it keeps one; otherwise its SIZE, or
+          the size the base map was created with, or DEFAULT_ROOM_SIZE if neither is known.
+    """
+    if hasattr(room, "get_passability_grid"):
+        grid = room.get_passability_grid()
+        return grid.height, grid.width
+    return getattr(room, "SIZE", None) or getattr(room, "_Map__size", None) or DEFAULT_ROOM_SIZE
+
+def get_passability_grid(room) -> PassabilityGrid:
+    """
+    Retrieve the passability index of a room.
+
+    Preconditions:
+        - room implements get_passability_grid() or get_map_objects_at(coordinate).
+    Postconditions:
+        - Returns the room's own index if it maintains one; otherwise a grid built by scanning the room.
+    """
+    if hasattr(room, "get_passability_grid"):
+        return room.get_passability_grid()
+    return PassabilityGrid.from_room(room, get_room_size(room))
+
+class HunterMovementState:
+    """
+    Everything a movement strategy remembers about one hunter between two moves.
+
+    Strategies themselves are shared by every hunter (see MovementStrategy.shared()), so this
+    state survives when a hunter switches strategies and back.
+
+    Invariants:
+        - len(self.path_cache) <= ShortestPathMovement.PATH_CACHE_SIZE.
+    """
+    def __init__(self) -> None:
+        self.clock: GameClock = GameClock()  # Only used in rooms without a game clock; advanced by Hunter.update()
+        self.last_teleport_tick: int = 0  # Teleport cooldown starts when the game starts
+        # (hunter cell, player cell, grid version) -> (grid, path, index of the hunter cell in path), least recently used first
+        self.path_cache: OrderedDict = OrderedDict()
+        self.cache_hits: int = 0
+        self.flow_field: Optional[FlowField] = None  # Last flow field read from the room
+        self.engines: dict = {}  # strategy -> search engine that keeps per-chase state for this hunter
+
+def get_movement_state(hunter) -> HunterMovementState:
+    """
+    Retrieve the movement state of a hunter, creating it on first use.
+
+    Postconditions:
+        - hunter.movement_state is a HunterMovementState and is returned.
+    """
+    state = getattr(hunter, "movement_state", None)
+    if state is None:
+        state = HunterMovementState()
+        hunter.movement_state = state
+    return state
+
+def get_game_clock(room, state: HunterMovementState) -> GameClock:
+    """
+    Retrieve the clock that times a hunter's moves.
+
+    Postconditions:
+        - Returns the room's game clock if it has one (room.get_game_clock()); otherwise the
+          hunter's own clock from its movement state.
+    """
+    if hasattr(room, "get_game_clock"):
+        return room.get_game_clock()
+    return state.clock
 
 class MovementStrategy(ABC):
     """Defines how the Hunter should move"""
@@ -18,7 +92,20 @@ class MovementStrategy(ABC):
             - The 'direction' parameter (if used) should be a valid string if provided.
         Postconditions:
             - The move() method returns a list of Message objects describing the outcome.
+        Invariants:
+            - A strategy keeps no per-hunter state: whatever it remembers about a hunter lives in
+              the hunter's HunterMovementState, so one instance can serve every hunter.
     """
+    _shared_instances: dict = {}  # strategy class -> instance returned by shared()
+
+    @classmethod
+    def shared(cls) -> "MovementStrategy":
+        """Returns the instance of this strategy class shared by every hunter, creating it on first use."""
+        instance = MovementStrategy._shared_instances.get(cls)
+        if instance is None:
+            instance = cls()
+            MovementStrategy._shared_instances[cls] = instance
+        return instance
 
     @abstractmethod
     def move(self, hunter, direction: str, player = None) -> list["Message"]:
@@ -44,17 +131,40 @@ class RandomMovement(MovementStrategy):
 
 class ShortestPathMovement(MovementStrategy):
     """
-    A movement strategy that uses a shortest-path algorithm (Dijkstra) for the hunter.
+    A movement strategy that moves the hunter along a shortest path (A* by default) toward the player.
     
     Preconditions:
         - 'hunter' must provide get_current_position() returning a Coord object.
         - 'player' must be provided and implement get_current_position().
         - 'hunter' and 'player' must both have get_current_room() returning a room object 
-          that supports get_map_objects_at(coordinate).
+          that supports get_passability_grid() or get_map_objects_at(coordinate).
     Postconditions:
-        - Moves the hunter one step in the direction that is part of the shortest path toward the player.
-        - Returns the result of hunter.base_move() using that computed direction.
+        - Moves the hunter up to hunter.speed steps (1 if the hunter has no speed) along a shortest
+          path toward the player, all read from a single path computation. The hunter stops early
+          at the end of the path or when a step is refused (e.g. by another character).
+        - Returns the messages of the hunter.base_move() calls made for those steps.
+        - If no path exists, falls back to hunter.base_move(direction).
+        - If the room has use_flow_field set, the steps are read from the room's shared flow field
+          (room.get_flow_field(goal)) instead of running a search for this hunter.
+        - Otherwise, if no pathfinder was given and the room provides a current next-hop table
+          (room.get_next_hop_table()), each step is a single table lookup.
+        - Otherwise the path is taken from the hunter's bounded LRU cache keyed by (hunter cell,
+          player cell, grid version) and only searched for on a miss.
+        - self.pathfinder_for(get_movement_state(hunter)).nodes_expanded holds the number of nodes
+          expanded by the search.
     """
+    PATH_CACHE_SIZE: int = 256  # Maximum number of (hunter cell, player cell, grid version) entries per hunter
+
+    def __init__(self, pathfinder: Optional[Pathfinder] = None) -> None:
+        # Engines only cache data derived from the grid, so one engine can serve every hunter
+        self.pathfinder: Pathfinder = pathfinder if pathfinder is not None else AStarPathfinder()
+        # Without an explicit engine, rooms that precompute next hops answer in O(1) and A* covers the rest
+        self.use_room_table: bool = pathfinder is None
+
+    def pathfinder_for(self, state: HunterMovementState) -> Pathfinder:
+        """Returns the search engine to use for the hunter owning state."""
+        return self.pathfinder
+
     def move(self, hunter, direction: str, player = None) -> list:
         assert hunter is not None, "Precondition failed: 'hunter' cannot be None."
         assert player is not None, "Precondition failed: 'player' cannot be None."
@@ -63,82 +173,150 @@ class ShortestPathMovement(MovementStrategy):
         assert hasattr(hunter, "get_current_room"), "Precondition failed: 'hunter' must have 'get_current_room()'."
         assert hasattr(player, "get_current_room"), "Precondition failed: 'player' must have 'get_current_room()'."
 
-        # Direction mappings
-        direc_map = {
-            'up': (-1, 0),
-            'down': (1, 0),
-            'left': (0, -1),
-            'right': (0, 1)
-        }
-        direc_map_inverse = {
-            (-1, 0): 'up',
-            (1, 0): 'down',
-            (0, -1): 'left',
-            (0, 1): 'right'}
-
-        def distance(pos1, pos2):
-            """
-            Calculate Manhattan distance between two positions.
-            Preconditions: pos1 and pos2 are tuples of two integers.
-            """
-            assert isinstance(pos1, tuple) and len(pos1) == 2, "Precondition failed: pos1 must be a tuple of two integers."
-            assert isinstance(pos2, tuple) and len(pos2) == 2, "Precondition failed: pos2 must be a tuple of two integers."
-            return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1]) 
-
-        # Use the given direction (computed via hunter.get_direction_toward)
         hunter_pos: Coord = hunter.get_current_position()
         player_pos: Coord = player.get_current_position()
         room = hunter.get_current_room()
 
-        prev_map = {}
+        state = get_movement_state(hunter)
+        speed: int = getattr(hunter, "speed", 1)
+        start = (hunter_pos.y, hunter_pos.x)
+        goal = (player_pos.y, player_pos.x)
+        if getattr(room, "use_flow_field", False):
+            # Shared with every other hunter in the room; recomputed only when the player or an obstacle moves
+            field = state.flow_field
+            if field is None or not field.is_current(get_passability_grid(room), goal):
+                field = state.flow_field = room.get_flow_field(goal)
+            steps = self._follow(field.next_step, start, speed)
+        else:
+            table = room.get_next_hop_table() if self.use_room_table and hasattr(room, "get_next_hop_table") else None
+            if table is not None:
+                steps = self._follow(lambda cell: table.next_step(cell, goal), start, speed)
+            else:
+                steps = self._steps_cached(state, get_passability_grid(room), start, goal, speed)
+        if not steps:
+            return hunter.base_move(direction)
 
-        pq = [(0, (hunter_pos.y, hunter_pos.x))]
-        visited = set()
-        
-        def is_tree_at_Coord(coord):
-            """
-            Check if a Tree object exists at the given coordinate.
-            Preconditions:
-                - 'room' must implement get_map_objects_at(coordinate).
-            """
-            assert hasattr(room, "get_map_objects_at"), "Precondition failed: 'room' must have 'get_map_objects_at()'."
-            obj_list = room.get_map_objects_at(coord)
-            for obj in obj_list:
-                if str(type(obj)) == "<class 'C303-project.example_map.Tree'>":
-                    return True
-            return False
-        
-        # Dijkstra's algorithm        
-        while pq:
-            dist, pos = heappop(pq)
-            if pos in visited or is_tree_at_Coord(Coord(pos[0], pos[1])):
-                continue
-            visited.add(pos)
-            if pos == (player_pos.y, player_pos.x):
-                break
-            for direction, (dy, dx) in direc_map.items():
-                new_pos = (pos[0] + dy, pos[1] + dx)
-                # Boundary check
-                if 0 <= new_pos[0] < 15 and 0 <= new_pos[1] < 15:
-                    heappush(pq, (distance(new_pos, (player_pos.y, player_pos.x)), new_pos))
-                    if new_pos not in prev_map:
-                        prev_map[new_pos] = pos
-        
-        # Backtrack to find the path
-        pos = (player_pos.y, player_pos.x)
-        while pos in prev_map:
-            if prev_map[pos] == (hunter_pos.y, hunter_pos.x):
+        messages: list = []
+        current = start
+        for step in steps:
+            messages += hunter.base_move(direction_between(current, step))
+            position = hunter.get_current_position()
+            if (position.y, position.x) != step:
+                break  # The step was refused; the next update plans again from wherever the hunter is
+            current = step
+        return messages
+
+    @staticmethod
+    def _follow(next_step, start: Tuple[int, int], count: int) -> list:
+        """Collect up to count cells by repeatedly asking next_step(cell) for the cell after the last one."""
+        steps = []
+        cell = start
+        while len(steps) < count:
+            cell = next_step(cell)
+            if cell is None:
                 break
-            else:
-                pos = prev_map[pos]
-        # Determine the direction to move
-        delta_pos = (pos[0] - hunter_pos.y, pos[1] - hunter_pos.x)
-        if delta_pos in direc_map_inverse:
-            direction = direc_map_inverse[delta_pos]
-            
-        return hunter.base_move(direction)
+            steps.append(cell)
+        return steps
+
+    def _steps_cached(self, state: HunterMovementState, grid: PassabilityGrid, start: Tuple[int, int], goal: Tuple[int, int], count: int) -> list:
+        """
+        Returns up to count cells toward goal, reusing a cached path while neither endpoint nor any obstacle moved.
+
+        Every cell of a computed path is cached, so a hunter that keeps chasing an idle player
+        walks the stored path without searching again. Engines that only plan the beginning of
+        the path search again once the hunter reaches the end of that part.
+        """
+        cache = state.path_cache
+        key = (start, goal, grid.version)
+        entry = cache.get(key)
+        # Versions are only comparable within one grid (rooms without an index get a new grid per call)
+        if entry is not None and entry[0] is grid:
+            cache.move_to_end(key)
+            state.cache_hits += 1
+            _, path, i = entry
+            return path[i + 1:i + 1 + count]
+
+        path = self.pathfinder_for(state).path_prefix(grid, start, goal)
+        if path is None:
+            return []
+        cached_cells = len(path) if path[-1] == goal else len(path) - 1
+        for i, cell in enumerate(path[:cached_cells]):
+            cache[(cell, goal, grid.version)] = (grid, path, i)
+            cache.move_to_end((cell, goal, grid.version))
+        while len(cache) > self.PATH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return path[1:1 + count]
     
     
+class IncrementalPathMovement(ShortestPathMovement):
+    """
+    A shortest-path strategy backed by D* Lite, which keeps its search between moves: the search
+    is rooted at the hunter and only grows or is repaired where the player's move, the hunter's
+    step or obstacles that appeared or disappeared require it. It pays off in rooms dense with
+    obstacles, where A* explores far more than the path around them on every player move.
+
+    Preconditions:
+        - Same as ShortestPathMovement.
+    Postconditions:
+        - Same as ShortestPathMovement.
+        - Each hunter gets its own D* Lite engine, kept in its HunterMovementState, since the
+          search state belongs to one chase.
+    """
+    def __init__(self) -> None:
+        super().__init__(DStarLitePathfinder())
+
+    def pathfinder_for(self, state: HunterMovementState) -> Pathfinder:
+        engine = state.engines.get(self)
+        if engine is None:
+            engine = DStarLitePathfinder()
+            state.engines[self] = engine
+        return engine
+
+
+class DistanceFieldMovement(ShortestPathMovement):
+    """
+    A shortest-path strategy for large rooms that descends a distance field toward the player,
+    computed with vectorized NumPy wavefronts (or in pure Python when NumPy is not installed).
+
+    Preconditions:
+        - Same as ShortestPathMovement.
+    Postconditions:
+        - Same as ShortestPathMovement.
+    """
+    def __init__(self) -> None:
+        super().__init__(DistanceTransformPathfinder())
+
+
+class JumpPointMovement(ShortestPathMovement):
+    """
+    A shortest-path strategy backed by Jump Point Search, for large and mostly open rooms where
+    plain A* spends its time on symmetric paths.
+
+    Preconditions:
+        - Same as ShortestPathMovement.
+    Postconditions:
+        - Same as ShortestPathMovement.
+    """
+    def __init__(self) -> None:
+        super().__init__(JumpPointPathfinder())
+
+
+class HierarchicalMovement(ShortestPathMovement):
+    """
+    A path-following strategy backed by hierarchical path-finding (HPA*) for very large rooms.
+    Paths are near-optimal rather than shortest, and only the part inside the hunter's current
+    cluster is planned cell by cell.
+
+    Preconditions:
+        - Same as ShortestPathMovement.
+    Postconditions:
+        - Same as ShortestPathMovement, except that the hunter may take a few more steps than
+          strictly needed to reach the player.
+    """
+    def __init__(self, cluster_size: int = 8) -> None:
+        super().__init__(HierarchicalPathfinder(cluster_size))
+
+
 class TeleportMovement(MovementStrategy):
     """
     A movement strategy that teleports the hunter closer to the player if a cooldown period has elapsed.
@@ -146,14 +324,20 @@ class TeleportMovement(MovementStrategy):
     Preconditions:
         - 'hunter' must implement get_current_room(), get_current_position(), update_position(), and base_move().
         - 'player' must implement get_current_position().
-        - Teleportation can only occur if at least 2 seconds have passed since the last teleport.
+        - Teleportation can only occur if COOLDOWN_SECONDS have passed on the game clock (see
+          get_game_clock() and cooldown_ticks()) since the hunter's last teleport. The last teleport
+          is kept in the hunter's HunterMovementState, so the cooldown survives strategy switches.
     Postconditions:
         - If teleportation conditions are met, the hunter is moved to a new target position.
           The room grid is updated, and GridMessage is returned.
         - Otherwise, returns the result of hunter.base_move(direction).
     """
-    def __init__(self):
-        self.last_teleport_time = time.time()
+    COOLDOWN_SECONDS: float = 2  # Game time between two teleports
+
+    @classmethod
+    def cooldown_ticks(cls, clock: GameClock) -> int:
+        """Returns the cooldown in ticks of clock, at the clock's tick rate."""
+        return clock.ticks(cls.COOLDOWN_SECONDS)
 
     def move(self, hunter, direction, player=None) -> list:
         assert hunter is not None, "Precondition failed: 'hunter' cannot be None."
@@ -163,10 +347,12 @@ class TeleportMovement(MovementStrategy):
         assert hasattr(player, "get_current_position"), "Precondition failed: 'player' must have 'get_current_position()'."
         
         room = hunter.get_current_room()
-        now = time.time()
+        state = get_movement_state(hunter)
+        clock = get_game_clock(room, state)
+        now = clock.now()
 
-        if now - self.last_teleport_time >= 2:
-            self.last_teleport_time = now
+        if now - state.last_teleport_tick >= self.cooldown_ticks(clock):
+            state.last_teleport_tick = now
 
             hunter_pos = hunter.get_current_position()
             player_pos = player.get_current_position()
@@ -1,6 +1,21 @@
 from abc import ABC, abstractmethod
+from enum import Enum
+from typing import FrozenSet, Optional
+
+class GameEvent(str, Enum):
+    """
+    The events a subject publishes. Members are strings, so they compare equal to their names
+    (GameEvent.WIN == "WIN").
+    """
+    ITEM_COLLECTED = "ITEM_COLLECTED"
+    ANIMAL_COLLECTED = "ANIMAL_COLLECTED"
+    WIN = "WIN"
+    LOSE = "LOSE"
 
 class Observer(ABC):
+    # Events this observer subscribes to; None subscribes to every event
+    topics: Optional[FrozenSet[GameEvent]] = None
+
     @abstractmethod
     def on_notify(self, event: str) -> None:
         """
@@ -8,5 +23,6 @@ class Observer(ABC):
 
         Preconditions:
             - event must be a non-empty string representing the notification event.
+            - event is one of self.topics (if self.topics is not None).
         """
-        pass
\ No newline at end of file
+        pass
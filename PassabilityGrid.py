@@ -0,0 +1,131 @@
+from .imports import *
+from collections import deque
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from coord import Coord
+
+class PassabilityGrid:
+    """
+    A flat blocked/free index of the static obstacles in a room.
+
+    Each cell stores how many blocking objects sit on it, so that removing one of
+    two stacked obstacles keeps the cell blocked. Characters (players and NPCs) are
+    not indexed since they move around on their own.
+
+    Invariants:
+        - self.height > 0 and self.width > 0.
+        - len(self.cells) == self.height * self.width.
+        - A cell is free if and only if its counter is 0.
+        - self.version increases every time a cell switches between blocked and free.
+        - The last CHANGE_LOG_SIZE switched cells are kept so that incremental searches can repair themselves.
+    """
+    CHANGE_LOG_SIZE: int = 256
+    def __init__(self, height: int, width: int) -> None:
+        """
+        Initialize an empty (fully free) grid.
+
+        Preconditions:
+            - height and width are positive integers.
+        Postconditions:
+            - Every cell of the grid is free.
+            - self.version == 0.
+        """
+        assert isinstance(height, int) and height > 0, "height must be a positive integer."
+        assert isinstance(width, int) and width > 0, "width must be a positive integer."
+        self.height: int = height
+        self.width: int = width
+        self.cells: bytearray = bytearray(height * width)
+        self.version: int = 0  # Lets search structures derived from the grid detect that they are stale
+        self._changed_cells: deque = deque(maxlen=self.CHANGE_LOG_SIZE)  # Flat index of each switched cell
+
+    @classmethod
+    def from_room(cls, room: Any, size: Tuple[int, int]) -> "PassabilityGrid":
+        """
+        Build a grid by scanning every tile of a room that does not maintain its own index.
+
+        Preconditions:
+            - room implements get_map_objects_at(coordinate).
+            - size is a (height, width) tuple of positive integers.
+        """
+        assert hasattr(room, "get_map_objects_at"), "room must have 'get_map_objects_at()'."
+        grid = cls(size[0], size[1])
+        for y in range(grid.height):
+            for x in range(grid.width):
+                for obj in room.get_map_objects_at(Coord(y, x)):
+                    if cls.blocks(obj):
+                        grid.mark(y, x)
+        return grid
+
+    @staticmethod
+    def blocks(obj: Any) -> bool:
+        """Returns True if obj is a static obstacle (an impassable object that is not a character)."""
+        if isinstance(obj, (Player, NPC)) or not hasattr(obj, "is_passable"):
+            return False
+        return not obj.is_passable()
+
+    def in_bounds(self, y: int, x: int) -> bool:
+        """Returns True if (y, x) lies inside the grid."""
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def is_free(self, y: int, x: int) -> bool:
+        """Returns True if (y, x) lies inside the grid and holds no obstacle."""
+        return 0 <= y < self.height and 0 <= x < self.width and not self.cells[y * self.width + x]
+
+    def mark(self, y: int, x: int) -> None:
+        """
+        Record one more obstacle on (y, x).
+
+        Preconditions:
+            - (y, x) is inside the grid.
+        """
+        assert self.in_bounds(y, x), "coordinate must be inside the grid."
+        i = y * self.width + x
+        assert self.cells[i] < 255, "too many obstacles stacked on one cell."
+        if not self.cells[i]:
+            self._record_change(i)
+        self.cells[i] += 1
+
+    def unmark(self, y: int, x: int) -> None:
+        """
+        Forget one obstacle on (y, x).
+
+        Preconditions:
+            - (y, x) is inside the grid and currently holds at least one obstacle.
+        """
+        assert self.in_bounds(y, x), "coordinate must be inside the grid."
+        i = y * self.width + x
+        assert self.cells[i] > 0, "cell holds no obstacle to remove."
+        self.cells[i] -= 1
+        if not self.cells[i]:
+            self._record_change(i)
+
+    def _record_change(self, i: int) -> None:
+        """Bump the version after cell i switched between blocked and free."""
+        self.version += 1
+        self._changed_cells.append(i)
+
+    def changed_cells_since(self, version: int) -> Optional[List[int]]:
+        """
+        Retrieve the flat indices of the cells that switched since the given version.
+
+        Preconditions:
+            - 0 <= version <= self.version.
+        Postconditions:
+            - Returns the switched cells in order (a cell may appear more than once), or None if
+              the change log no longer reaches back to version.
+        """
+        assert 0 <= version <= self.version, "version must not be newer than the grid."
+        count = self.version - version
+        if count > len(self._changed_cells):
+            return None
+        return list(self._changed_cells)[len(self._changed_cells) - count:]
+
+    def add_object(self, obj: Any, coord: "Coord") -> None:
+        """Index obj at coord if it is a static obstacle inside the grid."""
+        if self.blocks(obj) and self.in_bounds(coord.y, coord.x):
+            self.mark(coord.y, coord.x)
+
+    def remove_object(self, obj: Any, coord: "Coord") -> None:
+        """Drop obj at coord from the index if it is a static obstacle inside the grid."""
+        if self.blocks(obj) and self.in_bounds(coord.y, coord.x):
+            self.unmark(coord.y, coord.x)
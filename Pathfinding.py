@@ -0,0 +1,986 @@
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from typing import List, Optional, Tuple
+from .PassabilityGrid import PassabilityGrid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: DistanceTransformPathfinder falls back to a pure-Python FlowField
+    np = None
+
+Cell = Tuple[int, int]  # (y, x)
+
+# Direction mappings shared by every pathfinder
+DIRECTION_DELTAS = {
+    'up': (-1, 0),
+    'down': (1, 0),
+    'left': (0, -1),
+    'right': (0, 1)
+}
+DELTA_DIRECTIONS = {delta: direction for direction, delta in DIRECTION_DELTAS.items()}
+
+def direction_between(start: Cell, step: Cell) -> Optional[str]:
+    """
+    Returns the direction ('up', 'down', 'left' or 'right') leading from start to the adjacent cell step,
+    or None if the cells are not 4-neighbours.
+    """
+    return DELTA_DIRECTIONS.get((step[0] - start[0], step[1] - start[1]))
+
+
+class Pathfinder(ABC):
+    """
+    Abstract base class for the search engines used by path-following movement strategies.
+
+    Design By Contract:
+        Preconditions:
+            - grid is a PassabilityGrid and start/goal are (y, x) cells inside it.
+        Postconditions:
+            - find_path() returns the list of cells from start to goal (both included), or None if
+              the goal cannot be reached.
+            - self.nodes_expanded holds the number of nodes expanded by the last search.
+    """
+    _CACHES: Tuple[str, ...] = ()  # Attributes holding per-grid caches (weak dictionaries keyed by grid)
+
+    def __init__(self) -> None:
+        self.nodes_expanded: int = 0
+
+    def __getstate__(self) -> dict:
+        """Pickle the engine without its per-grid caches, which are rebuilt on demand."""
+        state = self.__dict__.copy()
+        for name in self._CACHES:
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        for name in self._CACHES:
+            setattr(self, name, weakref.WeakKeyDictionary())
+
+    @abstractmethod
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        pass
+
+    def next_step(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[Cell]:
+        """Returns the first cell to move to from start toward goal, or None if there is none."""
+        path = self.path_prefix(grid, start, goal)
+        if path is None or len(path) < 2:
+            return None
+        return path[1]
+
+    def path_prefix(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """
+        Returns the beginning of a path from start toward goal, or None if the goal cannot be reached.
+
+        Engines that plan coarsely may stop before the goal; by default the whole path is returned.
+        """
+        return self.find_path(grid, start, goal)
+
+
+class AStarPathfinder(Pathfinder):
+    """
+    A* search on a 4-connected grid with the Manhattan distance as heuristic.
+
+    The heuristic is consistent, so with a closed set every node is expanded at most once and
+    the returned path is a shortest one. Ties on f = g + h are broken in favour of the node
+    closest to the goal, which keeps the search on a straight line across open ground.
+    The goal cell is treated as passable (it is usually occupied by the player).
+    """
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+
+        width, height, cells = grid.width, grid.height, grid.cells
+        goal_y, goal_x = goal
+        start_index = start[0] * width + start[1]
+        goal_index = goal_y * width + goal_x
+
+        g_score = {start_index: 0}
+        came_from = {}
+        closed = bytearray(width * height)
+        h = abs(start[0] - goal_y) + abs(start[1] - goal_x)
+        open_heap = [(h, h, start_index)]
+
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if closed[current]:
+                continue  # stale entry for a node already expanded through a shorter path
+            closed[current] = 1
+            self.nodes_expanded += 1
+            if current == goal_index:
+                return self._reconstruct(came_from, current, width)
+
+            y, x = divmod(current, width)
+            g_next = g_score[current] + 1
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if not (0 <= ny < height and 0 <= nx < width):
+                    continue
+                neighbour = ny * width + nx
+                if closed[neighbour] or (cells[neighbour] and neighbour != goal_index):
+                    continue
+                if g_next < g_score.get(neighbour, g_next + 1):
+                    g_score[neighbour] = g_next
+                    came_from[neighbour] = current
+                    h = abs(ny - goal_y) + abs(nx - goal_x)
+                    heappush(open_heap, (g_next + h, h, neighbour))
+        return None
+
+    @staticmethod
+    def _reconstruct(came_from: dict, current: int, width: int) -> List[Cell]:
+        """Walk came_from back from current and return the path as (y, x) cells, start first."""
+        path = [divmod(current, width)]
+        while current in came_from:
+            current = came_from[current]
+            path.append(divmod(current, width))
+        path.reverse()
+        return path
+
+
+class FlowField:
+    """
+    Distances and next steps toward a single goal, computed with one breadth-first search.
+
+    Every hunter chasing the same goal can read its next step in O(1), so the cost of
+    pathfinding no longer grows with the number of hunters.
+
+    Invariants:
+        - self.distances[i] is the number of steps from cell i to the goal, or -1 if unreachable.
+        - self.next_cells[i] is the flat index of a neighbour of cell i one step closer to the goal,
+          or -1 for the goal itself and for unreachable cells.
+    """
+    def __init__(self, grid: PassabilityGrid, goal: Cell) -> None:
+        """
+        Run a breadth-first search from goal over the free cells of grid.
+
+        Preconditions:
+            - goal is a cell inside grid (it is treated as passable).
+        """
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        self.goal: Cell = goal
+        self.version: int = grid.version
+        self.width: int = grid.width
+        self.height: int = grid.height
+        self.distances = array('i', [-1]) * (grid.width * grid.height)
+        self.next_cells = array('i', [-1]) * (grid.width * grid.height)
+        self.nodes_expanded: int = 0
+
+        width, height, cells = grid.width, grid.height, grid.cells
+        distances, next_cells = self.distances, self.next_cells
+        goal_index = goal[0] * width + goal[1]
+        distances[goal_index] = 0
+        queue = deque([goal_index])
+        while queue:
+            current = queue.popleft()
+            self.nodes_expanded += 1
+            y, x = divmod(current, width)
+            d_next = distances[current] + 1
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if 0 <= ny < height and 0 <= nx < width:
+                    neighbour = ny * width + nx
+                    if distances[neighbour] < 0 and not cells[neighbour]:
+                        distances[neighbour] = d_next
+                        next_cells[neighbour] = current
+                        queue.append(neighbour)
+
+    def is_current(self, grid: PassabilityGrid, goal: Cell) -> bool:
+        """Returns True if the field was computed for goal on the current state of grid."""
+        return goal == self.goal and grid.version == self.version and grid.width == self.width and grid.height == self.height
+
+    def distance(self, cell: Cell) -> Optional[int]:
+        """Returns the number of steps from cell to the goal, or None if the goal cannot be reached."""
+        d = self.distances[cell[0] * self.width + cell[1]]
+        return d if d >= 0 else None
+
+    def next_step(self, cell: Cell) -> Optional[Cell]:
+        """Returns the neighbour of cell to move to toward the goal, or None if there is none."""
+        step = self.next_cells[cell[0] * self.width + cell[1]]
+        return divmod(step, self.width) if step >= 0 else None
+
+
+class DStarLitePathfinder(Pathfinder):
+    """
+    Incremental shortest-path search (D* Lite) for a moving hunter chasing a moving player.
+
+    The search is rooted at the hunter, so g[s] is the distance from the hunter to s (plus a
+    constant offset, see below), and the player is the moving end: when the player moves, only
+    the heuristic offset km changes, as for the start in standard D* Lite, and the search goes on
+    from the vertices it already settled. When cells switch between blocked and free, only the
+    vertices around them are repaired.
+
+    When the hunter steps along its path, the root moves inside the search tree (kept in
+    self._parent). As in Moving Target D* Lite, the subtree below the new root keeps its values:
+    their distances from the new root differ from the stored ones by g[new root], which becomes
+    the root's fixed value instead of 0. The rest of the tree (the old root and the branches it
+    no longer leads to) is cleared, and its border with the subtree goes back in the queue, so
+    the search grows again from there only if the player needs it.
+
+    The search restarts from scratch for a new grid, a grid whose change log no longer covers the
+    last call, or a hunter that left the search tree (e.g. it teleported).
+
+    An instance follows a single hunter: it must not be shared between searches from different starts.
+    """
+    INF: int = 1 << 30
+    _ADJACENCY: dict = {}  # (height, width) -> 4-neighbours of every flat index, shared by all instances
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.replans: int = 0  # Number of times the search had to start over
+        self._grid: Optional[PassabilityGrid] = None
+
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        self._prepare(grid, start, goal)
+        current = self._target
+        if self._g[current] >= self.INF:
+            return None
+        path = [goal]
+        while current != self._root:
+            current = self._best_predecessor(current)
+            path.append(divmod(current, self._width))
+        path.reverse()
+        return path
+
+    # ------------------------------------------------------------------ search state
+
+    def _prepare(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> None:
+        """Bring the search up to date for start, goal and the current state of grid."""
+        self.nodes_expanded = 0
+        changed = grid.changed_cells_since(self._version) if grid is self._grid else None
+        start_index = start[0] * grid.width + start[1]
+        goal_index = goal[0] * grid.width + goal[1]
+        if changed is None or not self._move_root(start_index):
+            self._reset(grid, start_index, goal_index)
+        else:
+            self._version = grid.version
+            if goal_index != self._target:
+                self._km += self._h(self._target, goal_index)
+                previous, self._target = self._target, goal_index
+                if self._cells[previous] or self._cells[goal_index]:
+                    changed += (previous, goal_index)  # The target is passable even on a blocked cell
+            for cell in changed:
+                self._update_vertex(cell)
+                for neighbour in self._neighbours(cell):
+                    self._update_vertex(neighbour)
+        self._compute_shortest_path()
+
+    def _reset(self, grid: PassabilityGrid, start_index: int, goal_index: int) -> None:
+        """Drop every stored value and seed a new search from start_index."""
+        self.replans += 1
+        self._grid = grid
+        self._version = grid.version
+        self._width, self._height, self._cells = grid.width, grid.height, grid.cells
+        self._adjacent = self._adjacency(grid.height, grid.width)
+        self._g = [self.INF] * (grid.width * grid.height)
+        self._rhs = [self.INF] * (grid.width * grid.height)
+        self._parent = [-1] * (grid.width * grid.height)  # Neighbour that gives each vertex its rhs, or -1
+        self._queued = {}  # vertex -> key of its live heap entry; other heap entries are stale
+        self._heap = []
+        self._km = 0
+        self._root, self._target = start_index, goal_index
+        self._rhs[start_index] = 0
+        self._push(start_index)
+
+    def _move_root(self, start_index: int) -> bool:
+        """
+        Re-root the search at start_index, keeping the subtree below it.
+
+        Postconditions:
+            - Returns False, changing nothing, if start_index was not reached by the search.
+            - Otherwise every vertex outside the subtree of start_index is cleared, and the
+              cleared vertices next to the subtree are queued again.
+        """
+        old_root = self._root
+        if start_index == old_root:
+            return True
+        g, rhs, parent = self._g, self._rhs, self._parent
+        if g[start_index] >= self.INF:
+            return False
+        ancestors = []
+        vertex = parent[start_index]
+        while vertex != -1 and len(ancestors) < len(g):
+            ancestors.append(vertex)
+            vertex = parent[vertex]
+        if not ancestors or ancestors[-1] != old_root:
+            return False
+
+        # Clear the old root and every branch hanging off the way down to the new root
+        cleared = []
+        stack = ancestors
+        seen = set(ancestors)
+        while stack:
+            u = stack.pop()
+            cleared.append(u)
+            for n in self._neighbours(u):
+                if parent[n] == u and n != start_index and n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+        for u in cleared:
+            g[u] = rhs[u] = self.INF
+            parent[u] = -1
+            self._queued.pop(u, None)
+
+        self._root = start_index
+        rhs[start_index] = g[start_index]  # Distances from the new root, shifted by a constant
+        parent[start_index] = -1
+        self._update_vertex(start_index)
+        # The vertices kept take their rhs from a parent that was kept too, so only the cleared
+        # ones change: those next to the subtree go back in the queue with their new rhs
+        for u in cleared:
+            self._update_vertex(u)
+        return True
+
+    def _h(self, a: int, b: int) -> int:
+        """Manhattan distance between two flat indices."""
+        ay, ax = divmod(a, self._width)
+        by, bx = divmod(b, self._width)
+        return abs(ay - by) + abs(ax - bx)
+
+    def _neighbours(self, s: int) -> Tuple[int, ...]:
+        """Flat indices of the 4-neighbours of s inside the grid."""
+        return self._adjacent[s]
+
+    @classmethod
+    def _adjacency(cls, height: int, width: int) -> List[Tuple[int, ...]]:
+        """The 4-neighbours of every flat index of a height x width grid, computed once per shape."""
+        table = cls._ADJACENCY.get((height, width))
+        if table is None:
+            table = []
+            for s in range(height * width):
+                y, x = divmod(s, width)
+                table.append(tuple(n for n, inside in ((s - width, y > 0), (s + width, y < height - 1),
+                                                       (s - 1, x > 0), (s + 1, x < width - 1)) if inside))
+            cls._ADJACENCY[(height, width)] = table
+        return table
+
+    def _passable(self, s: int) -> bool:
+        return not self._cells[s] or s == self._target or s == self._root
+
+    def _key(self, s: int) -> Tuple[int, int, int]:
+        g, rhs = self._g[s], self._rhs[s]
+        y, x = divmod(s, self._width)
+        ty, tx = divmod(self._target, self._width)
+        h = abs(y - ty) + abs(x - tx) + self._km
+        if g < rhs:  # Underconsistent vertices go first among equal estimates, so raised values are never missed
+            return (g + h, 0, -g)
+        # Among the others, like A*, the vertex furthest from the hunter goes first, heading straight for the player
+        return (rhs + h, 1, -rhs)
+
+    def _push(self, s: int) -> None:
+        key = self._key(s)
+        self._queued[s] = key
+        heappush(self._heap, (key, s))
+
+    def _update_vertex(self, u: int) -> None:
+        """Recompute rhs(u) from its neighbours and (re)queue u if it became inconsistent."""
+        g = self._g
+        if u != self._root:
+            best, best_parent = self.INF, -1
+            if self._passable(u):
+                cells, target, root = self._cells, self._target, self._root
+                for s in self._adjacent[u]:
+                    if g[s] + 1 < best and (not cells[s] or s == target or s == root):
+                        best, best_parent = g[s] + 1, s
+            self._rhs[u] = best
+            self._parent[u] = best_parent
+        if g[u] != self._rhs[u]:
+            self._push(u)
+        else:
+            self._queued.pop(u, None)
+
+    def _top_key(self) -> Tuple[int, int, int]:
+        """Key of the smallest live heap entry, discarding stale entries on the way."""
+        heap = self._heap
+        while heap and self._queued.get(heap[0][1]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0] if heap else (self.INF, 1, 0)
+
+    def _compute_shortest_path(self) -> None:
+        g, rhs, target, root = self._g, self._rhs, self._target, self._root
+        parent, cells, queued = self._parent, self._cells, self._queued
+        while self._top_key() < self._key(target) or rhs[target] != g[target]:
+            if not self._heap:
+                break  # the player cannot be reached
+            k_old, u = heappop(self._heap)
+            del self._queued[u]
+            self.nodes_expanded += 1
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+            elif g[u] > rhs[u]:
+                g[u] = g_next = rhs[u]
+                g_next += 1
+                # A lower g[u] can only lower its neighbours' rhs, so there is no need to rescan theirs
+                for s in self._adjacent[u]:
+                    if g_next < rhs[s] and s != root and (not cells[s] or s == target):
+                        rhs[s] = g_next
+                        parent[s] = u
+                        if g[s] != g_next:
+                            self._push(s)
+                        else:
+                            queued.pop(s, None)
+            else:
+                g[u] = self.INF
+                self._update_vertex(u)
+                for s in self._neighbours(u):
+                    self._update_vertex(s)
+
+    def _best_predecessor(self, s: int) -> int:
+        """Neighbour of s closest to the hunter."""
+        best, best_g = -1, self.INF
+        for n in self._neighbours(s):
+            if self._passable(n) and self._g[n] < best_g:
+                best, best_g = n, self._g[n]
+        return best
+
+
+class NextHopTable:
+    """
+    Precomputed next hop between every pair of cells of a grid (one breadth-first search per free cell).
+
+    The table answers next_step(start, goal) with a single lookup. It stores one byte per
+    (start, goal) pair, i.e. (height * width) ** 2 bytes (about 50 KB for a 15x15 room), so it
+    is only meant for small rooms whose obstacles do not move during a game.
+
+    Invariants:
+        - self.hops[start * n + goal] is 0 if goal cannot be reached from start (or start == goal),
+          otherwise the code (1-4) of the direction of the first step, with n = height * width.
+    """
+    MAX_CELLS: int = 24 * 24  # Building takes roughly 0.2 s at this size and grows with the square of the area
+    _CODE_DELTAS = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1))  # code -> (dy, dx): none, up, down, left, right
+
+    def __init__(self, grid: PassabilityGrid) -> None:
+        """
+        Build the table for the current state of grid.
+
+        Preconditions:
+            - grid.height * grid.width <= NextHopTable.MAX_CELLS.
+        """
+        n = grid.width * grid.height
+        assert n <= self.MAX_CELLS, "Precondition failed: grid is too large for an all-pairs table."
+        self.version: int = grid.version
+        self.width: int = grid.width
+        self.height: int = grid.height
+        self.hops: bytearray = bytearray(n * n)
+
+        width, height, cells, hops = grid.width, grid.height, grid.cells, self.hops
+        seen = array('i', [-1]) * n  # goal index that last visited each cell
+        for goal in range(n):
+            if cells[goal]:
+                continue
+            seen[goal] = goal
+            queue = deque([goal])
+            while queue:
+                current = queue.popleft()
+                y, x = divmod(current, width)
+                # The neighbour reaches current by moving in the opposite direction of the offset
+                if y > 0 and seen[current - width] != goal and not cells[current - width]:
+                    seen[current - width] = goal
+                    hops[(current - width) * n + goal] = 2  # down
+                    queue.append(current - width)
+                if y < height - 1 and seen[current + width] != goal and not cells[current + width]:
+                    seen[current + width] = goal
+                    hops[(current + width) * n + goal] = 1  # up
+                    queue.append(current + width)
+                if x > 0 and seen[current - 1] != goal and not cells[current - 1]:
+                    seen[current - 1] = goal
+                    hops[(current - 1) * n + goal] = 4  # right
+                    queue.append(current - 1)
+                if x < width - 1 and seen[current + 1] != goal and not cells[current + 1]:
+                    seen[current + 1] = goal
+                    hops[(current + 1) * n + goal] = 3  # left
+                    queue.append(current + 1)
+
+    def is_current(self, grid: PassabilityGrid) -> bool:
+        """Returns True if the table was built from the current state of grid."""
+        return grid.version == self.version and grid.width == self.width and grid.height == self.height
+
+    def next_step(self, start: Cell, goal: Cell) -> Optional[Cell]:
+        """Returns the neighbour of start to move to toward goal, or None if there is none."""
+        n = self.width * self.height
+        code = self.hops[(start[0] * self.width + start[1]) * n + goal[0] * self.width + goal[1]]
+        if not code:
+            return None
+        dy, dx = self._CODE_DELTAS[code]
+        return (start[0] + dy, start[1] + dx)
+
+
+class DistanceTransformPathfinder(Pathfinder):
+    """
+    Distance field toward the goal computed by vectorized wavefront expansion with NumPy.
+
+    The room is turned into a boolean array of free cells and every wavefront step shifts the
+    current front in the four directions at once, so one step costs a few array operations no
+    matter how wide the front is. This keeps large rooms (100x100 and beyond) in the millisecond
+    range. Without NumPy the field is computed by the pure-Python FlowField instead.
+
+    The last field of each grid is kept and reused as long as the goal and the obstacles do not
+    change. Fields are kept per grid, so one engine can serve the hunters of several rooms.
+    """
+    _CACHES = ("_fields",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # grid -> (grid version, goal, flat distances to the goal with -1 where unreachable)
+        self._fields: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        distances = self._field(grid, goal)
+        width = grid.width
+        current = start[0] * width + start[1]
+        if distances[current] < 0:
+            return None
+        path = [start]
+        while distances[current] > 0:
+            current = self._downhill(grid, distances, current)
+            path.append(divmod(current, width))
+        return path
+
+    def next_step(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[Cell]:
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        distances = self._field(grid, goal)
+        current = start[0] * grid.width + start[1]
+        if distances[current] <= 0:
+            return None
+        return divmod(self._downhill(grid, distances, current), grid.width)
+
+    def _field(self, grid: PassabilityGrid, goal: Cell):
+        """Return the flat distance field toward goal, recomputing it only if the goal or the obstacles changed."""
+        self.nodes_expanded = 0
+        entry = self._fields.get(grid)
+        if entry is not None and entry[0] == grid.version and entry[1] == goal:
+            return entry[2]
+        version = grid.version
+        if np is None:
+            field = FlowField(grid, goal)
+            distances = field.distances
+            self.nodes_expanded = field.nodes_expanded
+        else:
+            distances = self._wavefront(grid, goal)
+        self._fields[grid] = (version, goal, distances)
+        return distances
+
+    def _wavefront(self, grid: PassabilityGrid, goal: Cell):
+        """Compute the distance field with NumPy, one vectorized step per distance level."""
+        free = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.width) == 0
+        free[goal] = True
+        distances = np.full((grid.height, grid.width), -1, dtype=np.int32)
+        distances[goal] = 0
+        front = np.zeros_like(free)
+        front[goal] = True
+        level = 0
+        while True:
+            grown = np.zeros_like(front)
+            grown[1:, :] |= front[:-1, :]
+            grown[:-1, :] |= front[1:, :]
+            grown[:, 1:] |= front[:, :-1]
+            grown[:, :-1] |= front[:, 1:]
+            front = grown & free & (distances < 0)
+            if not front.any():
+                break
+            level += 1
+            distances[front] = level
+        flat = distances.ravel()
+        self.nodes_expanded = int(np.count_nonzero(flat >= 0))
+        return flat
+
+    @staticmethod
+    def _downhill(grid: PassabilityGrid, distances, current: int) -> int:
+        """Return a neighbour of current that is one step closer to the goal."""
+        width = grid.width
+        y, x = divmod(current, width)
+        target = distances[current] - 1
+        for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+            if 0 <= ny < grid.height and 0 <= nx < width and distances[ny * width + nx] == target:
+                return ny * width + nx
+        raise AssertionError("distance field has no downhill neighbour")
+
+
+class JumpPointPathfinder(Pathfinder):
+    """
+    Jump Point Search for 4-connected grids.
+
+    Shortest paths are searched in a canonical form where vertical moves come before horizontal
+    ones. A horizontal scan keeps going until it hits the goal or a forced neighbour (a free cell
+    above or below whose own horizontal predecessor is blocked), and a vertical scan stops on
+    the first cell from which a horizontal scan finds something. Only those jump points enter
+    the A* open list, so open areas are crossed without pushing the symmetric frontier plain
+    A* builds there. The returned path still lists every cell.
+
+    Where each horizontal scan stops depends only on the obstacles, so those stops are
+    precomputed once per grid version and a horizontal scan becomes a lookup.
+    """
+    _CACHES = ("_stops",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # grid -> (grid version, (stops going left, stops going right)), see _build_stops
+        self._stops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+
+        width, height, cells = grid.width, grid.height, grid.cells
+        goal_y, goal_x = goal
+
+        def passable(y: int, x: int) -> bool:
+            return 0 <= y < height and 0 <= x < width and (not cells[y * width + x] or (y == goal_y and x == goal_x))
+
+        def scan_horizontal(y: int, x: int, dx: int) -> Optional[Cell]:
+            while True:
+                x += dx
+                if not passable(y, x):
+                    return None
+                if y == goal_y and x == goal_x:
+                    return (y, x)
+                if (passable(y - 1, x) and not passable(y - 1, x - dx)) or (passable(y + 1, x) and not passable(y + 1, x - dx)):
+                    return (y, x)
+
+        if cells[goal_y * width + goal_x]:
+            # The precomputed stops assume the goal is an ordinary free cell
+            jump_horizontal = scan_horizontal
+        else:
+            left_stops, right_stops = self._horizontal_stops(grid)
+
+            def jump_horizontal(y: int, x: int, dx: int) -> Optional[Cell]:
+                stop = (right_stops if dx > 0 else left_stops)[y * width + x]
+                if y == goal_y and (x < goal_x <= stop if dx > 0 else stop <= goal_x < x):
+                    return goal
+                if 0 <= stop < width and not cells[y * width + stop]:
+                    return (y, stop)  # forced neighbour
+                return None
+
+        def jump_vertical(y: int, x: int, dy: int) -> Optional[Cell]:
+            while True:
+                y += dy
+                if not passable(y, x):
+                    return None
+                if (y == goal_y and x == goal_x) or jump_horizontal(y, x, 1) or jump_horizontal(y, x, -1):
+                    return (y, x)
+
+        g_score = {start: 0}
+        came_from = {}
+        arrived = {start: (0, 0)}  # direction in which each jump point was reached
+        closed = set()
+        h = abs(start[0] - goal_y) + abs(start[1] - goal_x)
+        open_heap = [(h, h, start)]
+
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_expanded += 1
+            if current == goal:
+                return self._expand(came_from, current)
+
+            y, x = current
+            dy, dx = arrived[current]
+            if dx:
+                # Moving horizontally: keep going, and turn only toward forced neighbours
+                directions = [(0, dx)]
+                for v in (-1, 1):
+                    if passable(y + v, x) and not passable(y + v, x - dx):
+                        directions.append((v, 0))
+            elif dy:
+                directions = [(dy, 0), (0, -1), (0, 1)]
+            else:
+                directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+            for step_y, step_x in directions:
+                if step_x:
+                    jump_point = jump_horizontal(y, x, step_x)
+                else:
+                    jump_point = jump_vertical(y, x, step_y)
+                if jump_point is None or jump_point in closed:
+                    continue
+                g_next = g_score[current] + abs(jump_point[0] - y) + abs(jump_point[1] - x)
+                if g_next < g_score.get(jump_point, g_next + 1):
+                    g_score[jump_point] = g_next
+                    came_from[jump_point] = current
+                    arrived[jump_point] = (step_y, step_x)
+                    h = abs(jump_point[0] - goal_y) + abs(jump_point[1] - goal_x)
+                    heappush(open_heap, (g_next + h, h, jump_point))
+        return None
+
+    def _horizontal_stops(self, grid: PassabilityGrid):
+        """Return the (left, right) stop tables of grid, rebuilding them if the obstacles changed."""
+        entry = self._stops.get(grid)
+        if entry is not None and entry[0] == grid.version:
+            return entry[1]
+        version = grid.version
+        stops = self._build_stops(grid)
+        self._stops[grid] = (version, stops)
+        return stops
+
+    @staticmethod
+    def _build_stops(grid: PassabilityGrid):
+        """
+        For every cell and horizontal direction, compute the column where a scan started there stops.
+
+        The stop is the first cell in that direction that is either blocked / outside the grid
+        (the scan fails) or free with a forced neighbour (the scan returns it).
+        """
+        width, height, cells = grid.width, grid.height, grid.cells
+        wall_row = bytes([1]) * width  # rows outside the grid count as blocked
+        left = array('i', [0]) * (width * height)
+        right = array('i', [0]) * (width * height)
+        for y in range(height):
+            row = y * width
+            here = cells[row:row + width]
+            above = cells[row - width:row] if y > 0 else wall_row
+            below = cells[row + width:row + 2 * width] if y < height - 1 else wall_row
+            stop = width  # outside the grid
+            for x in range(width - 1, -1, -1):
+                right[row + x] = stop
+                # forced when moving right: a free cell above/below whose left neighbour is blocked
+                if here[x] or (x > 0 and ((not above[x] and above[x - 1]) or (not below[x] and below[x - 1]))) \
+                        or (x == 0 and (not above[x] or not below[x])):
+                    stop = x
+            stop = -1
+            for x in range(width):
+                left[row + x] = stop
+                if here[x] or (x < width - 1 and ((not above[x] and above[x + 1]) or (not below[x] and below[x + 1]))) \
+                        or (x == width - 1 and (not above[x] or not below[x])):
+                    stop = x
+        return left, right
+
+    @staticmethod
+    def _expand(came_from: dict, current: Cell) -> List[Cell]:
+        """Rebuild the full cell-by-cell path from the chain of jump points ending at current."""
+        jump_points = [current]
+        while current in came_from:
+            current = came_from[current]
+            jump_points.append(current)
+        jump_points.reverse()
+        path = [jump_points[0]]
+        for (y, x), (ny, nx) in zip(jump_points, jump_points[1:]):
+            step_y = (ny > y) - (ny < y)
+            step_x = (nx > x) - (nx < x)
+            while (y, x) != (ny, nx):
+                y, x = y + step_y, x + step_x
+                path.append((y, x))
+        return path
+
+
+class HierarchicalPathfinder(Pathfinder):
+    """
+    Hierarchical path-finding (HPA*) over square clusters of the grid.
+
+    The grid is split into cluster_size x cluster_size clusters. Wherever two neighbouring
+    clusters share a run of free border cells, one entrance (two for long runs) links them, and
+    the entrances of each cluster are joined by their in-cluster distances. This abstract graph
+    is built once per grid version, so for a static layout it is built once per game. Graphs
+    are kept per grid, so one engine can serve the hunters of several rooms.
+
+    A query only links the start and the goal to the entrances of their own clusters, runs A*
+    on the small abstract graph and refines the first abstract edge into cells, which is all a
+    hunter needs for its next step. Paths are near-optimal: they may be slightly longer than
+    true shortest paths because they cross clusters at the chosen entrances.
+    """
+    _CACHES = ("_graphs",)
+    LONG_ENTRANCE: int = 6  # Border runs at least this long get an entrance at each end instead of one in the middle
+
+    def __init__(self, cluster_size: int = 8) -> None:
+        assert isinstance(cluster_size, int) and cluster_size > 1, "cluster_size must be an integer greater than 1."
+        super().__init__()
+        self.cluster_size: int = cluster_size
+        # grid -> (grid version, edges, clusters), where edges maps an entrance cell to a list of
+        # (entrance cell, cost) and clusters maps a cluster (cy, cx) to the list of its entrance cells
+        self._graphs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def find_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        abstract = self._abstract_path(grid, start, goal)
+        if abstract is None:
+            return None
+        path = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            path.extend(self._refine(grid, a, b, goal)[1:])
+        return path
+
+    def path_prefix(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        abstract = self._abstract_path(grid, start, goal)
+        if abstract is None:
+            return None
+        if len(abstract) == 1:
+            return [start]
+        return self._refine(grid, abstract[0], abstract[1], goal)
+
+    # ------------------------------------------------------------------ abstract graph
+
+    def _cluster_of(self, cell: Cell) -> Tuple[int, int]:
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _bounds(self, grid: PassabilityGrid, cluster: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """(top, left, bottom, right) of a cluster, bottom/right excluded."""
+        top, left = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return top, left, min(top + self.cluster_size, grid.height), min(left + self.cluster_size, grid.width)
+
+    def _local_search(self, grid: PassabilityGrid, source: Cell, goal: Cell) -> Tuple[dict, dict]:
+        """Breadth-first search from source that stays inside the cluster of source."""
+        top, left, bottom, right = self._bounds(grid, self._cluster_of(source))
+        width, cells = grid.width, grid.cells
+        distances = {source: 0}
+        parents = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            self.nodes_expanded += 1
+            y, x = current
+            for neighbour in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                ny, nx = neighbour
+                if top <= ny < bottom and left <= nx < right and neighbour not in distances \
+                        and (not cells[ny * width + nx] or neighbour == goal):
+                    distances[neighbour] = distances[current] + 1
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return distances, parents
+
+    def _build(self, grid: PassabilityGrid) -> Tuple[dict, dict]:
+        """Find the entrances between clusters and connect the entrances of each cluster; returns (edges, clusters)."""
+        cells, width = grid.cells, grid.width
+        edges = {}
+        clusters = {}
+
+        def add_entrance(a: Cell, b: Cell) -> None:
+            for cell, other in ((a, b), (b, a)):
+                if cell not in edges:
+                    edges[cell] = []
+                    clusters.setdefault(self._cluster_of(cell), []).append(cell)
+                edges[cell].append((other, 1))
+
+        def scan_border(pairs) -> None:
+            run = []
+            for a, b in pairs + [(None, None)]:
+                if a is not None and not cells[a[0] * width + a[1]] and not cells[b[0] * width + b[1]]:
+                    run.append((a, b))
+                    continue
+                if len(run) >= self.LONG_ENTRANCE:
+                    add_entrance(*run[0])
+                    add_entrance(*run[-1])
+                elif run:
+                    add_entrance(*run[len(run) // 2])
+                run = []
+
+        # Each border is scanned one cluster at a time so that an entrance always joins exactly two clusters
+        size = self.cluster_size
+        for border in range(size, grid.height, size):  # horizontal borders between cluster rows
+            for left in range(0, grid.width, size):
+                scan_border([((border - 1, x), (border, x)) for x in range(left, min(left + size, grid.width))])
+        for border in range(size, grid.width, size):   # vertical borders between cluster columns
+            for top in range(0, grid.height, size):
+                scan_border([((y, border - 1), (y, border)) for y in range(top, min(top + size, grid.height))])
+
+        for entrances in clusters.values():
+            for entrance in entrances:
+                distances, _ = self._local_search(grid, entrance, entrance)
+                for other in entrances:
+                    if other != entrance and other in distances:
+                        edges[entrance].append((other, distances[other]))
+
+        return edges, clusters
+
+    def _graph(self, grid: PassabilityGrid) -> Tuple[dict, dict]:
+        """Return the (edges, clusters) of grid, rebuilding them if the obstacles changed."""
+        entry = self._graphs.get(grid)
+        if entry is not None and entry[0] == grid.version:
+            return entry[1], entry[2]
+        version = grid.version
+        edges, clusters = self._build(grid)
+        self._graphs[grid] = (version, edges, clusters)
+        return edges, clusters
+
+    def _abstract_path(self, grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """A* over the entrances, with start and goal linked to the entrances of their clusters."""
+        assert grid.in_bounds(start[0], start[1]), "Precondition failed: 'start' must be inside the grid."
+        assert grid.in_bounds(goal[0], goal[1]), "Precondition failed: 'goal' must be inside the grid."
+        edges, clusters = self._graph(grid)
+        self.nodes_expanded = 0
+        if start == goal:
+            return [start]
+
+        start_distances, _ = self._local_search(grid, start, goal)
+        start_links = [(entrance, start_distances[entrance])
+                       for entrance in clusters.get(self._cluster_of(start), []) if entrance in start_distances]
+        if goal in start_distances:
+            start_links.append((goal, start_distances[goal]))
+
+        # A blocked goal (such as the player's tile) is entered from one of its free neighbours,
+        # which may lie in another cluster
+        goal_y, goal_x = goal
+        if grid.is_free(goal_y, goal_x):
+            goal_sources = [(goal, 0)]
+        else:
+            goal_sources = [(cell, 1) for cell in ((goal_y - 1, goal_x), (goal_y + 1, goal_x), (goal_y, goal_x - 1), (goal_y, goal_x + 1))
+                            if grid.is_free(cell[0], cell[1])]
+        goal_links = {}
+        for source, offset in goal_sources:
+            distances, _ = self._local_search(grid, source, goal)
+            for entrance in clusters.get(self._cluster_of(source), []):
+                if entrance in distances:
+                    goal_links[entrance] = min(goal_links.get(entrance, distances[entrance] + offset), distances[entrance] + offset)
+            if offset and source in start_distances:
+                start_links.append((goal, start_distances[source] + offset))
+
+        g_score = {start: 0}
+        came_from = {}
+        closed = set()
+        h = abs(start[0] - goal_y) + abs(start[1] - goal_x)
+        open_heap = [(h, h, start)]
+        while open_heap:
+            _, _, current = heappop(open_heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_expanded += 1
+            if current == goal:
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                path.reverse()
+                return path
+            links = list(edges.get(current, []))
+            if current == start:
+                links += start_links
+            if current in goal_links:
+                links.append((goal, goal_links[current]))
+            for neighbour, cost in links:
+                g_next = g_score[current] + cost
+                if neighbour not in closed and g_next < g_score.get(neighbour, g_next + 1):
+                    g_score[neighbour] = g_next
+                    came_from[neighbour] = current
+                    h = abs(neighbour[0] - goal_y) + abs(neighbour[1] - goal_x)
+                    heappush(open_heap, (g_next + h, h, neighbour))
+        return None
+
+    def _refine(self, grid: PassabilityGrid, a: Cell, b: Cell, goal: Cell) -> List[Cell]:
+        """
+        Turn one abstract edge into cells by a search inside the cluster of a. When b lies in
+        another cluster (a border crossing, or a blocked goal entered from across a border),
+        the walk ends on the closest neighbour of b and then steps onto b.
+        """
+        distances, parents = self._local_search(grid, a, goal)
+        if b in distances:
+            path = [b]
+        else:
+            y, x = b
+            last = min((cell for cell in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)) if cell in distances),
+                       key=distances.__getitem__)
+            path = [b, last]
+        while path[-1] != a:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
@@ -11,7 +11,9 @@ class Subject(ABC):
             - observer must be a non-None instance of Observer.
             
         Postconditions:
-            - The observer is registered with the subject, and future notifications will include it.
+            - The observer is registered with the subject (once, however many times it is added), and
+              future notifications of the events it subscribes to (observer.topics; every event if
+              None) will include it.
         """
         pass
 
@@ -31,12 +33,12 @@ class Subject(ABC):
     @abstractmethod
     def notify_observers(self, event: str) -> None:
         """
-        Notify all registered observers of an event.
+        Notify the registered observers subscribed to an event.
 
         Preconditions:
             - event must be a non-empty string representing the notification event.
             
         Postconditions:
-            - Each registered observer's on_notify method is called with the given event.
+            - The on_notify method of each registered observer subscribed to event is called with it.
         """
         pass
\ No newline at end of file
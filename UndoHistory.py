@@ -0,0 +1,89 @@
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+class UndoDelta(NamedTuple):
+    """
+    The inverse of one command: what it changed, so that undoing it can put that back.
+
+    Counters are not stored: each picked item is taken back from the collection by its kind
+    (see GameStateManager.undo_collect_item()). Items are stored by their factory (see
+    LayoutSnapshot.factory_of()) rather than as objects, so the history keeps no game object alive
+    and can be written to a snapshot as is.
+    """
+    player_from: Any = None  # Where the command moved the player from, or None if it did not move them
+    picked: Tuple[Tuple[Any, Callable[[], Any]], ...] = ()  # (coord, factory) of every item it picked up, in pickup order
+
+
+class UndoHistory:
+    """
+    The commands of a session that can still be undone, as a ring buffer of UndoDelta, newest last.
+
+    At most capacity deltas are kept: recording a command past the capacity forgets the oldest
+    one, so the memory a session spends on undo stays fixed however long it runs.
+
+    Invariants:
+        - 0 <= len(self) <= self.capacity.
+    """
+    CAPACITY = 64
+
+    def __init__(self, deltas: Iterable[UndoDelta] = (), capacity: int = CAPACITY) -> None:
+        """
+        Initialize the history.
+
+        Preconditions:
+            - capacity > 0.
+        Postconditions:
+            - The history holds the last capacity deltas of deltas, in order.
+        """
+        assert capacity > 0, "capacity must be positive."
+        self._deltas: deque = deque((UndoDelta(*delta) for delta in deltas), maxlen=capacity)
+        self._depth: int = len(self._deltas)  # Pushes minus pops, not capped by the capacity; see mark()
+
+    @property
+    def capacity(self) -> int:
+        return self._deltas.maxlen
+
+    def push(self, delta: UndoDelta) -> None:
+        """Record a command, forgetting the oldest one if the history is full."""
+        self._deltas.append(delta)
+        self._depth += 1
+
+    def pop(self) -> Optional[UndoDelta]:
+        """Take back the latest command, or None if there is nothing to undo."""
+        if not self._deltas:
+            return None
+        self._depth -= 1
+        return self._deltas.pop()
+
+    def peek(self) -> Optional[UndoDelta]:
+        """Retrieve the latest command without taking it back, or None if there is nothing to undo."""
+        return self._deltas[-1] if self._deltas else None
+
+    def mark(self) -> int:
+        """Retrieve a position to pass to squash() once the command that starts now is done."""
+        return self._depth
+
+    def squash(self, mark: int, player_from: Any = None) -> None:
+        """
+        Fold the deltas recorded since mark into one, so the command they belong to is undone in one step.
+
+        Postconditions:
+            - The deltas pushed since mark() returned mark are replaced by one delta that moves the
+              player back to player_from and holds all their picked items. Nothing is recorded if
+              player_from is None and no item was picked.
+        """
+        picked: Tuple[Tuple[Any, Callable[[], Any]], ...] = ()
+        for _ in range(min(self._depth - mark, len(self._deltas))):
+            picked = self.pop().picked + picked
+        if player_from is not None or picked:
+            self.push(UndoDelta(player_from, picked))
+
+    def clear(self) -> None:
+        self._deltas.clear()
+        self._depth = 0
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def __iter__(self) -> Iterator[UndoDelta]:
+        return iter(self._deltas)
@@ -2,12 +2,18 @@ from abc import ABC, abstractmethod
 from .imports import *
 from .GameStateManager import GameStateManager
 from .utils import StaticSender
-from typing import TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING
 from .GameStateManager import GameState
+from .CollectedItems import ItemKind
+from .EventJournal import PLAYER_MOVE
+from .LayoutSnapshot import build, factory_of
+from .UndoHistory import UndoDelta
+from .MovementStrategy import get_room_size
 
 
 if TYPE_CHECKING:
     from coord import Coord
+    from maps.base import Map
 
 class Command(ABC):
     @abstractmethod
@@ -15,6 +21,41 @@ class Command(ABC):
     def execute(self, player: HumanPlayer) -> list["Message"]:
         pass
 
+class MoveCommand(Command):
+    """A command that moves the player one tile, so that the move can be undone."""
+    def __init__(self, direction: str) -> None:
+        """
+        Initialize the MoveCommand.
+
+        Preconditions:
+            - direction is one of "up", "down", "left", "right".
+        """
+        assert isinstance(direction, str) and direction, "Precondition failed: 'direction' must be a non-empty string."
+        self.direction = direction
+
+    def execute(self, player: HumanPlayer) -> list["Message"]:
+        """
+        Moves the player one tile in self.direction.
+
+        Preconditions:
+            - player must not be None and must support move().
+        Postconditions:
+            - The player's move is executed and its messages are returned.
+            - If the player moved, the move and the items it picked up are recorded in the undo
+              history as one command, and the move is journaled.
+        """
+        assert player is not None, "Precondition failed: 'player' cannot be None."
+        gsm = GameStateManager.for_room(player.get_current_room())
+        position = player.get_current_position()
+        mark = gsm.begin_command()
+        messages = player.move(self.direction)
+        moved = player.get_current_position() != position
+        gsm.end_command(mark, position if moved else None)
+        if moved:
+            gsm.record_move(PLAYER_MOVE, player.get_current_position())
+        return messages
+
+
 class JumpCommand(Command):
     def execute(self, player: HumanPlayer) -> list["Message"]:
         """
@@ -26,11 +67,12 @@ class JumpCommand(Command):
             - player.get_current_position() must return a position object that supports addition with a Coord.
             - player.get_current_room() must return a room object supporting get_map_objects_at, remove_player,
               add_player, etc.
-            - The resulting jump position must be within allowed bounds (1 <= x < 14 and 1 <= y < 14).
+            - The resulting jump position must be inside the room, off its border (see get_room_size()).
         Postconditions:
             - The player's position is updated to the new jump position if all conditions are met.
             - The room grid is updated (old position removed and new position added).
             - PressurePlate objects at the target tile are triggered, and their messages are collected.
+            - The jump and the items it picked up are recorded in the undo history as one command.
             - A GridMessage is appended as an update.
         
         :param player: The HumanPlayer executing the jump.
@@ -60,20 +102,29 @@ class JumpCommand(Command):
         jumped_pose = current_pos + Coord(2 * dx, 2 * dy)
 
         # Check bounds
-        if not (1 <= jumped_pose.x < 14 and 1 <= jumped_pose.y < 14):
+        height, width = get_room_size(room)
+        if not (1 <= jumped_pose.x < width - 1 and 1 <= jumped_pose.y < height - 1):
             return []
 
-        # Check passability
+        # Check passability, using the room's index when it keeps one
+        if hasattr(room, "get_passability_grid"):
+            if not room.get_passability_grid().is_free(jumped_pose.y, jumped_pose.x):
+                return []
+        # The index only holds obstacles, so characters (e.g. the hunter) are checked on the tile itself
         target_objs = room.get_map_objects_at(jumped_pose)
         for obj in target_objs:
             # If any object is not passable, don't jump.
             if not obj.is_passable():
                 return []
     
+        gsm = GameStateManager.for_room(room)
+        mark = gsm.begin_command()
+
         # Set the postions of the player
         room.remove_player(player)
         player.set_position(jumped_pose)  
         room.add_player(player, jumped_pose)
+        gsm.record_move(PLAYER_MOVE, jumped_pose)
 
         messages: list["Message"] = []
 
@@ -82,6 +133,7 @@ class JumpCommand(Command):
         for obj in room.get_map_objects_at(jumped_pose):
             if isinstance(obj, PressurePlate):
                 messages.extend(obj.player_entered(player))
+        gsm.end_command(mark, current_pos)
         
         # update the grid after the move.
         messages.append(GridMessage(player))
@@ -91,19 +143,24 @@ class JumpCommand(Command):
 class UndoCommand(Command):
     def execute(self, player: HumanPlayer) -> list["Message"]:
         """
-        Undos the last commands for the player.
+        Undos the last command of the player (a move, a jump or a pickup).
         
         Preconditions:
             - player must not be None.
-            - A GameStateManager instance must have a non-empty tracked_picked_items stack if an undo is possible.
             - player must have an 'inventory' attribute if applicable.
             - player.get_current_position() and player.get_current_room() must work as expected.
         Postconditions:
-            - If an item is undone:
-                - It is removed from the player's inventory.
-                - It is re-added to the room grid.
-                - GameStateManager's item collection is updated.
+            - If the undo history is not empty, its latest delta is taken back:
+                - Every item the command picked up is removed from the player's inventory (or rebuilt
+                  by its factory if the player no longer carries it), put back on the grid where it
+                  was picked up, and taken back from the GameStateManager's collection in one step.
+                - If the command moved the player, the player is moved back to where it started.
+                - The delta is checked and taken off the history atomically (see
+                  GameStateManager.pop_undo_if()), so the delta undone is the one that was checked.
                 - A ChatMessage and GridMessage are returned.
+            - If the command moved the player and something that cannot be walked through (e.g. the
+              hunter) now stands where the player started, nothing is undone, the delta stays on
+              the history and a ChatMessage says so.
             - Otherwise, a ChatMessage indicates that there is nothing to undo.
         
         :param player: The HumanPlayer executing the undo.
@@ -113,31 +170,62 @@ class UndoCommand(Command):
         assert hasattr(player, "get_current_position"), "Precondition failed: 'player' must have 'get_current_position()' method."
         assert hasattr(player, "inventory"), "Precondition failed: 'player' must have 'inventory' attribute."
 
-        gsm = GameStateManager()
+        room = player.get_current_room()
+        gsm = GameStateManager.for_room(room)
 
-        if gsm.tracked_picked_items:
-            _, item = gsm.tracked_picked_items.pop()
+        blocked: list[UndoDelta] = []
 
-            if hasattr(player, "inventory") and item in player.inventory:
-                player.inventory.remove(item)
+        def can_undo(delta: UndoDelta) -> bool:
+            if delta.player_from is not None and self._is_blocked(room, delta.player_from, player):
+                blocked.append(delta)
+                return False
+            return True
 
-            drop_coord = player.get_current_position()
-            room = player.get_current_room()
-            room.add_to_grid(item, drop_coord)
+        delta = gsm.pop_undo_if(can_undo)  # The delta that was checked is the one that is undone
+        if delta is None:
+            if blocked:
+                return [ChatMessage(StaticSender("UPDATE"), room, "Cannot undo: something is standing where you came from.")]
+            return [ChatMessage(StaticSender("UPDATE"), room, "Nothing to undo.")]
 
-            gsm.undo_collect_item(item)
+        items = []
+        for coord, factory in reversed(delta.picked):  # Latest pickup first, as it is last in the inventory
+            item = self._take_from_inventory(player.inventory, factory)
+            room.add_to_grid(item, coord)
+            items.append(item)
+        gsm.undo_collect_items(items)
 
-            if "animal" in str(type(item)).lower():
-                msg = f"Dropped {type(item).__name__} at your current location. ({gsm.collected_animals}/{gsm.total_animals} animals rescued)"
+        messages: list["Message"] = []
+        rescued = gsm.collected_animals + sum(ItemKind.of(item) is ItemKind.ANIMAL for item in items)  # Before the undo
+        for item in items:
+            if ItemKind.of(item) is ItemKind.ANIMAL:
+                rescued -= 1
+                msg = f"Put {type(item).__name__} back. ({rescued}/{gsm.total_animals} animals rescued)"
             else:
-                msg = f"Dropped {type(item).__name__} at your current location."
+                msg = f"Put {type(item).__name__} back."
+            messages.append(ChatMessage(StaticSender("UPDATE"), room, msg))
 
-            return [
-                ChatMessage(StaticSender("UPDATE"), room, msg),
-                GridMessage(player, send_desc=False)
-            ]
+        if delta.player_from is not None:
+            room.remove_player(player)
+            player.set_position(delta.player_from)
+            room.add_player(player, delta.player_from)
+            gsm.record_move(PLAYER_MOVE, delta.player_from)
+            messages.append(ChatMessage(StaticSender("UPDATE"), room, "Moved back."))
+
+        messages.append(GridMessage(player, send_desc=False))
+        return messages
 
-        return [ChatMessage(StaticSender("UPDATE"), player.get_current_room(), "Nothing to undo.")]
+    @staticmethod
+    def _is_blocked(room: "Map", coord: "Coord", player: HumanPlayer) -> bool:
+        """Tell whether an object other than player that cannot be walked through is at coord."""
+        return any(obj is not player and not obj.is_passable() for obj in room.get_map_objects_at(coord))
+
+    @staticmethod
+    def _take_from_inventory(inventory: list, factory: Callable[[], Any]) -> Any:
+        """Remove and return the latest item of inventory built by factory, or build a new one if there is none."""
+        for index in range(len(inventory) - 1, -1, -1):
+            if factory_of(inventory[index]) == factory:
+                return inventory.pop(index)
+        return build(factory)
     
     
 class ShowIntroCommand(Command):
@@ -215,7 +303,6 @@ class ShowIntroCommand(Command):
     
 class ResetCommand(Command):
     """A command that resets the game"""
-    from .Hunter import Hunter
     
     def execute(self, player: HumanPlayer) -> list["Message"]:
         """
@@ -225,36 +312,40 @@ class ResetCommand(Command):
             - GameStateManager must have a valid state.
             - The current map must support reset_objects and player management.
         Postconditions:
-            - The game state is reset.
-            - The map objects are reset.
-            - The player is re-added to the map.
+            - If the map has a start snapshot, the game state, hunters, doors and player are restored to it
+              in one step, and the map objects are laid out afresh around where the characters stand.
+            - Otherwise, the game state is reset, the map objects are regenerated and the player is re-added to the map.
             - A GridMessage and ChatMessage are returned indicating the reset status.
         :param player: The HumanPlayer executing the reset.
         :return: A list of Message objects indicating the outcome.
         """
         assert player is not None, "Precondition failed: 'player' cannot be None."
 
-        gsm = GameStateManager()
+        gsm = GameStateManager.for_room(player.get_current_room())
         assert gsm is not None, "Precondition failed: 'GameStateManager' cannot be None."
         if gsm.get_state() not in [GameState.WIN, GameState.LOSE]:
             return [
                 ChatMessage(StaticSender("SYSTEM"), player.get_current_room(), "You can only reset after winning or losing the game."),
             ]
+        current_map = gsm.current_map
+        snapshot = current_map.get_start_snapshot() if hasattr(current_map, "get_start_snapshot") else None
+        if snapshot is not None:
+            characters = [snapshot.player_position] + [hunter.coord for hunter in snapshot.hunters]
+            current_map.restore_snapshot(snapshot, player, layout=current_map.generate_layout(keep_free=characters))
+            return [
+                GridMessage(player),
+                ChatMessage(StaticSender("SYSTEM"), current_map, "Game has been reset with fresh map state!")
+            ]
+
         assert gsm.reset_game_state is not None, "Precondition failed: 'GameStateManager' must have a valid reset_game_state method."
         # Reset game variables
         gsm.reset_game_state()
 
-        current_map = gsm.current_map
         if current_map and hasattr(current_map, "reset_objects"):
             current_map.reset_objects()
             current_map.remove_player(player)
             current_map.add_player(player)
-            print("Map objects and player have been reset.")
-
-            for obj, _ in current_map._active_objects:
-                if isinstance(obj, self.Hunter):
-                    print("Hunter strategy after reset is:", type(obj.movement_strategy).__name__)
-
+            gsm.record_move(PLAYER_MOVE, player.get_current_position())
             return [
                 GridMessage(player),
                 ChatMessage(StaticSender("SYSTEM"), current_map, "Game has been reset with fresh map state!")
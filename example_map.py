@@ -7,10 +7,18 @@ from collections.abc import Callable
 from .commands import *
 from .Hunter import Hunter
 from .utils import StaticSender
-import copy
-from .Observer import Observer
-
-from typing import TYPE_CHECKING
+from .Observer import GameEvent, Observer
+from .GameClock import GameClock
+from .PassabilityGrid import PassabilityGrid
+from .CollectedItems import ItemKind
+from .LayoutSnapshot import LayoutRecord, LayoutSnapshot, build, factory_of
+from .GameSnapshot import GameSnapshot, HunterRecord
+from .EventJournal import EventJournal, HUNTER_MOVE, PLAYER_MOVE
+from .MovementStrategy import HunterMovementState, MovementStrategy
+from functools import partial
+from .Pathfinding import FlowField, NextHopTable
+
+from typing import BinaryIO, Iterable, TYPE_CHECKING
 if TYPE_CHECKING:
     from coord import Coord
     from maps.base import Map
@@ -19,6 +27,8 @@ if TYPE_CHECKING:
     
 # -------------------------------------- DOOR -----------------------------------------------------------------
 class LockableDoor(Door, Observer):
+    topics = frozenset({GameEvent.WIN, GameEvent.LOSE})  # Pickups are of no interest to a door
+
     def __init__(self, image_name: str, linked_room: str = "", is_main_entrance: bool = True) -> None:
         """
         Initialize the LockableDoor.
@@ -36,6 +46,10 @@ class LockableDoor(Door, Observer):
         self._locked: bool = False  
         self.set_passability: bool = True  
 
+    def is_locked(self) -> bool:
+        """Returns True if the door is locked."""
+        return self._locked
+
     def lock(self) -> None:
         """Lock the door."""
         self._locked = True
@@ -56,7 +70,7 @@ class LockableDoor(Door, Observer):
           - If event is "WIN" or "LOSE", the door is unlocked.
         """
         assert isinstance(event, str) and event, "event must be a non-empty string."
-        if event in ["WIN", "LOSE"]:
+        if event in (GameEvent.WIN, GameEvent.LOSE):
             self.unlock()
 
     def player_entered(self, player: Player) -> List["Message"]:
@@ -94,6 +108,7 @@ class Tree(MapObject):
 # -------------------------------------- ROCKS -----------------------------------------------------------------
 class Rock(PressurePlate):
     """A rock that the player can step on, triggering state changes."""
+    item_kind = ItemKind.ROCK
    
     def __init__(self, image_name: str = 'rock') -> None:
         """
@@ -120,8 +135,8 @@ class Rock(PressurePlate):
         """
         if hasattr(player, "is_hunter"):
             return []
-        game_state_manager = GameStateManager()  # Singleton instance
-        game_state_manager.collect_item("rock")  # Notify game state
+        game_state_manager = GameStateManager.for_room(player.get_current_room())
+        game_state_manager.collect_item(ItemKind.ROCK)  # Notify game state
         
         coord = self.get_position()
         game_state_manager.track_picked_item(self, coord)
@@ -165,46 +180,91 @@ class EntranceMenuPressurePlate(PressurePlate):
 # -------------------------------------- OUR HOUSE -----------------------------------------------------------------
 class ExampleHouse(Map):
     """
-    A 15x15 grid-based map featuring a main entrance, dynamic object generation, and player interactions. 
+    A grid-based map of SIZE (15x15 by default) featuring a main entrance, dynamic object generation, and player interactions. 
     Includes trees, rocks, flowers, animals, and an NPC hunter, with mechanics for movement, item collection, 
     and game state updates.
 
     Key Features:
-      - Main entrance at Coord(14, 7) with a lockable door.
+      - Main entrance in the middle of the bottom wall (see entrance_position()) with a lockable door.
       - Dynamic item generation and reset functionality.
       - Player movement and interaction with map objects.
     """
     MAIN_ENTRANCE: bool = True
+    SIZE: Tuple[int, int] = (15, 15)  # (height, width) of the house
+    TICKS_PER_SECOND: int = GameClock.TICKS_PER_SECOND  # How many times per second the server calls update()
 
-    def __init__(self) -> None:
+    def __init__(self, use_flow_field: bool = False, chase_strategy: Optional[MovementStrategy] = None,
+                 defer_events: bool = False) -> None:
         """
         Initialize the ExampleHouse.
 
+        Preconditions:
+          - use_flow_field is a boolean.
+          - chase_strategy, if given, is a MovementStrategy that follows the player.
+          - defer_events is a boolean.
         Postconditions:
           - The house is initialized with a name, description, size, entry point, background tile, and background music.
+          - The passability index is empty until objects are added to the grid.
+          - If use_flow_field is True, hunters following the player share one flow field per player position.
+          - Hunters chase the player with chase_strategy (see Hunter), ShortestPathMovement by default.
+          - The game clock starts at tick 0 and runs at TICKS_PER_SECOND.
+          - The game is snapshotted when the first player enters (see get_start_snapshot()).
+          - The house hosts its own game session, independent from every other house.
+          - If defer_events is True, the session's events are queued and delivered in batches by
+            update(); otherwise they are delivered as they are raised.
         """
+        assert isinstance(use_flow_field, bool), "use_flow_field must be a boolean."
+        assert isinstance(defer_events, bool), "defer_events must be a boolean."
+        self._clock: GameClock = GameClock(ticks_per_second=self.TICKS_PER_SECOND)
+        # Needed by get_objects() during the base init; thread-safe so hunters may be updated off the input thread
+        self._game_state: GameStateManager = GameStateManager.create_session(thread_safe=True)
+        self._game_state.defer_events(defer_events)  # If deferred, delivered by update()
+        # Created before the base map so that every object it places on the grid gets indexed.
+        self._passability: PassabilityGrid = PassabilityGrid(*self.SIZE)
+        self.use_flow_field: bool = use_flow_field
+        self.chase_strategy: Optional[MovementStrategy] = chase_strategy  # Needed by get_objects() too
+        self._flow_field: Optional[FlowField] = None
+        self._next_hop_table: Optional[NextHopTable] = None
+        self._next_hop_table_pending: bool = False  # Set when a new layout is generated
+        self._start_snapshot: Optional[GameSnapshot] = None
+        self._hunters: List[Hunter] = []  # In the order the layout created them, which is how snapshots refer to them
+        self._doors: List[LockableDoor] = []  # Likewise
         super().__init__(
             name="Test House",
             description="Welcome to Paws Peril House! Please help us save the animals",
-            size=(15, 15), #size of the area in the example house  
-            entry_point=Coord(14, 7),
+            size=self.SIZE, #size of the area in the example house  
+            entry_point=self.entrance_position(),
             background_tile_image='grass',
             background_music='funsong',
         )
 
+    @classmethod
+    def entrance_position(cls) -> "Coord":
+        """Retrieve where the main entrance is: the middle of the bottom wall of a house of SIZE."""
+        height, width = cls.SIZE
+        return Coord(height - 1, width // 2)
+
     def _get_keybinds(self) -> dict[str, Callable[["HumanPlayer"], List["Message"]]]:
         """
         Retrieve the key bindings for player actions within the house.
 
         Postconditions:
           - Returns a dictionary mapping keys to functions that take a HumanPlayer and return a list of Message.
+          - The commands bound here run while holding the lock of the house's game session, so a
+            hunter updated on another thread never sees them half done.
         """
         keybinds = super()._get_keybinds()  # keep built-in ones if needed
 
         def move_with_direction(direction: str) -> Callable[["HumanPlayer"], List["Message"]]:
             return lambda player: self._remember_and_move(player, direction)
 
-        keybinds.update({
+        def locked(action: Callable[["HumanPlayer"], List["Message"]]) -> Callable[["HumanPlayer"], List["Message"]]:
+            def run(player: "HumanPlayer") -> List["Message"]:
+                with self._game_state.locked():
+                    return action(player)
+            return run
+
+        keybinds.update({key: locked(action) for key, action in {
             "up": move_with_direction("up"),
             "down": move_with_direction("down"),
             "left": move_with_direction("left"),
@@ -213,7 +273,7 @@ class ExampleHouse(Map):
             "z": lambda player: UndoCommand().execute(player),
             "r": lambda player: ResetCommand().execute(player),  # to reset 
             "p": lambda player: ResetCommand().execute(player),  # to play 
-        })
+        }.items()})
 
         return keybinds
 
@@ -226,11 +286,11 @@ class ExampleHouse(Map):
           - player supports set_state and move methods.
         Postconditions:
           - The player's last direction is recorded.
-          - The player's move command is executed and returns a list of Messages.
+          - A MoveCommand is executed, so the move can be undone, and returns a list of Messages.
         """
         assert isinstance(direction, str) and direction, "direction must be a non-empty string."
         player.set_state("last_direction", direction)
-        return player.move(direction)
+        return MoveCommand(direction).execute(player)
   
     def add_player(self, player: "Player", entry_point: Optional["Coord"] = None) -> None:
         """
@@ -242,150 +302,328 @@ class ExampleHouse(Map):
         Postconditions:
           - The player is added to the map.
           - The map’s player_instance is set.
-          - The GameStateManager's current_map is updated.
+          - The current_map of the house's game state is updated.
+          - If this is the first player to enter, the starting point of the game is snapshotted.
         """
         super().add_player(player, entry_point)
         self.player_instance = player
-        print(f"Player {player.get_name()} has entered the map.")
-        GameStateManager().current_map = self
+        self._game_state.current_map = self
+        if self._start_snapshot is None:
+            self._start_snapshot = self.save_snapshot(player)
+
+    def get_start_snapshot(self) -> Optional[GameSnapshot]:
+        """Retrieve the snapshot of the game as it was when the first player entered, if any."""
+        return self._start_snapshot
+
+    def save_snapshot(self, player: "Player") -> GameSnapshot:
+        """
+        Capture the game played by player in the house.
+
+        Preconditions:
+          - player is in the house.
+        Postconditions:
+          - Returns a GameSnapshot of the game state, the objects on the grid, the hunters, the
+            doors, and the player's position, inventory and undo history. It shares no object with
+            the house but the hunters' movement strategies, which keep no per-hunter state.
+        """
+        state, collected_items, collected_animals, history = self._game_state.save_progress()
+        layout = [(obj, obj.get_position()) for obj in getattr(self, '_Map__objects', set())
+                  if not isinstance(obj, (Player, Hunter, LockableDoor))]
+        hunters = tuple(HunterRecord(hunter.get_current_position(), hunter.movement_strategy, hunter.speed)
+                        for hunter in self._hunters)
+
+        return GameSnapshot(
+            state=state,
+            collected_items=collected_items,
+            collected_animals=collected_animals,
+            layout=LayoutSnapshot.capture(layout),
+            hunters=hunters,
+            doors_locked=tuple(door.is_locked() for door in self._doors),
+            player_position=player.get_current_position(),
+            inventory=tuple(factory_of(item) for item in getattr(player, "inventory", [])),
+            undo_history=history,
+        )
+
+    def restore_snapshot(self, snapshot: GameSnapshot, player: "Player", layout: Optional[LayoutSnapshot] = None) -> None:
+        """
+        Put the game back to a snapshot taken by save_snapshot(), in one pass over the grid.
+
+        Preconditions:
+          - player is in the house, and the snapshot was taken in this house or in one with as many
+            hunters and doors.
+          - layout, if given, is a LayoutSnapshot of objects other than players, hunters and doors.
+        Postconditions:
+          - The game state, the objects on the grid and the player's inventory and undo history are
+            rebuilt from the snapshot; hunters and doors are kept but moved and set as recorded,
+            each from the record at its own index in creation order.
+          - If layout is given, the objects on the grid are built from it instead of from the snapshot.
+          - The player stands at the recorded position.
+          - If the game is journaled, the restore is followed by the positions of the hunters and the
+            player, so a replay ends up where the game is.
+          - The next-hop table is rebuilt for the restored layout on its next request.
+        """
+        assert len(snapshot.hunters) == len(self._hunters), "the snapshot has a record for every hunter of the house."
+        assert len(snapshot.doors_locked) == len(self._doors), "the snapshot has a record for every door of the house."
+        inventory = [build(factory) for factory in snapshot.inventory]
+        self._game_state.restore_progress(snapshot.state, snapshot.collected_items, snapshot.collected_animals,
+                                          snapshot.undo_history)
+
+        for obj in list(getattr(self, '_Map__objects', set())):
+            if not isinstance(obj, (Player, Hunter, LockableDoor)):
+                self.remove_from_grid(obj, obj.get_position())
+        self._place_objects((layout if layout is not None else snapshot.layout).instantiate())
+
+        for hunter, record in zip(self._hunters, snapshot.hunters):
+            self.remove_from_grid(hunter, hunter.get_current_position())
+            self.add_to_grid(hunter, record.coord)
+            hunter.update_position(record.coord, self)
+            hunter.movement_strategy = record.strategy
+            hunter.movement_state = HunterMovementState()  # Caches and cooldowns belong to the abandoned game
+            hunter.set_speed(record.speed)
+            self._game_state.record_move(HUNTER_MOVE, record.coord)
+        for door, locked in zip(self._doors, snapshot.doors_locked):
+            if locked:
+                door.lock()
+            else:
+                door.unlock()
+
+        player.inventory = inventory
+        self.remove_player(player)
+        player.set_position(snapshot.player_position)
+        self.add_player(player, snapshot.player_position)
+        self._game_state.record_move(PLAYER_MOVE, snapshot.player_position)
+        self._next_hop_table_pending = True
         
+    def add_to_grid(self, obj: "MapObject", coord: "Coord") -> None:
+        """
+        Place an object on the grid and index it if it blocks movement.
+
+        Postconditions:
+          - obj is on the grid at coord.
+          - If obj is a static obstacle, coord is marked as blocked in the passability index.
+          - Both are changed while holding the lock of the house's game session.
+        """
+        with self._game_state.locked():
+            super().add_to_grid(obj, coord)
+            self._passability.add_object(obj, coord)
+
+    def remove_from_grid(self, obj: "MapObject", coord: "Coord") -> Tuple[bool, Optional[str]]:
+        """
+        Remove an object from the grid and from the passability index.
+
+        Postconditions:
+          - Returns the (status, error) pair of the base map.
+          - If the removal succeeded and obj is a static obstacle, one obstacle is unmarked at coord.
+        """
+        with self._game_state.locked():
+            status, err = super().remove_from_grid(obj, coord)
+            if status:
+                self._passability.remove_object(obj, coord)
+        return status, err
+
+    def get_passability_grid(self) -> PassabilityGrid:
+        """Retrieve the passability index of the house (O(1) blocked/free lookups per cell)."""
+        return self._passability
+
+    def get_game_state(self) -> GameStateManager:
+        """Retrieve the state of the game played in this house."""
+        return self._game_state
+
+    def enable_journal(self, stream: Optional[BinaryIO] = None) -> EventJournal:
+        """
+        Record the game played in the house into a journal stamped with the house's game clock.
+
+        Preconditions:
+          - stream, if given, is a binary stream open for writing; without one, the journal is kept in memory.
+        Postconditions:
+          - Returns the journal, which is also the journal of the house's game state.
+        """
+        journal = EventJournal(stream, clock=self._clock)
+        self._game_state.set_journal(journal)
+        return journal
+
+    def get_game_clock(self) -> GameClock:
+        """Retrieve the game clock of the house, advanced once per update()."""
+        return self._clock
+
+    def get_flow_field(self, goal: Tuple[int, int]) -> FlowField:
+        """
+        Retrieve the flow field toward goal, recomputing it only if the goal moved or an obstacle changed.
+
+        Preconditions:
+          - goal is a (y, x) cell inside the house.
+        Postconditions:
+          - Returns a FlowField that is current for goal and the passability index.
+        """
+        with self._game_state.locked():
+            field = self._flow_field
+            if field is None or not field.is_current(self._passability, goal):
+                field = self._flow_field = FlowField(self._passability, goal)
+        return field
+
+    def get_next_hop_table(self) -> Optional[NextHopTable]:
+        """
+        Retrieve the all-pairs next-hop table of the current layout.
+
+        The table is built once per generated layout, on the first request after get_objects()
+        or reset_objects() (once the objects are on the grid).
+
+        Postconditions:
+          - Returns a table that is current for the passability index, or None if obstacles changed
+            since the layout was generated or the house is too large for a table.
+        """
+        with self._game_state.locked():
+            if self._next_hop_table_pending:
+                self._next_hop_table_pending = False
+                grid = self._passability
+                if grid.width * grid.height <= NextHopTable.MAX_CELLS:
+                    self._next_hop_table = NextHopTable(grid)
+            table = self._next_hop_table
+        if table is None or not table.is_current(self._passability):
+            return None
+        return table
+
     def update(self) -> List["Message"]:
         """
         Update all objects on the map.
 
         Postconditions:
+          - The game clock is one tick later, so objects updated in this call see the new tick.
           - Returns a list of Messages produced by updating each map object.
+          - With deferred events, the events raised since the previous update are delivered before
+            the objects are updated, so hunters react to them within this tick, and the events raised
+            by the objects are delivered after; each distinct event is delivered once per batch.
+          - Each object is updated while holding the lock of the house's game session, so a hunter
+            moves against a consistent grid even if input is handled on another thread.
         """
+        self._game_state.flush_events()
+        lock = self._game_state.locked()
+        with lock:
+            self._clock.advance()
+            objects = list(getattr(self, '_Map__objects', []))  # a copy, to avoid modification during iteration
         messages: List["Message"] = []
-        objects = getattr(self, '_Map__objects', [])
-        for obj in list(objects):  # iterate over a copy to avoid modification during iteration
-            messages.extend(obj.update())
+        for obj in objects:
+            with lock:
+                messages.extend(obj.update())
+        self._game_state.flush_events()
         return messages
     
-    def generate_items(self) -> List[Tuple["MapObject", "Coord"]]:
+    def generate_layout(self, keep_free: Iterable["Coord"] = ()) -> LayoutSnapshot:
         """
-        Generates trees, rocks, flowers, and animals (including the NPC hunter)
-        and returns them as a list of (MapObject, Coord) tuples.
+        Lays out trees, rocks, flowers, and animals as (factory, Coord) records.
 
+        Preconditions:
+          - keep_free holds positions inside the house (e.g. where characters stand).
         Postconditions:
-          - Returns a list of generated items without overlapping positions.
+          - Returns a LayoutSnapshot without overlapping positions; no object is created.
+          - No object is placed at a position of keep_free, apart from the trees along the edges.
         """
-        objects: List[Tuple["MapObject", "Coord"]] = []
+        records: List[LayoutRecord] = []
 
         # Create a set to reserve positions and avoid overlaps
-        reserved_positions = set()
+        reserved_positions = {coord.to_tuple() for coord in keep_free}
+
+        height, width = self.SIZE
+        door = self.entrance_position()
 
         # --- Add Trees along the edges ---
-        tree = Tree() 
-        for i in range(14):
-            for pos in [Coord(0, i), Coord(14, i), Coord(i, 0), Coord(i, 14)]:
-                objects.append((tree, pos))
-                reserved_positions.add(pos.to_tuple())
-        objects.append((tree, Coord(14, 14)))
-        reserved_positions.add(Coord(14, 14).to_tuple())
-
-        # Reserve a 3x3 area around the door (door is at (14,7))
-        door_zone = [(x, y) for y in range(12, 15) for x in range(6, 9)]
+        for y in range(height):
+            for x in range(width):
+                if y in (0, height - 1) or x in (0, width - 1):
+                    records.append(LayoutRecord(Tree, Coord(y, x)))
+                    reserved_positions.add((y, x))
+
+        # Reserve a 3x3 area around the door
+        door_zone = [(y, x) for y in range(door.y - 2, door.y + 1) for x in range(door.x - 1, door.x + 2)]
         for pos in door_zone:
             reserved_positions.add(pos)
 
         # Remove trees that conflict with the future entrance door.
-        objects.remove((tree, Coord(14, 7)))
-        objects.remove((tree, Coord(14, 8)))
+        records.remove(LayoutRecord(Tree, door))
+        records.remove(LayoutRecord(Tree, door + Coord(0, 1)))
 
-        # Determine all possible positions on the map (15x15 grid) and then calculate free positions.
-        all_positions = [Coord(x, y).to_tuple() for x in range(15) for y in range(15)]
+        # Determine all possible positions on the map and then calculate free positions.
+        all_positions = [(y, x) for y in range(height) for x in range(width)]
         free_positions = set(all_positions) - reserved_positions
 
-        # --- Add additional trees randomly ---
-        for _ in range(50):
-            new_tree = Tree()
+        def place(kind: Callable[[], "MapObject"]) -> None:
             pos = random.choice(list(free_positions))
-            objects.append((new_tree, Coord(pos[1], pos[0])))
+            records.append(LayoutRecord(kind, Coord(pos[0], pos[1])))
             free_positions.remove(pos)
 
+        # --- Add additional trees randomly ---
+        for _ in range(50):
+            place(Tree)
+
         # --- Add Rocks ---
         for _ in range(5):
-            rock = Rock()
-            pos = random.choice(list(free_positions))
-            objects.append((rock, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
+            place(Rock)
         
         # --- Add Flowers ---
         for _ in range(5):
-            flower = random.choice([Daisy(), Orchid(), Daffodil(), Tulip()])
-            pos = random.choice(list(free_positions))
-            objects.append((flower, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
+            place(random.choice([Daisy, Orchid, Daffodil, Tulip]))
 
-        # --- Add Animals ---
-        # Add cows
-        for _ in range(3):
-            cow = Cow()
-            pos = random.choice(list(free_positions))
-            objects.append((cow, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
-        # Add monkeys
-        for _ in range(3):
-            monkey = Monkey()
-            pos = random.choice(list(free_positions))
-            objects.append((monkey, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
-        # Add owls
-        for _ in range(3):
-            owl = Owl()
-            pos = random.choice(list(free_positions))
-            objects.append((owl, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
-        # Add rabbits
-        for _ in range(3):
-            rabbit = Rabbit()
-            pos = random.choice(list(free_positions))
-            objects.append((rabbit, Coord(pos[1], pos[0])))
-            free_positions.remove(pos)
+        # --- Add Animals (cows, monkeys, owls and rabbits) ---
+        for animal in (Cow, Monkey, Owl, Rabbit):
+            for _ in range(3):
+                place(animal)
 
         # --- Add the Welcome Pressure Plate ---
-        entrance_plate = EntranceMenuPressurePlate('grass')
-        objects.append((entrance_plate, Coord(13, 7)))
+        records.append(LayoutRecord(partial(EntranceMenuPressurePlate, 'grass'), door + Coord(-1, 0)))
 
-        return objects
+        return LayoutSnapshot(records)
 
-    def get_objects(self) -> List[Tuple["MapObject", "Coord"]]:
+    def generate_items(self) -> List[Tuple["MapObject", "Coord"]]:
         """
-        Retrieves all map objects by generating common items and then adding special objects like the hunter and door.
+        Generates trees, rocks, flowers, and animals
+        and returns them as a list of (MapObject, Coord) tuples.
 
         Postconditions:
-          - Returns a list of (MapObject, Coord) tuples.
-          - Registers observers for objects that implement Observer.
+          - Returns a list of newly created items without overlapping positions.
         """
-        objects = self.generate_items()
-
-        # --- Add the NPC Hunter ---
-        hunter = Hunter( 
-            encounter_text="I caught you!",
-            staring_distance=1,
-        )
-        objects.append((hunter, Coord(3, 8)))
+        return self.generate_layout().instantiate()
 
-        # --- Add the Entrance Door ---
+    @staticmethod
+    def _make_entrance_door() -> "LockableDoor":
+        """Create the main entrance door, unlocked."""
         door = LockableDoor(
             'int_entrance',
             linked_room="Trottier Town",
             is_main_entrance=True
         )
         door.unlock()  # Ensure the door starts unlocked.
-        self.entrance_door = door  # Store reference for later locking/unlocking.
-        objects.append((door, Coord(14, 7)))
-
-        GameStateManager().store_original_objects(objects)
-        if not hasattr(self, "_original_objects"):
-            self._original_objects = copy.deepcopy(objects)
-            
-        gsm = GameStateManager()
+        return door
+
+    def get_objects(self) -> List[Tuple["MapObject", "Coord"]]:
+        """
+        Retrieves all map objects by generating common items and then adding special objects like the hunter and door.
+
+        Postconditions:
+          - Returns a list of (MapObject, Coord) tuples.
+          - The layout is stored in the game state as a LayoutSnapshot.
+          - Registers observers for objects that implement Observer.
+          - Remembers the hunters and doors in creation order (see save_snapshot()).
+          - The next-hop table is rebuilt for the new layout on its next request.
+        """
+        layout = self.generate_layout() + LayoutSnapshot([
+            # --- Add the NPC Hunter ---
+            LayoutRecord(partial(Hunter, encounter_text="I caught you!", staring_distance=1, chase_strategy=self.chase_strategy), Coord(3, 8)),
+            # --- Add the Entrance Door ---
+            LayoutRecord(self._make_entrance_door, self.entrance_position()),
+        ])
+        objects = layout.instantiate()
+        self.entrance_door = objects[-1][0]  # Store reference for later locking/unlocking.
+        self._hunters = [obj for obj, _ in objects if isinstance(obj, Hunter)]
+        self._doors = [obj for obj, _ in objects if isinstance(obj, LockableDoor)]
+
+        gsm = self._game_state
+        gsm.store_original_objects(layout)
+
         for obj, _ in objects:
             if isinstance(obj, Observer):
                 gsm.add_observer(obj)
 
+        self._next_hop_table_pending = True
         return objects
 
     def reset_objects(self) -> None:
@@ -394,21 +632,25 @@ class ExampleHouse(Map):
 
         Postconditions:
           - New objects are generated, added to the grid, and stored.
+          - The next-hop table is rebuilt for the new layout on its next request.
         """
-        gsm = GameStateManager()
+        gsm = self._game_state
 
         # Step 1: Remove objects that aren't Player, Hunter, or LockableDoor
         for obj in list(getattr(self, '_Map__objects', set())):
             if not isinstance(obj, (Player, Hunter, LockableDoor)):
                 self.remove_from_grid(obj, obj.get_position())
 
-        # Step 2: Generate new items using generate_items()
-        new_items = self.generate_items()
+        # Step 2: Generate new items using generate_items() (they are fresh objects, so they are placed as they are)
+        self._place_objects(self.generate_items())
+
+        self._next_hop_table_pending = True
+
+    def _place_objects(self, objects: List[Tuple["MapObject", "Coord"]]) -> None:
+        """Put freshly created objects on the grid and remember them as the active objects."""
         self._active_objects = []
-        for obj, coord in new_items:
-            # Create a fresh copy of the object.
-            new_obj = copy.deepcopy(obj)
+        for new_obj, coord in objects:
             new_obj.set_position(coord)
             new_obj._current_room = self
             self.add_to_grid(new_obj, coord)
-            self._active_objects.append((new_obj, coord))
\ No newline at end of file
+            self._active_objects.append((new_obj, coord))
@@ -0,0 +1,254 @@
+# TO RUN THE BENCHMARK (from the directory that contains project/):
+# python -m project.test.benchmark_MovementStrategy [--iterations N] [--strategies random shortest_path ...] [--update-baseline]
+"""
+Latency benchmark for the hunter movement strategies.
+
+Every scenario is a synthetic room of a given size and tree density, with hunter/player pairs
+that are either close to each other or far apart. Each call to move() places the hunter and
+the player on a fresh pair of cells, so the numbers measure the cost of one decision rather
+than the cost of walking a cached path. In chase scenarios the hunter instead walks where the
+strategy sends it and the player steps to a random neighbouring cell before every call, which
+is what incremental engines are built for; a caught player starts again far away.
+
+For every (strategy, scenario) the benchmark reports per-call latency percentiles and the
+mean number of nodes expanded by the search engine (strategies without one report none).
+Results are compared with a stored baseline (benchmark_baseline.json next to this file);
+the baseline is written on the first run or with --update-baseline.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from project.imports import Coord
+from project.MovementStrategy import (RandomMovement, ShortestPathMovement, TeleportMovement, IncrementalPathMovement,
+                                      DistanceFieldMovement, JumpPointMovement, HierarchicalMovement, get_movement_state)
+from project.PassabilityGrid import PassabilityGrid
+from project.Pathfinding import DIRECTION_DELTAS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+SIZES = (15, 50, 100)
+DENSITIES = (0.0, 0.1, 0.3)
+# near: at most NEAR_DISTANCE steps apart (Manhattan); far: at least half the room apart; chase: starts far, both move
+DISTANCES = ("near", "far", "chase")
+NEAR_DISTANCE = 5
+
+STRATEGIES = {
+    "random": RandomMovement,
+    "shortest_path": ShortestPathMovement,
+    "teleport": TeleportMovement,
+    "incremental": IncrementalPathMovement,
+    "distance_field": DistanceFieldMovement,
+    "jump_point": JumpPointMovement,
+    "hierarchical": HierarchicalMovement,
+}
+
+LATENCY_TOLERANCE = 0.25   # A percentile regresses when it grows by more than 25%...
+LATENCY_NOISE_US = 5.0     # ...and by more than this many microseconds
+NODES_TOLERANCE = 0.01     # Node counts are deterministic, so any real increase is flagged
+
+
+# Stub Room with a random layout of trees
+class BenchmarkRoom:
+    def __init__(self, size: int, density: float, rng: random.Random):
+        self.grid = PassabilityGrid(size, size)
+        for y in range(size):
+            for x in range(size):
+                if rng.random() < density:
+                    self.grid.mark(y, x)
+
+    def get_passability_grid(self):
+        return self.grid
+
+    def get_map_objects_at(self, coord):
+        return []
+
+    def remove_from_grid(self, obj, coord):
+        return True, None
+
+    def add_to_grid(self, obj, coord):
+        pass
+
+    def get_info(self, player):
+        return {}
+
+# Stub Player and Hunter
+class BenchmarkCharacter:
+    def __init__(self, room: BenchmarkRoom):
+        self.room = room
+        self.pos = Coord(0, 0)
+
+    def get_current_position(self):
+        return self.pos
+
+    def get_current_room(self):
+        return self.room
+
+    def base_move(self, direction):
+        """Step in direction unless a tree or the border is in the way."""
+        dy, dx = DIRECTION_DELTAS.get(direction, (0, 0))
+        y, x = self.pos.y + dy, self.pos.x + dx
+        if self.room.grid.is_free(y, x):
+            self.pos = Coord(y, x)
+        return []
+
+    def update_position(self, new_pos, room):
+        self.pos = new_pos
+
+
+def make_pairs(room: BenchmarkRoom, distance: str, count: int, rng: random.Random) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Draw count (hunter cell, player cell) pairs of free cells that match the distance class."""
+    grid = room.grid
+    free = [(y, x) for y in range(grid.height) for x in range(grid.width) if grid.is_free(y, x)]
+    far = grid.height // 2
+    pairs = []
+    while len(pairs) < count:
+        start = rng.choice(free)
+        if distance == "near":
+            goal = (start[0] + rng.randint(-NEAR_DISTANCE, NEAR_DISTANCE), start[1] + rng.randint(-NEAR_DISTANCE, NEAR_DISTANCE))
+            if abs(goal[0] - start[0]) + abs(goal[1] - start[1]) > NEAR_DISTANCE or not grid.is_free(goal[0], goal[1]):
+                continue
+        else:
+            goal = rng.choice(free)
+            if abs(goal[0] - start[0]) + abs(goal[1] - start[1]) < far:
+                continue
+        pairs.append((start, goal))
+    return pairs
+
+
+def step_player(room: BenchmarkRoom, player: BenchmarkCharacter, hunter: BenchmarkCharacter, rng: random.Random) -> None:
+    """Move the player to a random free neighbouring cell that the hunter does not stand on, if there is one."""
+    y, x = player.pos.y, player.pos.x
+    options = [(y + dy, x + dx) for dy, dx in DIRECTION_DELTAS.values()
+               if room.grid.is_free(y + dy, x + dx) and (y + dy, x + dx) != (hunter.pos.y, hunter.pos.x)]
+    if options:
+        player.pos = Coord(*rng.choice(options))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def benchmark_scenario(name: str, size: int, density: float, distance: str, iterations: int, seed: int) -> Dict[str, Optional[float]]:
+    """Time iterations calls to one strategy's move() in one synthetic room."""
+    rng = random.Random(f"{seed}/{size}/{density}/{distance}")
+    room = BenchmarkRoom(size, density, rng)
+    pairs = make_pairs(room, distance, iterations, rng)
+    random.seed(seed)  # RandomMovement draws from the global generator
+
+    strategy = STRATEGIES[name]()
+    hunter, player = BenchmarkCharacter(room), BenchmarkCharacter(room)
+    state = get_movement_state(hunter)
+    pathfinder = strategy.pathfinder_for(state) if hasattr(strategy, "pathfinder_for") else None
+    latencies = []
+    nodes = []
+    hunter.pos, player.pos = Coord(*pairs[0][0]), Coord(*pairs[0][1])
+    for start, goal in pairs:
+        if distance != "chase":
+            hunter.pos, player.pos = Coord(*start), Coord(*goal)
+        elif abs(hunter.pos.y - player.pos.y) + abs(hunter.pos.x - player.pos.x) <= 1:
+            player.pos = Coord(*goal)  # Caught: the player starts again far away
+        else:
+            step_player(room, player, hunter, rng)
+        if pathfinder is not None:
+            pathfinder.nodes_expanded = 0
+        if isinstance(strategy, TeleportMovement):
+            state.last_teleport_tick = -TeleportMovement.cooldown_ticks(state.clock)  # Let every call teleport instead of falling back to base_move
+        t0 = time.perf_counter_ns()
+        strategy.move(hunter, "up", player)
+        latencies.append((time.perf_counter_ns() - t0) / 1000)
+        if pathfinder is not None:
+            nodes.append(pathfinder.nodes_expanded)
+
+    latencies.sort()
+    return {
+        "p50_us": round(percentile(latencies, 0.50), 2),
+        "p90_us": round(percentile(latencies, 0.90), 2),
+        "p99_us": round(percentile(latencies, 0.99), 2),
+        "max_us": round(latencies[-1], 2),
+        "mean_nodes": round(sum(nodes) / len(nodes), 2) if nodes else None,
+    }
+
+
+def run_benchmark(strategies=tuple(STRATEGIES), sizes=SIZES, densities=DENSITIES, distances=DISTANCES,
+                  iterations: int = 1000, seed: int = 303) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Run every (strategy, size, density, distance) combination.
+
+    Preconditions:
+        - Every name in strategies is a key of STRATEGIES.
+        - iterations > 0.
+    Postconditions:
+        - Returns {"<strategy>/size=<size>/density=<density>/distance=<distance>": stats}.
+    """
+    assert all(name in STRATEGIES for name in strategies), "Precondition failed: unknown strategy name."
+    assert iterations > 0, "Precondition failed: 'iterations' must be positive."
+    results = {}
+    for name in strategies:
+        for size in sizes:
+            for density in densities:
+                for distance in distances:
+                    key = f"{name}/size={size}/density={density}/distance={distance}"
+                    results[key] = benchmark_scenario(name, size, density, distance, iterations, seed)
+    return results
+
+
+def find_regressions(results: dict, baseline: dict) -> List[str]:
+    """Describe every scenario that got slower or expands more nodes than in the baseline."""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("p50_us", "p90_us"):
+            if stats[metric] > base[metric] * (1 + LATENCY_TOLERANCE) and stats[metric] - base[metric] > LATENCY_NOISE_US:
+                regressions.append(f"{key}: {metric} {base[metric]} -> {stats[metric]}")
+        if stats["mean_nodes"] is not None and base.get("mean_nodes") is not None \
+                and stats["mean_nodes"] > base["mean_nodes"] * (1 + NODES_TOLERANCE):
+            regressions.append(f"{key}: mean_nodes {base['mean_nodes']} -> {stats['mean_nodes']}")
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    print(f"{'scenario':<58} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'max us':>10} {'nodes':>10}")
+    for key, stats in results.items():
+        nodes = "-" if stats["mean_nodes"] is None else stats["mean_nodes"]
+        print(f"{key:<58} {stats['p50_us']:>10} {stats['p90_us']:>10} {stats['p99_us']:>10} {stats['max_us']:>10} {nodes:>10}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000, help="calls to move() per scenario")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--seed", type=int, default=303)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.strategies, args.sizes, iterations=args.iterations, seed=args.seed)
+    print_report(results)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.update_baseline or not baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
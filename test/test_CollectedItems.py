@@ -0,0 +1,55 @@
+# TO RUN THE TEST (please follow the README):
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning
+import pytest
+from project.CollectedItems import CollectedItems, ItemKind
+
+class DummyFlower:
+    pass
+
+class TaggedItem:
+    item_kind = ItemKind.ROCK
+
+class TestItemKind:
+    def test_classifies_strings_and_objects(self):
+        """
+        Test that items are classified by their declared kind, their string value or their type name.
+        """
+        assert ItemKind.of("rock") is ItemKind.ROCK
+        assert ItemKind.of(ItemKind.ANIMAL) is ItemKind.ANIMAL
+        assert ItemKind.of(TaggedItem()) is ItemKind.ROCK
+        assert ItemKind.of(DummyFlower()) is ItemKind.FLOWER
+        assert ItemKind.of("key") is None
+
+class TestCollectedItems:
+    def test_behaves_like_a_list(self):
+        """
+        Test that the container keeps collection order and compares equal to a list.
+        """
+        items = CollectedItems(["flower", "rock"])
+        items.append(ItemKind.ANIMAL)
+
+        assert items == ["flower", "rock", "animal"]
+        assert len(items) == 3 and items[-1] == "animal"
+        assert "rock" in items and "key" not in items
+
+    def test_pop_kind_removes_the_latest_item_of_that_kind(self):
+        """
+        Test that pop_kind takes back the most recent item of a kind and leaves the rest in order.
+        """
+        items = CollectedItems(["rock", "flower", "rock", "flower"])
+        first_rock = items.last_sequence(ItemKind.ROCK)
+
+        assert items.pop_kind(ItemKind.ROCK) == "rock"
+        assert items == ["rock", "flower", "flower"]
+        assert items.last_sequence(ItemKind.ROCK) < first_rock
+        assert items.count_kind(ItemKind.FLOWER) == 2
+        assert items.pop_kind(ItemKind.ANIMAL) is None
+
+    def test_pop_kind_cost_does_not_grow_with_the_collection(self):
+        """
+        Test that undoing in a large collection only touches the stack of the undone kind.
+        """
+        items = CollectedItems(["flower"] * 50000 + ["rock"])
+        assert items.pop_kind(ItemKind.FLOWER) == "flower"
+        assert items.count_kind(ItemKind.FLOWER) == 49999
+        assert items[-1] == "rock"
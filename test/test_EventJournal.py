@@ -0,0 +1,132 @@
+# TO RUN THE TEST (please follow the README):
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning
+import io
+import threading
+import pytest
+from project.EventJournal import EventJournal, JournalEvent, JournalRecord, replay
+from project.GameClock import GameClock
+from project.GameStateManager import GameStateManager, GameState
+from project.CollectedItems import ItemKind
+from project.imports import *
+
+class DummyFlower:
+    pass
+
+class TestEventJournal:
+    def test_records_are_fixed_width_and_round_trip(self):
+        """
+        Test that every record takes the same number of bytes and decodes to what was recorded.
+        """
+        clock = GameClock(7)
+        journal = EventJournal(clock=clock)
+        journal.record(JournalEvent.COLLECT, 1)
+        clock.advance()
+        journal.record(JournalEvent.HUNTER_MOVE, 0, 3, -4)
+
+        data = journal.getvalue()
+        assert len(data) == 2 * EventJournal.RECORD.size
+        assert list(EventJournal.read(data)) == [
+            JournalRecord(7, JournalEvent.COLLECT, 1, 0, 0),
+            JournalRecord(8, JournalEvent.HUNTER_MOVE, 0, 3, -4),
+        ]
+
+    def test_writes_are_buffered(self):
+        """
+        Test that records reach the stream in blocks, or when the journal is flushed.
+        """
+        stream = io.BytesIO()
+        journal = EventJournal(stream)
+        journal.record(JournalEvent.RESET)
+        assert stream.getvalue() == b"", "A single record should stay in the buffer"
+
+        journal.flush()
+        assert len(stream.getvalue()) == EventJournal.RECORD.size
+
+        for _ in range(EventJournal.FLUSH_BYTES // EventJournal.RECORD.size + 1):
+            journal.record(JournalEvent.RESET)
+        assert len(stream.getvalue()) >= EventJournal.FLUSH_BYTES, "A full buffer should be written out"
+
+    def test_torn_last_record_is_ignored(self, tmp_path):
+        """
+        Test that reading a journal file cut in the middle of a record returns the whole records.
+        """
+        path = tmp_path / "journal"
+        journal = EventJournal.open(str(path))
+        journal.record(JournalEvent.STATE, 1)
+        journal.record(JournalEvent.STATE, 2)
+        journal.close()
+        path.write_bytes(path.read_bytes()[:-3])
+
+        assert [record.arg for record in EventJournal.read_file(str(path))] == [1]
+
+    def test_concurrent_moves_are_all_recorded(self):
+        """
+        Test that moves recorded from several threads without a lock are all kept whole.
+        """
+        stream = io.BytesIO()
+        journal = EventJournal(stream)
+        workers, rounds = 4, EventJournal.FLUSH_BYTES // EventJournal.RECORD.size  # Each worker fills the buffer at least once
+
+        def move(y):
+            for x in range(rounds):
+                journal.record_move(JournalEvent.PLAYER_MOVE, Coord(y, x % 100))
+
+        threads = [threading.Thread(target=move, args=(y,)) for y in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.flush()
+
+        records = list(EventJournal.read(stream.getvalue()))
+        assert len(records) == workers * rounds
+        assert sorted(record.y for record in records) == sorted(y for y in range(workers) for _ in range(rounds))
+
+class TestJournaledGame:
+    def test_game_state_changes_are_journaled_and_replayed(self):
+        """
+        Test that a session with a journal records its changes, and that replaying them rebuilds its state.
+        """
+        manager = GameStateManager.create_session()
+        journal = EventJournal()
+        manager.set_journal(journal)
+
+        manager.collect_item(ItemKind.ROCK)
+        manager.collect_item("flower")
+        manager.collect_animal()
+        manager.undo_collect_item(DummyFlower())
+        manager.record_move(JournalEvent.PLAYER_MOVE, Coord(2, 3))
+        manager.set_game_state(GameState.LOSE)
+
+        events = [record.event for record in EventJournal.read(journal.getvalue())]
+        assert events == [JournalEvent.COLLECT, JournalEvent.COLLECT, JournalEvent.COLLECT,
+                          JournalEvent.UNDO, JournalEvent.PLAYER_MOVE, JournalEvent.STATE]
+
+        rebuilt, positions = replay(EventJournal.read(journal.getvalue()))
+        assert rebuilt is not manager
+        assert rebuilt.collected_items == manager.collected_items
+        assert rebuilt.collected_animals == manager.collected_animals == 1
+        assert rebuilt.get_state() == GameState.LOSE
+        assert positions == {"player": (2, 3)}
+
+    def test_replay_after_restore(self):
+        """
+        Test that a restore is journaled with the items it brings back.
+        """
+        manager = GameStateManager.create_session()
+        journal = EventJournal()
+        manager.set_journal(journal)
+        manager.collect_item("rock")
+        manager.restore_progress(GameState.PLAYING, ("flower", "flower"), 0, ())
+
+        rebuilt, _ = replay(EventJournal.read(journal.getvalue()))
+        assert rebuilt.collected_items == ["flower", "flower"]
+
+    def test_without_journal_nothing_is_recorded(self):
+        """
+        Test that sessions do not journal unless asked to.
+        """
+        manager = GameStateManager.create_session()
+        manager.collect_item("rock")
+        manager.record_move(JournalEvent.HUNTER_MOVE, Coord(1, 1))
+        assert manager.get_journal() is None
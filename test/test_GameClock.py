@@ -0,0 +1,35 @@
+# TO RUN THE TEST (please follow the README): 
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
+import pytest
+from project.GameClock import GameClock
+
+class TestGameClock:
+    def test_starts_at_zero(self):
+        """
+        Test that a new clock starts at tick 0.
+        """
+        assert GameClock().now() == 0
+
+    def test_advance(self):
+        """
+        Test that advancing the clock moves it forward by the given number of ticks.
+        """
+        clock = GameClock()
+        assert clock.advance() == 1
+        assert clock.advance(5) == 6
+        assert clock.now() == 6
+
+    def test_cannot_go_back(self):
+        """
+        Test that the clock refuses to move backwards.
+        """
+        with pytest.raises(AssertionError):
+            GameClock().advance(-1)
+
+    def test_seconds_are_converted_at_the_tick_rate(self):
+        """
+        Test that durations in seconds become ticks at the clock's rate.
+        """
+        assert GameClock().ticks(2) == 2 * GameClock.TICKS_PER_SECOND
+        assert GameClock(ticks_per_second=10).ticks(2) == 20
+        assert GameClock(ticks_per_second=10).ticks(0.01) == 1, "A positive duration lasts at least one tick"
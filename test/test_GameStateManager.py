@@ -1,7 +1,19 @@
 # TO RUN THE TEST (please follow the README): 
 # PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
 import pytest
-from project.GameStateManager import GameStateManager, GameState
+import random
+import sys
+import threading
+from functools import partial
+from project.GameStateManager import GameStateManager, GameState, StateWatcher
+from project.CollectedItems import ItemKind
+from project.UndoHistory import UndoHistory
+from project.LayoutSnapshot import LayoutRecord, LayoutSnapshot
+from project.example_map import ExampleHouse
+from project.Hunter import Hunter
+from project.Animal import Cow
+from project.PassabilityGrid import PassabilityGrid
+from project.imports import *
 
 class TestGameStateManagerSingleton:
     def setup_method(self):
@@ -56,13 +68,26 @@ class TestGameStateManagerSingleton:
         manager1 = GameStateManager()
         obj1 = object()
         coord1 = (1, 2)
-        manager1.store_original_objects([(obj1, coord1)])
+        manager1.store_original_objects(LayoutSnapshot.capture([(obj1, coord1)]))
 
         manager2 = GameStateManager()
         stored = manager2.get_original_objects()
 
         assert stored[0][1] == coord1, "Original object coord should be stored"
-        assert stored[0][0] is not obj1, "Original object should be deepcopied"
+        assert stored[0][0] is not obj1, "Original object should be rebuilt, not shared"
+
+    def test_original_objects_reject_a_bare_list(self):
+        """
+        Test that a list of (obj, coord) is refused, since objects with constructor arguments could not be rebuilt from it.
+        """
+        manager = GameStateManager.create_session()
+        hunter = Hunter(encounter_text="I caught you!")
+        with pytest.raises(AssertionError, match="LayoutSnapshot"):
+            manager.store_original_objects([(hunter, (3, 8))])
+
+        manager.store_original_objects(LayoutSnapshot([LayoutRecord(partial(Hunter, encounter_text="I caught you!"), (3, 8))]))
+        rebuilt, coord = manager.get_original_objects()[0]
+        assert isinstance(rebuilt, Hunter) and rebuilt is not hunter and coord == (3, 8)
 
     class MockObserver:
         def __init__(self):
@@ -100,3 +125,412 @@ class TestGameStateManagerSingleton:
         manager2.undo_collect_item(flower)
 
         assert "flower" not in manager1.collected_items, "Undo should reflect across singleton references"
+
+    class DummyRock:
+        pass
+
+    def test_pickup_summary_follows_collect_and_undo(self):
+        """
+        Test that the running pickup summary tracks collects and undos without rescanning.
+        """
+        manager = GameStateManager()
+        assert manager.get_pickup_summary() == (-1, -1, 0)
+
+        manager.collect_item("rock")
+        manager.collect_item("flower")
+        rock, flower, animals = manager.get_pickup_summary()
+        assert flower > rock and animals == 0
+
+        manager.collect_item("rock")
+        manager.collect_animal()
+        rock, flower, animals = manager.get_pickup_summary()
+        assert rock > flower and animals == 1
+
+        manager.undo_collect_item(self.DummyRock())
+        rock, flower, animals = manager.get_pickup_summary()
+        assert flower > rock and animals == 1, "Undo should bring back the earlier rock"
+
+    def test_undo_history_is_bounded(self):
+        """
+        Test that a long session keeps a fixed number of undoable pickups, the latest ones.
+        """
+        manager = GameStateManager.create_session()
+        for i in range(UndoHistory.CAPACITY * 10):
+            manager.track_picked_item("rock", (i, 0))
+
+        assert manager.get_undo_depth() == UndoHistory.CAPACITY
+        assert len(manager.tracked_picked_items) == UndoHistory.CAPACITY
+        assert manager.pop_undo().picked == (((UndoHistory.CAPACITY * 10 - 1, 0), str),)
+
+    def test_undo_history_keeps_factories_not_items(self):
+        """
+        Test that the undo history records picked items by their factory, so it keeps no item alive.
+        """
+        manager = GameStateManager.create_session()
+        rock = self.DummyRock()
+        rock.layout_factory = self.DummyRock
+        manager.track_picked_item(rock, (2, 3))
+
+        assert manager.peek_undo().picked == (((2, 3), self.DummyRock),)
+        assert manager.get_undo_depth() == 1, "Peeking does not take the command back"
+
+    def test_pop_undo_if_takes_back_only_accepted_commands(self):
+        """
+        Test that a refused command stays on the undo history, and that an accepted one is the one returned.
+        """
+        manager = GameStateManager.create_session()
+        assert manager.pop_undo_if(lambda delta: True) is None
+        manager.track_picked_item("rock", (1, 1))
+        manager.track_picked_item("flower", (2, 2))
+
+        assert manager.pop_undo_if(lambda delta: False) is None
+        assert manager.get_undo_depth() == 2
+        seen = []
+        delta = manager.pop_undo_if(lambda delta: seen.append(delta) is None)
+        assert delta is seen[-1] and delta.picked == (((2, 2), str),)
+        assert manager.get_undo_depth() == 1
+
+    def test_undo_collect_items_notifies_once(self):
+        """
+        Test that undoing several pickups at once takes back each of them and notifies the observers once.
+        """
+        manager = GameStateManager.create_session()
+        observer = self.MockObserver()
+        manager.add_observer(observer)
+        manager.collect_item("rock")
+        manager.collect_animal()
+        manager.collect_animal()
+        observer.notifications.clear()
+
+        manager.undo_collect_items([self.DummyRock(), Cow()])
+        assert manager.collected_items == ["animal"] and manager.collected_animals == 1
+        assert observer.notifications == ["ITEM_COLLECTED"]
+        manager.undo_collect_items([])
+        assert observer.notifications == ["ITEM_COLLECTED"], "Undoing nothing notifies no one"
+
+    def test_pickup_summary_after_direct_changes(self):
+        """
+        Test that the summary stays correct when collected_items is assigned or appended to directly.
+        """
+        manager = GameStateManager()
+        manager.collected_items = ["flower", "rock"]
+        rock, flower, animals = manager.get_pickup_summary()
+        assert rock > flower and animals == 0
+
+        manager.collected_items.append("animal")
+        assert manager.get_pickup_summary()[2] == 1
+
+
+class TestGameSessions:
+    def test_sessions_are_independent(self):
+        """
+        Test that sessions share no state with each other or with the default instance.
+        """
+        default = GameStateManager()
+        default.reset_game_state()
+        first = GameStateManager.create_session()
+        second = GameStateManager.create_session()
+
+        first.collect_animal()
+        first.set_game_state(GameState.WIN)
+
+        assert first is not second and first is not default
+        assert first.collected_animals == 1 and first.is_win()
+        assert second.collected_animals == 0 and second.get_state() == GameState.PLAYING
+        assert default.collected_animals == 0 and default.collected_items == []
+
+    def test_for_room(self):
+        """
+        Test that for_room() finds the session of a room and falls back to the default instance.
+        """
+        session = GameStateManager.create_session()
+
+        class SessionRoom:
+            def get_game_state(self):
+                return session
+
+        assert GameStateManager.for_room(SessionRoom()) is session
+        assert GameStateManager.for_room(object()) is GameStateManager()
+        assert GameStateManager.for_room(None) is GameStateManager()
+
+
+class TestThreadSafety:
+    class DummyAnimal:
+        pass
+
+    class DummyRock:
+        pass
+
+    def test_concurrent_collect_and_undo(self):
+        """
+        Test that concurrent collects and undos keep the counters consistent at every moment.
+        """
+        manager = GameStateManager.create_session(thread_safe=True)
+        workers, rounds = 8, 1000
+        errors = []
+        done = threading.Event()
+
+        def play():
+            try:
+                for _ in range(rounds):
+                    animal = self.DummyAnimal()
+                    manager.collect_animal()
+                    manager.track_picked_item(animal, (0, 0))
+                    manager.collect_item("rock")
+                    manager.pop_undo()
+                    manager.undo_collect_item(animal)
+                    manager.undo_collect_item(self.DummyRock())
+            except Exception as error:  # reported by the main thread
+                errors.append(error)
+
+        def check():
+            while not done.is_set():
+                _, items, animals, _ = manager.save_progress()
+                if not (0 <= animals <= manager.total_animals) or animals != items.count("animal"):
+                    errors.append(AssertionError(f"inconsistent snapshot: {animals} animals, items {items}"))
+                    return
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads as often as possible
+        try:
+            checker = threading.Thread(target=check)
+            threads = [threading.Thread(target=play) for _ in range(workers)]
+            checker.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            done.set()
+            checker.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert manager.collected_animals == 0
+        assert manager.collected_items == []
+        assert manager.pop_undo() is None
+        assert manager.get_pickup_summary() == (-1, -1, 0)
+
+    def test_concurrent_hunter_ticks_and_player_input(self):
+        """
+        Test that hunters updated on one thread and player input handled on others leave the grid,
+        its passability index and every character's position consistent.
+        """
+        room = ExampleHouse()
+        player = HumanPlayer("test player")
+        room.add_player(player, Coord(5, 5))
+        keybinds = room._get_keybinds()
+        ticks, presses = 300, 300
+        errors = []
+        done = threading.Event()
+
+        def tick():
+            try:
+                for _ in range(ticks):
+                    room.update()
+            except Exception as error:  # reported by the main thread
+                errors.append(error)
+
+        def press(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(presses):
+                    keybinds[rng.choice(("up", "down", "left", "right", "up", "down", "left", "right", "j", "z"))](player)
+            except Exception as error:
+                errors.append(error)
+
+        def check():
+            while not done.is_set():
+                with room.get_game_state().locked():
+                    if player not in room.get_map_objects_at(player.get_current_position()):
+                        errors.append(AssertionError(f"player is not on the grid at {player.get_current_position()}"))
+                        return
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads as often as possible
+        try:
+            checker = threading.Thread(target=check)
+            threads = [threading.Thread(target=tick)] + [threading.Thread(target=press, args=(seed,)) for seed in range(2)]
+            checker.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            done.set()
+            checker.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        rebuilt = PassabilityGrid.from_room(room, ExampleHouse.SIZE)
+        assert room.get_passability_grid().cells == rebuilt.cells
+        height, width = ExampleHouse.SIZE
+        placed = [obj for y in range(height) for x in range(width) for obj in room.get_map_objects_at(Coord(y, x))]
+        for character in [player] + [obj for obj in placed if isinstance(obj, Hunter)]:
+            assert placed.count(character) == 1
+            assert character in room.get_map_objects_at(character.get_current_position())
+
+    def test_concurrent_conditional_undo(self):
+        """
+        Test that threads racing to undo each take back the very command their predicate accepted, once.
+        """
+        manager = GameStateManager.create_session(thread_safe=True)
+        commands, workers = 2000, 4
+        for i in range(commands):
+            manager.track_picked_item("rock", (i, 0))
+        popped, errors = [], []
+
+        def undo():
+            seen = []
+            while True:
+                delta = manager.pop_undo_if(lambda delta: seen.append(delta) is None)
+                if delta is None:
+                    return
+                if delta is not seen[-1]:
+                    errors.append(AssertionError(f"checked {seen[-1]} but undid {delta}"))
+                popped.append(delta.picked[0][0])
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads as often as possible
+        try:
+            threads = [threading.Thread(target=undo) for _ in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert sorted(popped) == [(i, 0) for i in range(commands - UndoHistory.CAPACITY, commands)]
+
+    def test_thread_safe_mode_is_opt_in(self):
+        """
+        Test that sessions only lock when asked to, and that the mode can be enabled later.
+        """
+        session = GameStateManager.create_session()
+        assert not session.is_thread_safe()
+        session.enable_thread_safety()
+        assert session.is_thread_safe()
+        assert GameStateManager.create_session(thread_safe=True).is_thread_safe()
+
+
+class TestDeferredEvents:
+    class MockObserver:
+        def __init__(self, manager=None):
+            self.notifications = []
+            self.manager = manager
+
+        def on_notify(self, event):
+            self.notifications.append(event)
+            if self.manager is not None and event == "WIN":
+                self.manager.collect_item("rock")  # raised while the queue is being flushed
+
+    def test_events_wait_for_flush_and_coalesce(self):
+        """
+        Test that deferred events are delivered on flush, each distinct event once and in order.
+        """
+        manager = GameStateManager.create_session()
+        manager.defer_events()
+        observer = self.MockObserver()
+        manager.add_observer(observer)
+
+        for _ in range(5):
+            manager.collect_item("flower")
+        manager.collect_animal()
+        manager.collect_item("rock")
+        assert observer.notifications == [], "Nothing is delivered before the flush"
+
+        manager.flush_events()
+        assert observer.notifications == ["ITEM_COLLECTED", "ANIMAL_COLLECTED"]
+        manager.flush_events()
+        assert observer.notifications == ["ITEM_COLLECTED", "ANIMAL_COLLECTED"], "The queue is empty after a flush"
+
+    def test_events_raised_during_flush_wait_for_next_flush(self):
+        """
+        Test that an observer reacting to an event does not get called back within the same flush.
+        """
+        manager = GameStateManager.create_session()
+        manager.defer_events()
+        observer = self.MockObserver(manager)
+        manager.add_observer(observer)
+
+        manager.set_game_state(GameState.WIN)
+        manager.flush_events()
+        assert observer.notifications == ["WIN"]
+        manager.flush_events()
+        assert observer.notifications == ["WIN", "ITEM_COLLECTED"]
+
+    def test_reset_drops_queued_events(self):
+        """
+        Test that events queued for a finished game are not delivered after a reset.
+        """
+        manager = GameStateManager.create_session()
+        manager.defer_events()
+        observer = self.MockObserver()
+        manager.add_observer(observer)
+
+        manager.collect_item("rock")
+        manager.reset_game_state()
+        manager.defer_events(False)
+        assert observer.notifications == []
+
+
+class TestStateVersion:
+    def test_every_change_moves_the_version(self):
+        """
+        Test that each kind of change increases the version, and that reading does not.
+        """
+        manager = GameStateManager.create_session()
+        changes = [
+            lambda: manager.collect_item("rock"),
+            lambda: manager.collect_animal(),
+            lambda: manager.track_picked_item("rock", (1, 1)),
+            lambda: manager.pop_undo(),
+            lambda: manager.undo_collect_item("rock"),
+            lambda: manager.collected_items.append("flower"),
+            lambda: setattr(manager, "collected_items", []),
+            lambda: manager.set_game_state(GameState.WIN),
+            lambda: manager.reset_game_state(),
+        ]
+        version = manager.get_version()
+        for change in changes:
+            change()
+            assert manager.get_version() > version
+            version = manager.get_version()
+
+        manager.get_pickup_summary()
+        manager.save_progress()
+        manager.peek_undo()
+        assert manager.get_version() == version
+
+    def test_watcher_reports_changes_once(self):
+        """
+        Test that a watcher sees a change once, and tells managers apart.
+        """
+        manager, other = GameStateManager.create_session(), GameStateManager.create_session()
+        watcher = StateWatcher()
+        assert watcher.changed(manager)
+        assert not watcher.changed(manager)
+
+        manager.collect_item("rock")
+        assert watcher.changed(manager)
+        assert watcher.changed(other), "Another session is a change even at the same version"
+
+    def test_watcher_memoizes_values(self):
+        """
+        Test that a derived value is recomputed only when the version moves.
+        """
+        manager = GameStateManager.create_session()
+        watcher = StateWatcher()
+        calls = []
+
+        def count_rocks(gsm):
+            calls.append(gsm.get_version())
+            return gsm.collected_items.count_kind(ItemKind.ROCK)
+
+        assert watcher.value(manager, count_rocks) == 0
+        assert watcher.value(manager, count_rocks) == 0
+        manager.collect_item("rock")
+        assert watcher.value(manager, count_rocks) == 1
+        assert len(calls) == 2
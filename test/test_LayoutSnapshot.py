@@ -0,0 +1,42 @@
+# TO RUN THE TEST (please follow the README):
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning
+import pytest
+from functools import partial
+from project.LayoutSnapshot import LayoutRecord, LayoutSnapshot
+
+class Tile:
+    def __init__(self, label: str = "plain"):
+        self.label = label
+
+class TestLayoutSnapshot:
+    def test_capture_rebuilds_objects_by_class(self):
+        """
+        Test that a captured layout builds new objects of the same classes at the same coordinates.
+        """
+        original = Tile()
+        snapshot = LayoutSnapshot.capture([(original, (1, 2))])
+
+        (obj, coord), = snapshot.instantiate()
+        assert isinstance(obj, Tile) and obj is not original
+        assert coord == (1, 2)
+
+    def test_records_with_factories(self):
+        """
+        Test that records call their factory, so objects with constructor arguments can be laid out.
+        """
+        snapshot = LayoutSnapshot([LayoutRecord(partial(Tile, "door"), (0, 7))])
+        snapshot += LayoutSnapshot([LayoutRecord(Tile, (3, 3))])
+
+        objects = snapshot.instantiate()
+        assert [obj.label for obj, _ in objects] == ["door", "plain"]
+        assert len(snapshot) == 2
+
+    def test_snapshot_is_immutable(self):
+        """
+        Test that the records of a snapshot cannot be changed.
+        """
+        snapshot = LayoutSnapshot([LayoutRecord(Tile, (0, 0))])
+        with pytest.raises((TypeError, AttributeError)):
+            snapshot.records[0] = LayoutRecord(Tile, (1, 1))
+        with pytest.raises(AttributeError):
+            snapshot.extra = 1
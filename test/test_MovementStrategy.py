@@ -6,6 +6,10 @@ from project.Hunter import Hunter
 from project.MovementStrategy import *
 from project.imports import *
 from project.imports import Coord
+from project.GameClock import GameClock
+from project.PassabilityGrid import PassabilityGrid
+from project.Pathfinding import AStarPathfinder, FlowField, NextHopTable
+from project.test.benchmark_MovementStrategy import run_benchmark, find_regressions
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from coord import Coord
@@ -38,6 +42,44 @@ class Room:
     def get_info(self, player):
         return {} 
 
+# Stub Room that keeps a passability index
+class IndexedRoom(Room):
+    def __init__(self, blocked=()):
+        super().__init__()
+        self.grid = PassabilityGrid(15, 15)
+        for y, x in blocked:
+            self.grid.mark(y, x)
+
+    def get_map_objects_at(self, coord):
+        raise AssertionError("Indexed rooms should not be scanned")
+
+    def get_passability_grid(self):
+        return self.grid
+
+# Stub Room in flow-field mode that counts how many fields it computes
+class FlowFieldRoom(IndexedRoom):
+    use_flow_field = True
+
+    def __init__(self, blocked=()):
+        super().__init__(blocked)
+        self.fields_computed = 0
+        self.field = None
+
+    def get_flow_field(self, goal):
+        if self.field is None or not self.field.is_current(self.grid, goal):
+            self.field = FlowField(self.grid, goal)
+            self.fields_computed += 1
+        return self.field
+
+# Stub Room with a precomputed next-hop table
+class TableRoom(IndexedRoom):
+    def __init__(self, blocked=()):
+        super().__init__(blocked)
+        self.table = NextHopTable(self.grid)
+
+    def get_next_hop_table(self):
+        return self.table
+
 # Stub Player
 class Player:
     def __init__(self, y, x):
@@ -99,9 +141,7 @@ def shortest_path_strategy():
 
 @pytest.fixture
 def teleport_strategy():
-    strat = TeleportMovement()
-    strat.last_teleport_time = time.time() - 3  
-    return strat
+    return TeleportMovement()
 
 @pytest.fixture
 def random_strategy():
@@ -134,6 +174,8 @@ class TestMovementStrategies:
         """
         Test that the hunter teleports to a position close to the player.
         """
+        state = get_movement_state(hunter)
+        state.last_teleport_tick = -TeleportMovement.cooldown_ticks(state.clock)
         msgs = teleport_strategy.move(hunter, direction="up", player=player)
 
         # Hunter should teleport close to player
@@ -141,3 +183,229 @@ class TestMovementStrategies:
         assert isinstance(msgs[0], GridMessage), "Expected a GridMessage after teleport"
         assert room.removed, "Hunter should be removed from grid"
         assert room.added_coord is not None, "Hunter should be added to new coord"
+
+    def test_shortest_path_avoids_blocked_cells(self, hunter, player):
+        """
+        Test that the hunter walks around obstacles recorded in the room's passability index.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+
+        ShortestPathMovement().move(hunter, direction=None, player=player)
+
+        assert hunter.move_log[-1] in ["up", "down"], "Hunter should step around the obstacle"
+
+    def test_room_size_follows_the_room(self):
+        """
+        Test that rooms without an index are scanned at their own size, and indexed rooms report the size of their index.
+        """
+        room = Room()
+        room.SIZE = (9, 21)
+        grid = get_passability_grid(room)
+        assert (grid.height, grid.width) == (9, 21)
+        assert get_room_size(IndexedRoom()) == (15, 15)
+
+    def test_flow_field_shared_by_hunters(self, player):
+        """
+        Test that several hunters in flow-field mode share a single search toward the player.
+        """
+        room = FlowFieldRoom(blocked=[(2, 3)])
+        strategy = ShortestPathMovement()
+        hunters = [Hunter(2, 2), Hunter(6, 5), Hunter(2, 9)]
+        for h in hunters:
+            h.get_current_room = lambda: room
+            strategy.move(h, direction=None, player=player)
+
+        assert room.fields_computed == 1, "Every hunter should reuse the same flow field"
+        assert hunters[0].move_log[-1] in ["up", "down"]
+        assert hunters[1].move_log[-1] == "up"
+        assert hunters[2].move_log[-1] == "left"
+
+    def test_incremental_path_movement(self, hunter, player):
+        """
+        Test that the incremental strategy keeps following a shortest path around obstacles.
+        """
+        room = IndexedRoom(blocked=[(2, 3), (1, 3), (3, 3)])
+        hunter.get_current_room = lambda: room
+        strategy = IncrementalPathMovement()
+
+        strategy.move(hunter, direction=None, player=player)
+        strategy.move(hunter, direction=None, player=player)
+
+        assert hunter.move_log[0] in ["up", "down"]
+        assert strategy.pathfinder_for(hunter.movement_state).replans == 1, "The second move should reuse the first search"
+
+    def test_shortest_path_uses_next_hop_table(self, hunter, player):
+        """
+        Test that the default shortest-path strategy reads its step from the room's next-hop table.
+        """
+        room = TableRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+        strategy = ShortestPathMovement()
+
+        strategy.move(hunter, direction=None, player=player)
+
+        assert hunter.move_log[-1] in ["up", "down"]
+        assert strategy.pathfinder.nodes_expanded == 0, "No search should run when a table is available"
+
+    def test_path_cache_reused_while_player_idles(self, hunter, player):
+        """
+        Test that the hunter walks its cached path while the player and the obstacles stay put.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+        strategy = ShortestPathMovement(AStarPathfinder())
+
+        strategy.move(hunter, direction=None, player=player)
+        strategy.move(hunter, direction=None, player=player)
+        assert hunter.movement_state.cache_hits == 1, "Second step should come from the cached path"
+
+        room.grid.mark(0, 0)  # any obstacle change invalidates the cached path
+        strategy.move(hunter, direction=None, player=player)
+        assert hunter.movement_state.cache_hits == 1
+
+    def test_path_cache_is_bounded(self, hunter):
+        """
+        Test that the path cache evicts old entries once it is full.
+        """
+        room = IndexedRoom()
+        hunter.get_current_room = lambda: room
+        strategy = ShortestPathMovement(AStarPathfinder())
+        for y in range(15):
+            for x in range(15):
+                strategy.move(hunter, direction=None, player=Player(y, x))
+        assert len(hunter.movement_state.path_cache) <= ShortestPathMovement.PATH_CACHE_SIZE
+
+    def test_jump_point_movement(self, hunter, player):
+        """
+        Test that the jump point strategy steps around obstacles like the shortest-path strategy.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+
+        msgs = JumpPointMovement().move(hunter, direction=None, player=player)
+
+        assert hunter.move_log[-1] in ["up", "down"]
+        assert msgs == [f"moved {hunter.move_log[-1]}"]
+
+    def test_hierarchical_movement(self, hunter, player):
+        """
+        Test that the hierarchical strategy steps around obstacles and reuses its planned segment.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+        strategy = HierarchicalMovement(cluster_size=3)
+
+        msgs = strategy.move(hunter, direction=None, player=player)
+
+        assert hunter.move_log[-1] in ["up", "down"]
+        assert msgs == [f"moved {hunter.move_log[-1]}"]
+
+    def test_shared_strategy_keeps_state_per_hunter(self, player):
+        """
+        Test that one shared strategy keeps a separate path cache and engine for each hunter.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        strategy = IncrementalPathMovement.shared()
+        first, second = Hunter(2, 2), Hunter(6, 5)
+        for h in (first, second):
+            h.get_current_room = lambda: room
+            strategy.move(h, direction=None, player=player)
+
+        assert strategy is IncrementalPathMovement.shared()
+        assert strategy.pathfinder_for(first.movement_state) is not strategy.pathfinder_for(second.movement_state)
+
+    def test_state_survives_strategy_switch(self, hunter, player, room):
+        """
+        Test that the path cache and the teleport cooldown outlive a switch to another strategy and back.
+        """
+        indexed = IndexedRoom()
+        hunter.get_current_room = lambda: indexed
+        ShortestPathMovement.shared().move(hunter, direction=None, player=player)
+        RandomMovement.shared().move(hunter)
+        hunter.pos = Coord(2, 3)
+        ShortestPathMovement.shared().move(hunter, direction=None, player=player)
+        assert hunter.movement_state.cache_hits == 1, "The path cached before the switch should be reused"
+
+        hunter.get_current_room = lambda: room
+        hunter.movement_state.last_teleport_tick = hunter.movement_state.clock.now()
+        TeleportMovement.shared().move(hunter, direction="up", player=player)
+        assert not hunter.updated, "A recent teleport should still be cooling down"
+
+    def test_teleport_cooldown_counts_room_ticks(self, hunter, player, room):
+        """
+        Test that the teleport cooldown is measured in ticks of the room's game clock, at the room's tick rate.
+        """
+        clock = GameClock(ticks_per_second=10)
+        room.get_game_clock = lambda: clock
+        strategy = TeleportMovement()
+        cooldown = TeleportMovement.cooldown_ticks(clock)
+        assert cooldown == TeleportMovement.COOLDOWN_SECONDS * 10
+
+        clock.advance(cooldown - 1)
+        strategy.move(hunter, direction="up", player=player)
+        assert not hunter.updated, "The cooldown has not elapsed yet"
+
+        clock.advance()
+        msgs = strategy.move(hunter, direction="up", player=player)
+        assert hunter.updated and isinstance(msgs[0], GridMessage)
+        assert hunter.movement_state.last_teleport_tick == cooldown
+
+    def test_fast_hunter_takes_several_steps_from_one_search(self, hunter, player):
+        """
+        Test that a hunter with speed 3 walks three cells of a single computed path in one move.
+        """
+        room = IndexedRoom(blocked=[(2, 3)])
+        hunter.get_current_room = lambda: room
+        hunter.speed = 3
+        pathfinder = AStarPathfinder()
+        searches = []
+        find_path = pathfinder.find_path
+        pathfinder.find_path = lambda *args: searches.append(args) or find_path(*args)
+
+        msgs = ShortestPathMovement(pathfinder).move(hunter, direction=None, player=player)
+
+        assert len(searches) == 1, "All steps should come from one search"
+        assert len(hunter.move_log) == 3 and len(msgs) == 3
+        assert abs(hunter.pos.y - player.pos.y) + abs(hunter.pos.x - player.pos.x) == 2
+
+    def test_fast_hunter_stops_when_a_step_is_refused(self, hunter, player):
+        """
+        Test that a fast hunter stops walking as soon as one of its steps does not go through.
+        """
+        room = IndexedRoom()
+        hunter.get_current_room = lambda: room
+        hunter.speed = 3
+        hunter.base_move = lambda direction: hunter.move_log.append(direction) or []
+
+        ShortestPathMovement().move(hunter, direction=None, player=player)
+
+        assert hunter.move_log == ["right"], "The hunter did not move, so it should not try further steps"
+
+
+class TestBenchmark:
+    def test_benchmark_reports_every_scenario(self):
+        """
+        Test that a tiny benchmark run reports sorted percentiles and node counts only for search strategies.
+        """
+        results = run_benchmark(("random", "shortest_path"), sizes=(15,), densities=(0.1,), iterations=20)
+
+        assert set(results) == {f"{name}/size=15/density=0.1/distance={distance}"
+                                for name in ("random", "shortest_path") for distance in ("near", "far", "chase")}
+        for key, stats in results.items():
+            assert stats["p50_us"] <= stats["p90_us"] <= stats["p99_us"] <= stats["max_us"]
+            assert (stats["mean_nodes"] is None) == key.startswith("random")
+
+    def test_regressions_are_flagged(self):
+        """
+        Test that slower percentiles and extra expanded nodes are flagged, and noise is not.
+        """
+        baseline = {"a": {"p50_us": 100.0, "p90_us": 200.0, "mean_nodes": 50.0},
+                    "b": {"p50_us": 1.0, "p90_us": 2.0, "mean_nodes": None}}
+        results = {"a": {"p50_us": 300.0, "p90_us": 210.0, "mean_nodes": 60.0},
+                   "b": {"p50_us": 2.0, "p90_us": 4.0, "mean_nodes": None},
+                   "c": {"p50_us": 9.0, "p90_us": 9.0, "mean_nodes": None}}
+
+        regressions = find_regressions(results, baseline)
+
+        assert regressions == ["a: p50_us 100.0 -> 300.0", "a: mean_nodes 50.0 -> 60.0"]
@@ -0,0 +1,380 @@
+# TO RUN THE TEST (please follow the README): 
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
+import random
+import pytest
+from project.PassabilityGrid import PassabilityGrid
+import project.Pathfinding as pathfinding
+from project.Pathfinding import AStarPathfinder, DStarLitePathfinder, DistanceTransformPathfinder, FlowField, HierarchicalPathfinder, JumpPointPathfinder, NextHopTable, direction_between
+
+def make_grid(rows):
+    """Build a grid from strings where '#' marks an obstacle."""
+    grid = PassabilityGrid(len(rows), len(rows[0]))
+    for y, row in enumerate(rows):
+        for x, cell in enumerate(row):
+            if cell == "#":
+                grid.mark(y, x)
+    return grid
+
+@pytest.fixture
+def dead_end_grid():
+    # The direct route from (1, 1) to (1, 7) runs into a pocket closed on the right.
+    return make_grid([
+        ".........",
+        "....#....",
+        "....#....",
+        "#####....",
+        ".........",
+    ])
+
+class TestAStarPathfinder:
+    def test_finds_shortest_path(self, dead_end_grid):
+        """
+        Test that A* returns a shortest path around the obstacles.
+        """
+        pathfinder = AStarPathfinder()
+        path = pathfinder.find_path(dead_end_grid, (1, 1), (1, 7))
+
+        assert path[0] == (1, 1) and path[-1] == (1, 7)
+        assert len(path) - 1 == 8, "Shortest route goes over the wall through row 0"
+        assert all(dead_end_grid.is_free(y, x) for y, x in path)
+        assert pathfinder.nodes_expanded > 0
+
+    def test_unreachable_goal(self):
+        """
+        Test that A* returns None when the goal is walled off.
+        """
+        grid = make_grid([
+            "..#..",
+            "..#..",
+            "..#..",
+        ])
+        assert AStarPathfinder().find_path(grid, (0, 0), (0, 4)) is None
+
+    def test_large_open_grid_expands_only_the_path(self):
+        """
+        Test that A* works beyond 15x15 and heads straight for the goal on open ground.
+        """
+        grid = PassabilityGrid(60, 80)
+        pathfinder = AStarPathfinder()
+        path = pathfinder.find_path(grid, (0, 0), (59, 79))
+
+        assert len(path) - 1 == 59 + 79
+        assert pathfinder.nodes_expanded == len(path), "Tie-breaking should keep the frontier on one path"
+
+    def test_next_step_direction(self, dead_end_grid):
+        """
+        Test that next_step returns an adjacent cell that maps to a direction.
+        """
+        step = AStarPathfinder().next_step(dead_end_grid, (1, 1), (1, 7))
+        assert direction_between((1, 1), step) in ["up", "right"]
+
+
+class TestFlowField:
+    def test_distances_match_shortest_paths(self, dead_end_grid):
+        """
+        Test that the flow field distances agree with A* path lengths.
+        """
+        field = FlowField(dead_end_grid, (1, 7))
+        for start in [(1, 1), (4, 0), (0, 8), (2, 5)]:
+            path = AStarPathfinder().find_path(dead_end_grid, start, (1, 7))
+            assert field.distance(start) == len(path) - 1
+
+    def test_next_steps_lead_to_goal(self, dead_end_grid):
+        """
+        Test that following next_step from any reachable cell ends on the goal.
+        """
+        field = FlowField(dead_end_grid, (1, 7))
+        cell = (4, 0)
+        for _ in range(field.distance(cell)):
+            cell = field.next_step(cell)
+        assert cell == (1, 7)
+        assert field.next_step((1, 7)) is None
+
+    def test_stale_after_obstacle_change(self, dead_end_grid):
+        """
+        Test that the field reports itself stale once an obstacle is added or the goal moves.
+        """
+        field = FlowField(dead_end_grid, (1, 7))
+        assert field.is_current(dead_end_grid, (1, 7))
+        assert not field.is_current(dead_end_grid, (1, 8))
+
+        dead_end_grid.mark(0, 4)
+        assert not field.is_current(dead_end_grid, (1, 7))
+
+
+class TestDStarLitePathfinder:
+    def test_matches_astar(self, dead_end_grid):
+        """
+        Test that D* Lite returns paths as short as A*.
+        """
+        path = DStarLitePathfinder().find_path(dead_end_grid, (1, 1), (1, 7))
+        assert len(path) - 1 == len(AStarPathfinder().find_path(dead_end_grid, (1, 1), (1, 7))) - 1
+
+    def test_repairs_after_obstacle_change(self, dead_end_grid):
+        """
+        Test that the search is repaired, not restarted, when obstacles appear or disappear.
+        """
+        pathfinder = DStarLitePathfinder()
+        pathfinder.find_path(dead_end_grid, (1, 1), (1, 7))
+
+        dead_end_grid.unmark(1, 4)  # open a hole in the wall
+        path = pathfinder.find_path(dead_end_grid, (1, 1), (1, 7))
+        assert len(path) - 1 == 6, "The hole gives a straight route"
+
+        dead_end_grid.mark(1, 4)
+        dead_end_grid.mark(0, 4)  # close the pocket completely
+        assert pathfinder.find_path(dead_end_grid, (1, 1), (1, 7)) is None
+        assert pathfinder.replans == 1, "Obstacle changes should not restart the search"
+
+    def test_following_the_path_is_cheap(self):
+        """
+        Test that stepping along the planned path needs far fewer expansions than the first search.
+        """
+        grid = PassabilityGrid(40, 40)
+        for y in range(0, 35):
+            grid.mark(y, 20)
+        pathfinder = DStarLitePathfinder()
+        start, goal = (0, 0), (0, 39)
+
+        pathfinder.next_step(grid, start, goal)
+        first_search = pathfinder.nodes_expanded
+        step = pathfinder.next_step(grid, start, goal)
+        pathfinder.next_step(grid, step, goal)
+
+        assert pathfinder.nodes_expanded * 10 < first_search
+
+    def test_goal_change_reuses_the_search(self, dead_end_grid):
+        """
+        Test that moving the goal keeps the search and still finds a shortest path.
+        """
+        pathfinder = DStarLitePathfinder()
+        pathfinder.find_path(dead_end_grid, (1, 1), (1, 7))
+        path = pathfinder.find_path(dead_end_grid, (1, 1), (4, 8))
+
+        assert pathfinder.replans == 1
+        assert path[-1] == (4, 8)
+        assert len(path) == len(AStarPathfinder().find_path(dead_end_grid, (1, 1), (4, 8)))
+
+    def test_chasing_a_moving_player_expands_less_than_astar(self):
+        """
+        Test that following a player who moves every tick costs fewer expansions than searching again with A*.
+        """
+        rng = random.Random(303)
+        grid = PassabilityGrid(60, 60)
+        for y in range(60):
+            for x in range(60):
+                if rng.random() < 0.25:
+                    grid.mark(y, x)
+        hunter, player = (0, 0), (59, 59)
+        for cell in (hunter, player):
+            if not grid.is_free(*cell):
+                grid.unmark(*cell)
+        astar, dstar = AStarPathfinder(), DStarLitePathfinder()
+        astar_nodes = dstar_nodes = 0
+
+        for _ in range(60):
+            expected = astar.find_path(grid, hunter, player)
+            path = dstar.find_path(grid, hunter, player)
+            astar_nodes += astar.nodes_expanded
+            dstar_nodes += dstar.nodes_expanded
+            assert len(path) == len(expected), "D* Lite should keep returning shortest paths"
+            if len(path) < 3:
+                break
+            hunter = path[1]
+            y, x = player
+            player = rng.choice([cell for cell in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1))
+                                 if grid.is_free(*cell) and cell != hunter] or [player])
+
+        assert dstar.replans == 1, "Neither the player's moves nor the hunter's steps should restart the search"
+        assert dstar_nodes * 2 < astar_nodes
+
+
+class TestNextHopTable:
+    def test_hops_follow_shortest_paths(self, dead_end_grid):
+        """
+        Test that chaining table lookups walks a shortest path between any two free cells.
+        """
+        table = NextHopTable(dead_end_grid)
+        for start, goal in [((1, 1), (1, 7)), ((4, 0), (0, 0)), ((2, 8), (1, 3))]:
+            cell, steps = start, 0
+            while cell != goal:
+                cell = table.next_step(cell, goal)
+                steps += 1
+            assert steps == len(AStarPathfinder().find_path(dead_end_grid, start, goal)) - 1
+
+    def test_unreachable_and_identical_cells(self):
+        """
+        Test that the table has no hop toward an unreachable goal or toward the start itself.
+        """
+        grid = make_grid([
+            "..#..",
+            "..#..",
+        ])
+        table = NextHopTable(grid)
+        assert table.next_step((0, 0), (0, 4)) is None
+        assert table.next_step((0, 0), (0, 0)) is None
+
+    def test_stale_after_obstacle_change(self, dead_end_grid):
+        """
+        Test that the table reports itself stale once an obstacle changes.
+        """
+        table = NextHopTable(dead_end_grid)
+        dead_end_grid.mark(4, 4)
+        assert not table.is_current(dead_end_grid)
+
+
+class TestDistanceTransformPathfinder:
+    @pytest.fixture(params=["numpy", "pure-python"])
+    def pathfinder(self, request, monkeypatch):
+        if request.param == "numpy":
+            if pathfinding.np is None:
+                pytest.skip("NumPy is not installed")
+        else:
+            monkeypatch.setattr(pathfinding, "np", None)
+        return DistanceTransformPathfinder()
+
+    def test_matches_astar(self, pathfinder, dead_end_grid):
+        """
+        Test that descending the distance field gives paths as short as A*.
+        """
+        for start in [(1, 1), (4, 0), (2, 8)]:
+            path = pathfinder.find_path(dead_end_grid, start, (1, 7))
+            assert path[-1] == (1, 7)
+            assert len(path) == len(AStarPathfinder().find_path(dead_end_grid, start, (1, 7)))
+
+    def test_field_reused_until_grid_changes(self, pathfinder, dead_end_grid):
+        """
+        Test that the field is kept between calls and recomputed after an obstacle change.
+        """
+        pathfinder.next_step(dead_end_grid, (1, 1), (1, 7))
+        assert pathfinder.nodes_expanded > 0
+        pathfinder.next_step(dead_end_grid, (0, 1), (1, 7))
+        assert pathfinder.nodes_expanded == 0, "Same goal and obstacles should reuse the field"
+
+        dead_end_grid.unmark(1, 4)
+        assert pathfinder.next_step(dead_end_grid, (1, 3), (1, 7)) == (1, 4)
+
+    def test_fields_are_kept_per_grid(self, pathfinder, dead_end_grid):
+        """
+        Test that alternating between the grids of two rooms keeps the field of each.
+        """
+        other_grid = PassabilityGrid(dead_end_grid.height, dead_end_grid.width)
+        pathfinder.next_step(dead_end_grid, (1, 1), (1, 7))
+        pathfinder.next_step(other_grid, (1, 1), (1, 7))
+
+        assert pathfinder.next_step(dead_end_grid, (0, 1), (1, 7)) == (0, 2)
+        assert pathfinder.nodes_expanded == 0, "Switching rooms should not throw the other room's field away"
+        assert pathfinder.next_step(other_grid, (1, 3), (1, 7)) == (1, 4)
+        assert pathfinder.nodes_expanded == 0
+
+    def test_unreachable_goal(self, pathfinder):
+        """
+        Test that the engine returns None when the goal is walled off.
+        """
+        grid = make_grid([
+            "..#..",
+            "..#..",
+        ])
+        assert pathfinder.find_path(grid, (0, 0), (0, 4)) is None
+        assert pathfinder.next_step(grid, (0, 0), (0, 4)) is None
+
+
+class TestJumpPointPathfinder:
+    def test_matches_astar(self, dead_end_grid):
+        """
+        Test that JPS returns complete paths as short as A*.
+        """
+        pathfinder = JumpPointPathfinder()
+        for start, goal in [((1, 1), (1, 7)), ((4, 0), (0, 8)), ((2, 8), (1, 3)), ((0, 0), (4, 8))]:
+            path = pathfinder.find_path(dead_end_grid, start, goal)
+            assert path[0] == start and path[-1] == goal
+            assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+            assert len(path) == len(AStarPathfinder().find_path(dead_end_grid, start, goal))
+
+    def test_open_room_expands_few_jump_points(self):
+        """
+        Test that crossing an open room only expands a handful of jump points.
+        """
+        grid = PassabilityGrid(100, 100)
+        grid.mark(50, 50)
+        pathfinder = JumpPointPathfinder()
+        path = pathfinder.find_path(grid, (0, 0), (99, 99))
+
+        assert len(path) - 1 == 198
+        assert pathfinder.nodes_expanded < 10
+
+    def test_follows_obstacle_changes(self, dead_end_grid):
+        """
+        Test that JPS sees obstacles added after a previous search on the same grid.
+        """
+        pathfinder = JumpPointPathfinder()
+        pathfinder.find_path(dead_end_grid, (1, 1), (1, 7))
+        dead_end_grid.mark(0, 4)
+        assert pathfinder.find_path(dead_end_grid, (1, 1), (1, 7)) is None
+
+
+class TestHierarchicalPathfinder:
+    def test_finds_valid_path(self, dead_end_grid):
+        """
+        Test that HPA* returns complete paths between cells of different clusters.
+        """
+        pathfinder = HierarchicalPathfinder(cluster_size=3)
+        for start, goal in [((1, 1), (1, 7)), ((4, 0), (0, 8)), ((2, 8), (1, 3))]:
+            path = pathfinder.find_path(dead_end_grid, start, goal)
+            assert path[0] == start and path[-1] == goal
+            assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+            assert all(dead_end_grid.is_free(y, x) for y, x in path)
+
+    def test_unreachable_goal(self, dead_end_grid):
+        """
+        Test that HPA* returns None when the goal is walled off.
+        """
+        dead_end_grid.mark(0, 4)
+        assert HierarchicalPathfinder(cluster_size=3).find_path(dead_end_grid, (1, 1), (1, 7)) is None
+
+    def test_prefix_stays_in_first_cluster(self):
+        """
+        Test that only the path inside the start cluster (plus the border crossing) is refined.
+        """
+        grid = PassabilityGrid(40, 40)
+        pathfinder = HierarchicalPathfinder(cluster_size=8)
+        prefix = pathfinder.path_prefix(grid, (0, 0), (39, 39))
+
+        assert prefix[0] == (0, 0)
+        assert all(y < 9 and x < 9 for y, x in prefix)
+        assert pathfinder.next_step(grid, (0, 0), (39, 39)) in [(0, 1), (1, 0)]
+
+    def test_blocked_goal_across_a_border(self):
+        """
+        Test that a blocked goal in the next cluster is still reached from its neighbour.
+        """
+        grid = make_grid([
+            "....",
+            "..#.",
+        ])
+        path = HierarchicalPathfinder(cluster_size=2).find_path(grid, (0, 0), (1, 2))
+        assert path[-1] == (1, 2) and len(path) - 1 == 3
+
+    def test_rebuilds_after_obstacle_changes(self, dead_end_grid):
+        """
+        Test that the entrance graph is rebuilt when the grid changes.
+        """
+        pathfinder = HierarchicalPathfinder(cluster_size=3)
+        assert pathfinder.find_path(dead_end_grid, (1, 1), (1, 7)) is not None
+        dead_end_grid.mark(0, 4)
+        assert pathfinder.find_path(dead_end_grid, (1, 1), (1, 7)) is None
+
+    def test_graphs_are_kept_per_grid(self, dead_end_grid, monkeypatch):
+        """
+        Test that one engine serving two rooms builds the graph of each room once.
+        """
+        pathfinder = HierarchicalPathfinder(cluster_size=3)
+        other_grid = PassabilityGrid(dead_end_grid.height, dead_end_grid.width)
+        builds = []
+        build = pathfinder._build
+        monkeypatch.setattr(pathfinder, "_build", lambda grid: builds.append(grid) or build(grid))
+
+        for _ in range(3):
+            assert pathfinder.find_path(dead_end_grid, (1, 1), (1, 7)) is not None
+            assert pathfinder.find_path(other_grid, (1, 1), (1, 7)) is not None
+        assert builds == [dead_end_grid, other_grid]
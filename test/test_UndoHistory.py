@@ -0,0 +1,38 @@
+# TO RUN THE TEST (please follow the README):
+# PYTHONPATH="." pytest test -W ignore::DeprecationWarning
+import pytest
+from project.UndoHistory import UndoDelta, UndoHistory
+
+class TestUndoHistory:
+    def test_history_is_bounded(self):
+        """
+        Test that recording past the capacity forgets the oldest commands and keeps the latest ones.
+        """
+        history = UndoHistory(capacity=3)
+        for i in range(10):
+            history.push(UndoDelta(player_from=i))
+
+        assert len(history) == 3
+        assert [history.pop().player_from for _ in range(3)] == [9, 8, 7]
+        assert history.pop() is None
+
+    def test_squash_folds_a_command_into_one_delta(self):
+        """
+        Test that the pickups recorded during a command are undone with the command's move.
+        """
+        history = UndoHistory()
+        history.push(UndoDelta(player_from=(0, 0)))
+        mark = history.mark()
+        history.push(UndoDelta(picked=(((1, 1), "rock"),)))
+        history.push(UndoDelta(picked=(((1, 1), "flower"),)))
+        history.squash(mark, (0, 1))
+
+        assert list(history) == [UndoDelta((0, 0)), UndoDelta((0, 1), (((1, 1), "rock"), ((1, 1), "flower")))]
+
+    def test_squash_records_nothing_for_a_command_that_changed_nothing(self):
+        """
+        Test that a command that neither moved the player nor picked anything leaves no delta.
+        """
+        history = UndoHistory()
+        history.squash(history.mark())
+        assert len(history) == 0
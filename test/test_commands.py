@@ -1,8 +1,10 @@
 # TO RUN THE TEST (please follow the README)
 # PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
 
+import random
+
 from project.commands import *
-from project.example_map import ExampleHouse
+from project.example_map import ExampleHouse, LockableDoor, Rock
 from project.GameStateManager import GameStateManager
 from project.imports import *
 from typing import TYPE_CHECKING
@@ -12,6 +14,7 @@ if TYPE_CHECKING:
 
 from project.GameStateManager import GameStateManager
 from project.Animal import Cow  # or whatever item
+from project.Hunter import Hunter
 
 class TestCommands:
 
@@ -28,7 +31,7 @@ class TestCommands:
         self.room.add_player(self.player, self.start)
         self.player.update_position(self.start, self.room)
         self.player.set_facing_direction("up")
-        GameStateManager().reset_game_state()  # clean state for each test
+        GameStateManager.for_room(self.room).reset_game_state()  # clean state for each test
 
 
     def test_jump_command(self):
@@ -44,12 +47,44 @@ class TestCommands:
         assert self.player.get_current_position() == self.jump_target
         assert any(isinstance(m, GridMessage) for m in messages)
 
+    def test_jump_refuses_to_land_on_the_hunter(self):
+        """
+        Test that the player cannot jump onto a tile where a character stands.
+        """
+        for obj in self.room.get_map_objects_at(self.jump_target):
+            self.room.remove_from_grid(obj, self.jump_target)
+        hunter = Hunter(encounter_text="I caught you!")
+        self.room.add_to_grid(hunter, self.jump_target)
+
+        assert JumpCommand().execute(self.player) == []
+        assert self.player.get_current_position() == self.start
+
+    def test_jump_reaches_the_far_side_of_a_larger_room(self):
+        """
+        Test that jump bounds follow the size of the room rather than the default house.
+        """
+        class LargeHouse(ExampleHouse):
+            SIZE = (25, 25)
+
+        room = LargeHouse()
+        start, target = Coord(5, 19), Coord(5, 21)
+        for coord in (start, target):
+            for obj in room.get_map_objects_at(coord):
+                room.remove_from_grid(obj, coord)
+        self.player.set_position(start)
+        room.add_player(self.player, start)
+        self.player.update_position(start, room)
+        self.player.set_facing_direction("right")
+
+        JumpCommand().execute(self.player)
+        assert self.player.get_current_position() == target
+
     def test_undo_command(self):
         """
         Test that the undo command correctly removes an item from the player's inventory
         """
         cow = Cow()
-        gsm = GameStateManager()
+        gsm = GameStateManager.for_room(self.room)
         self.player.inventory = [cow]
         gsm.tracked_picked_items = [(self.start, cow)]
         gsm.collected_items.append("animal")
@@ -62,11 +97,64 @@ class TestCommands:
         assert gsm.collected_animals == 0
         assert cow in self.room.get_map_objects_at(self.start)
 
+    def test_undo_moves_jumps_and_pickups_in_order(self):
+        """
+        Test that undo takes back a jump with the rock it picked up, then a move, one command at a time.
+        """
+        gsm = GameStateManager.for_room(self.room)
+        step, landing = self.start + Coord(0, 1), self.start + Coord(0, 3)
+        for coord in (self.start, step, landing):
+            for obj in self.room.get_map_objects_at(coord):
+                if obj is not self.player:
+                    self.room.remove_from_grid(obj, coord)
+        rock = Rock()
+        self.room.add_to_grid(rock, landing)
+
+        self.room._remember_and_move(self.player, "right")
+        JumpCommand().execute(self.player)
+        assert self.player.get_current_position() == landing
+        assert self.player.inventory == [rock] and gsm.collected_items == ["rock"]
+
+        UndoCommand().execute(self.player)
+        assert self.player.get_current_position() == step
+        assert self.player.inventory == [] and gsm.collected_items == []
+        assert rock in self.room.get_map_objects_at(landing)
+
+        UndoCommand().execute(self.player)
+        assert self.player.get_current_position() == self.start
+
+        messages = UndoCommand().execute(self.player)
+        assert self.player.get_current_position() == self.start
+        assert len(messages) == 1, "There should be nothing left to undo"
+
+    def test_undo_refuses_to_move_back_onto_the_hunter(self):
+        """
+        Test that undoing a move is refused, and kept for later, while the hunter stands where the player came from.
+        """
+        gsm = GameStateManager.for_room(self.room)
+        step = self.start + Coord(0, 1)
+        for coord in (self.start, step):
+            for obj in self.room.get_map_objects_at(coord):
+                if obj is not self.player:
+                    self.room.remove_from_grid(obj, coord)
+        self.room._remember_and_move(self.player, "right")
+        hunter = Hunter(encounter_text="I caught you!")
+        self.room.add_to_grid(hunter, self.start)
+
+        messages = UndoCommand().execute(self.player)
+        assert len(messages) == 1
+        assert self.player.get_current_position() == step
+        assert gsm.get_undo_depth() == 1
+
+        self.room.remove_from_grid(hunter, self.start)
+        UndoCommand().execute(self.player)
+        assert self.player.get_current_position() == self.start
+
     def test_reset_command(self): 
         """
         Test that the ResetCommand properly resets the game state and repositions the player to the starting location.
         """
-        gsm = GameStateManager()
+        gsm = GameStateManager.for_room(self.room)
         cow = Cow()
         self.room.add_to_grid(cow, self.start)
         gsm.tracked_picked_items = [(self.start, cow)]
@@ -83,3 +171,28 @@ class TestCommands:
         assert gsm.collected_animals == 0
         assert gsm.collected_items == []
         assert any(isinstance(m, GridMessage) for m in messages)
+        assert self.player.get_current_position() == self.start, "Reset should bring the player back to where the game started"
+        assert cow not in self.room.get_map_objects_at(self.start)
+
+    def test_reset_lays_out_fresh_objects(self):
+        """
+        Test that each reset lays the objects out afresh, keeping them off the tiles where the characters are put back.
+        """
+        gsm = GameStateManager.for_room(self.room)
+
+        def layout():
+            return sorted((type(obj).__name__, obj.get_position().to_tuple()) for obj in self.room._Map__objects
+                          if not isinstance(obj, (Player, Hunter, LockableDoor)))
+
+        layouts = [layout()]
+        for seed in range(3):
+            random.seed(seed)
+            gsm.set_game_state(GameState.LOSE)
+            ResetCommand().execute(self.player)
+            layouts.append(layout())
+            for character in [self.player] + self.room._hunters:
+                position = character.get_current_position()
+                assert [obj for obj in self.room.get_map_objects_at(position) if obj is not character] == []
+
+        assert len({tuple(objects) for objects in layouts}) == len(layouts), "Every reset should regenerate the layout"
+        assert self.player.get_current_position() == self.start
@@ -2,6 +2,13 @@
 # PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
 import pytest
 from project.example_map import ExampleHouse, Tree
+from project.Hunter import Hunter
+from project.MovementStrategy import DistanceFieldMovement, HierarchicalMovement, RandomMovement
+from project.Animal import Cow
+from project.GameSnapshot import GameSnapshot
+from project.EventJournal import EventJournal, JournalEvent, replay
+from project.GameStateManager import GameStateManager, GameState
+from project.commands import ResetCommand, UndoCommand
 from project.imports import *
 
 from typing import TYPE_CHECKING
@@ -41,3 +48,262 @@ class TestExampleHouse:
         assert start != end, "Player did not move"
         assert player in room.get_map_objects_at(end), "Player not found at new position"
 
+
+    def test_passability_index_tracks_trees(self, house):
+        """
+        Test that the passability index follows trees added to and removed from the grid.
+        """
+        room, player = house
+        grid = room.get_passability_grid()
+        assert not grid.is_free(0, 0), "Border trees should block their cell"
+
+        was_free = grid.is_free(5, 5)
+        tree = Tree()
+        room.add_to_grid(tree, Coord(5, 5))
+        assert not grid.is_free(5, 5), "Added tree should block its cell"
+
+        room.remove_from_grid(tree, Coord(5, 5))
+        assert grid.is_free(5, 5) == was_free, "Removed tree should no longer block its cell"
+
+    def test_passability_index_ignores_characters(self, house):
+        """
+        Test that the player does not block its own cell in the passability index.
+        """
+        room, player = house
+        pos = player.get_current_position()
+        assert room.get_passability_grid().is_free(pos.y, pos.x)
+
+    def test_next_hop_table_built_once_per_layout(self, house):
+        """
+        Test that the house builds its next-hop table once for the generated layout and drops it when obstacles change.
+        """
+        room, player = house
+        table = room.get_next_hop_table()
+        assert table is not None
+        assert room.get_next_hop_table() is table, "The table should be reused between requests"
+
+        room.add_to_grid(Tree(), Coord(13, 6))
+        assert room.get_next_hop_table() is None, "A stale table should not be used"
+
+    def test_layout_follows_the_house_size(self):
+        """
+        Test that a larger house is walled in along its own border, with the entrance in the middle of its bottom wall.
+        """
+        class LargeHouse(ExampleHouse):
+            SIZE = (21, 31)
+
+        room = LargeHouse()
+        HumanPlayer("test player").change_room(room)
+        grid = room.get_passability_grid()
+        door = LargeHouse.entrance_position()
+
+        assert (grid.height, grid.width) == LargeHouse.SIZE
+        assert door == Coord(20, 15)
+        assert room.entrance_door in room.get_map_objects_at(door)
+        assert all(not grid.is_free(0, x) for x in range(31)), "The top wall should be all trees"
+        assert all(not grid.is_free(y, 30) for y in range(21)), "The right wall should be all trees"
+        assert grid.is_free(door.y - 1, door.x), "The area in front of the door should be clear"
+
+    def test_update_advances_game_clock(self, house):
+        """
+        Test that every update of the house moves its game clock forward by one tick.
+        """
+        room, player = house
+        clock = room.get_game_clock()
+        start = clock.now()
+        room.update()
+        room.update()
+        assert clock.now() == start + 2
+
+    def test_houses_host_independent_games(self, house):
+        """
+        Test that each house has its own game state, so a pickup in one house does not show up in another.
+        """
+        room, player = house
+        other = ExampleHouse()
+        assert room.get_game_state() is not other.get_game_state()
+
+        room.get_game_state().collect_item("rock")
+        assert room.get_game_state().collected_items == ["rock"]
+        assert other.get_game_state().collected_items == []
+        assert GameStateManager.for_room(player.get_current_room()) is room.get_game_state()
+
+    def test_hunters_use_the_house_chase_strategy(self):
+        """
+        Test that the hunters of a house chase with the strategy the house was configured with.
+        """
+        chase = DistanceFieldMovement.shared()
+        room = ExampleHouse(chase_strategy=chase)
+        HumanPlayer("test player").change_room(room)
+        hunter = next(obj for obj in room._Map__objects if isinstance(obj, Hunter))
+        assert hunter.chase_strategy is chase
+
+    def test_update_delivers_queued_events(self):
+        """
+        Test that a house with deferred events queues them and delivers them once in update().
+        """
+        room = ExampleHouse(defer_events=True)
+        HumanPlayer("test player").change_room(room)
+        notifications = []
+
+        class Listener:
+            def on_notify(self, event):
+                notifications.append(event)
+
+        gsm = room.get_game_state()
+        listener = Listener()  # The game state holds observers weakly
+        gsm.add_observer(listener)
+        gsm.collect_item("rock")
+        gsm.collect_item("rock")
+        assert notifications == []
+
+        room.update()
+        assert notifications == ["ITEM_COLLECTED"]
+
+    @pytest.mark.parametrize("defer_events", [False, True])
+    def test_hunters_react_to_a_pickup_on_the_next_tick(self, defer_events):
+        """
+        Test that hunters move with the strategy and speed of a pickup on the tick right after it,
+        whether or not the house defers its events.
+        """
+        room = ExampleHouse(defer_events=defer_events)
+        HumanPlayer("test player").change_room(room)
+        hunter = next(obj for obj in room._Map__objects if isinstance(obj, Hunter))
+        seen = []
+        update = hunter.update
+
+        def record_and_update():
+            seen.append((hunter.movement_strategy, hunter.speed))
+            return update()
+
+        hunter.update = record_and_update
+        room.get_game_state().collect_item("rock")
+        room.update()
+        assert seen == [(hunter.chase_strategy, Hunter.ROCK_SPEED)]
+
+    def test_original_layout_is_rebuilt_on_demand(self, house):
+        """
+        Test that the stored layout rebuilds fresh objects of the same kinds at the same places.
+        """
+        room, player = house
+        first = room.get_game_state().get_original_objects()
+        second = room.get_game_state().get_original_objects()
+
+        assert [(type(obj), coord) for obj, coord in first] == [(type(obj), coord) for obj, coord in second]
+        assert all(a is not b for (a, _), (b, _) in zip(first, second)), "Every call should build new objects"
+        assert sum(isinstance(obj, Hunter) for obj, _ in first) == 1
+        assert room.entrance_door not in [obj for obj, _ in first], "Rebuilding should not replace the live door"
+
+    def test_snapshot_restores_the_game(self, house):
+        """
+        Test that restoring a snapshot brings back the game state, the grid, the hunter and the inventory.
+        """
+        room, player = house
+        gsm = room.get_game_state()
+        snapshot = room.save_snapshot(player)
+        layout = sorted((type(obj).__name__, coord.to_tuple()) for obj, coord in snapshot.layout.instantiate())
+        hunter = next(obj for obj in room._Map__objects if isinstance(obj, Hunter))
+        hunter_position = hunter.get_current_position()
+
+        cow = Cow()
+        room.add_to_grid(cow, Coord(5, 5))
+        gsm.collect_animal()
+        gsm.track_picked_item(cow, Coord(5, 5))
+        player.inventory.append(cow)
+        room.remove_from_grid(hunter, hunter_position)
+        room.add_to_grid(hunter, Coord(2, 2))
+        hunter.update_position(Coord(2, 2), room)
+
+        room.restore_snapshot(snapshot, player)
+
+        assert gsm.collected_animals == 0 and gsm.collected_items == [] and gsm.tracked_picked_items == []
+        assert player.inventory == []
+        assert hunter.get_current_position() == hunter_position
+        assert cow not in room.get_map_objects_at(Coord(5, 5))
+        restored = sorted((type(obj).__name__, coord.to_tuple()) for obj, coord in room.save_snapshot(player).layout.instantiate())
+        assert restored == layout
+
+    def test_snapshot_keeps_strategies_built_with_arguments(self, house, tmp_path):
+        """
+        Test that a checkpoint gives the hunter back its strategy with the arguments it was built with.
+        """
+        room, player = house
+        hunter = next(obj for obj in room._Map__objects if isinstance(obj, Hunter))
+        hunter.movement_strategy = HierarchicalMovement(4)
+        hunter.movement_strategy.move(hunter, "up", player)  # Fills the engine's per-grid cache
+
+        path = str(tmp_path / "checkpoint")
+        room.save_snapshot(player).write(path)
+        hunter.movement_strategy = RandomMovement.shared()
+        room.restore_snapshot(GameSnapshot.read(path), player)
+
+        assert isinstance(hunter.movement_strategy, HierarchicalMovement)
+        assert hunter.movement_strategy.pathfinder.cluster_size == 4
+
+    def test_snapshot_must_cover_every_hunter(self, house):
+        """
+        Test that a snapshot without a record for each hunter of the house is refused.
+        """
+        room, player = house
+        snapshot = room.save_snapshot(player)
+        with pytest.raises(AssertionError):
+            room.restore_snapshot(snapshot._replace(hunters=()), player)
+
+    def test_snapshot_keeps_inventory_and_undo_history_together(self, house, tmp_path):
+        """
+        Test that a checkpoint file restores the undo history along with the inventory, so undo takes back the restored item.
+        """
+        room, player = house
+        gsm = room.get_game_state()
+        cow = Cow()
+        gsm.collect_animal()
+        gsm.track_picked_item(cow, Coord(5, 5))
+        player.inventory.append(cow)
+
+        path = str(tmp_path / "checkpoint")
+        room.save_snapshot(player).write(path)
+        gsm.reset_game_state()
+        player.inventory.clear()
+
+        room.restore_snapshot(GameSnapshot.read(path), player)
+        assert gsm.collected_animals == 1
+        assert gsm.tracked_picked_items == [(Coord(5, 5), Cow)]
+        item, = player.inventory
+
+        UndoCommand().execute(player)
+        assert player.inventory == []
+        assert item in room.get_map_objects_at(Coord(5, 5)), "Undo should put back the very item the player carried"
+        assert gsm.collected_animals == 0
+
+    def test_journal_records_player_moves(self, house):
+        """
+        Test that a house journal records the player's moves, stamped with the game clock.
+        """
+        room, player = house
+        journal = room.enable_journal()
+        room.update()
+        room._remember_and_move(player, "right")
+
+        moves = [record for record in EventJournal.read(journal.getvalue()) if record.event == JournalEvent.PLAYER_MOVE]
+        position = player.get_current_position()
+        assert [(record.tick, record.y, record.x) for record in moves] == [(1, position.y, position.x)]
+
+    def test_journal_replays_past_a_reset(self, house):
+        """
+        Test that resetting to the start snapshot journals the restored positions, so a replay ends where the game is.
+        """
+        room, player = house
+        gsm = room.get_game_state()
+        journal = room.enable_journal()
+        room._remember_and_move(player, "right")
+        gsm.collect_item("rock")
+        gsm.set_game_state(GameState.WIN)
+
+        ResetCommand().execute(player)
+
+        rebuilt, positions = replay(EventJournal.read(journal.getvalue()))
+        hunter = next(obj for obj in room._Map__objects if isinstance(obj, Hunter))
+        assert rebuilt.get_state() == gsm.get_state() == GameState.PLAYING
+        assert rebuilt.collected_items == gsm.collected_items == []
+        assert positions["player"] == player.get_current_position().to_tuple()
+        assert positions["hunter"] == hunter.get_current_position().to_tuple()
@@ -1,11 +1,13 @@
 # TO RUN THE TEST (please follow the README): 
 # PYTHONPATH="." pytest test -W ignore::DeprecationWarning 
+import gc
 import pytest
 from project.GameStateManager import GameStateManager, GameState
+from project.Observer import GameEvent
 from project.example_map import LockableDoor
 from project.Hunter import Hunter
 from project.imports import * 
-from project.MovementStrategy import RandomMovement, TeleportMovement, ShortestPathMovement
+from project.MovementStrategy import RandomMovement, ShortestPathMovement, IncrementalPathMovement, HierarchicalMovement
 
 class DummyObserver:
     def __init__(self):
@@ -14,6 +16,15 @@ class DummyObserver:
     def on_notify(self, event):
         self.notifications.append(event)
 
+class CountingDoor(LockableDoor):
+    def __init__(self):
+        super().__init__("int_entrance")
+        self.notifications = []
+
+    def on_notify(self, event):
+        self.notifications.append(event)
+        super().on_notify(event)
+
 class TestObserverPattern:
     @pytest.fixture(autouse=True)
     def setup_method(self):
@@ -78,18 +89,140 @@ class TestObserverPattern:
         hunter = Hunter(encounter_text="I caught you!")
         self.gsm.add_observer(hunter)
 
-        # Case 1: Player picks up a rock first = TeleportMovement
+        # Case 1: Player picks up a rock first = faster ShortestPathMovement
         self.gsm.collected_items = ["rock"]
         self.gsm.notify_observers("ITEM_COLLECTED")
-        assert isinstance(hunter.movement_strategy, TeleportMovement)
+        assert isinstance(hunter.movement_strategy, ShortestPathMovement)
+        assert hunter.speed == Hunter.ROCK_SPEED
 
         # Case 2: Player picks up a flower after the rock = RandomMovement
         self.gsm.collected_items = ["rock", "flower"]
         self.gsm.notify_observers("ITEM_COLLECTED")
         assert isinstance(hunter.movement_strategy, RandomMovement)
+        assert hunter.speed == 1
 
         # Case 3: Player collects animal = ShortestPathMovement
         self.gsm.collected_items = ["rock", "flower", "animal"]
         self.gsm.notify_observers("ANIMAL_COLLECTED")
         assert isinstance(hunter.movement_strategy, ShortestPathMovement)
 
+    def test_hunter_chases_with_its_chase_strategy(self):
+        """
+        Test that an animal pickup and a win both switch the hunter to its configured chase strategy.
+        """
+        chase = IncrementalPathMovement.shared()
+        hunter = Hunter(encounter_text="I caught you!", chase_strategy=chase)
+        self.gsm.add_observer(hunter)
+
+        self.gsm.collect_animal()
+        assert hunter.movement_strategy is chase
+
+        self.gsm.set_game_state(GameState.LOSE)
+        self.gsm.set_game_state(GameState.WIN)
+        assert hunter.movement_strategy is chase
+
+        other = HierarchicalMovement(4)
+        hunter.set_chase_strategy(other)
+        assert hunter.movement_strategy is other, "A chasing hunter switches to its new chase strategy"
+
+    def test_hunter_keeps_strategy_object_when_unchanged(self):
+        """
+        Test that the hunter keeps its current strategy object when a pickup does not change the strategy.
+        """
+        hunter = Hunter(encounter_text="I caught you!")
+        self.gsm.add_observer(hunter)
+
+        self.gsm.collect_animal()
+        strategy = hunter.movement_strategy
+        self.gsm.collect_animal()
+
+        assert isinstance(strategy, ShortestPathMovement)
+        assert hunter.movement_strategy is strategy, "A second animal should not rebuild the strategy"
+
+    def test_observers_only_receive_their_topics(self):
+        """
+        Test that a pickup reaches the hunter but not the door, while WIN reaches both.
+        """
+        door = CountingDoor()
+        hunter = Hunter(encounter_text="I caught you!")
+        catch_all = DummyObserver()
+        for observer in (door, hunter, catch_all):
+            self.gsm.add_observer(observer)
+
+        self.gsm.collect_item("rock")
+        assert door.notifications == [], "Doors do not subscribe to pickups"
+        assert hunter.speed == Hunter.ROCK_SPEED
+
+        self.gsm.set_game_state(GameState.WIN)
+        assert door.notifications == [GameEvent.WIN]
+        assert catch_all.notifications == [GameEvent.ITEM_COLLECTED, GameEvent.WIN], "Observers without topics get every event"
+
+    def test_removed_observer_leaves_every_topic(self):
+        """
+        Test that removing an observer unsubscribes it from all of its topics.
+        """
+        door = CountingDoor()
+        self.gsm.add_observer(door)
+        self.gsm.remove_observer(door)
+
+        self.gsm.set_game_state(GameState.LOSE)
+        assert door.notifications == []
+
+    def test_unknown_events_reach_catch_all_observers(self):
+        """
+        Test that events outside GameEvent are still delivered to observers without topics.
+        """
+        door = CountingDoor()
+        observer = DummyObserver()
+        self.gsm.add_observer(door)
+        self.gsm.add_observer(observer)
+
+        self.gsm.notify_observers("CUSTOM")
+        assert observer.notifications == ["CUSTOM"]
+        assert door.notifications == []
+
+    def test_observer_added_twice_is_notified_once(self):
+        """
+        Test that registering the same observer again does not duplicate its notifications.
+        """
+        observer = DummyObserver()
+        self.gsm.add_observer(observer)
+        self.gsm.add_observer(observer)
+
+        self.gsm.notify_observers("ITEM_COLLECTED")
+        assert observer.notifications == ["ITEM_COLLECTED"]
+        assert self.gsm.get_observers().count(observer) == 1
+
+    def test_unreferenced_observer_is_dropped(self):
+        """
+        Test that the registry does not keep an observer alive once nothing else refers to it.
+        """
+        observer = DummyObserver()
+        self.gsm.add_observer(observer)
+        count = len(self.gsm.get_observers())
+
+        del observer
+        gc.collect()
+        self.gsm.notify_observers("ITEM_COLLECTED")
+        assert len(self.gsm.get_observers()) == count - 1
+
+    def test_hunter_decides_once_per_state_version(self, monkeypatch):
+        """
+        Test that repeated pickup events without a state change reuse the hunter's last decision.
+        """
+        hunter = Hunter(encounter_text="I caught you!")
+        self.gsm.add_observer(hunter)
+        decisions = []
+        choose = Hunter._choose_pickup_strategy
+        monkeypatch.setattr(Hunter, "_choose_pickup_strategy",
+                            lambda self, gsm: decisions.append(gsm.get_version()) or choose(self, gsm))
+
+        self.gsm.collect_item("rock")
+        self.gsm.notify_observers(GameEvent.ITEM_COLLECTED)
+        self.gsm.notify_observers(GameEvent.ITEM_COLLECTED)
+        assert len(decisions) == 1
+        assert hunter.speed == Hunter.ROCK_SPEED
+
+        self.gsm.collect_item("flower")
+        assert len(decisions) == 2
+        assert isinstance(hunter.movement_strategy, RandomMovement)